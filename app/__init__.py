@@ -5,6 +5,9 @@ from flask import Flask
 
 from app.routes import project_serialization
 from app.routes import pipeline_design
+from app.routes import jobs
+from app.routes import metrics
+from app.services.metrics import RequestMetrics
 
 
 def create_app() -> Flask:
@@ -15,7 +18,10 @@ def create_app() -> Flask:
     """
 
     app = Flask(__name__)
+    RequestMetrics().init_app(app)
     app.register_blueprint(project_serialization.bp)
     app.register_blueprint(pipeline_design.bp)
+    app.register_blueprint(jobs.bp)
+    app.register_blueprint(metrics.bp)
 
     return app
@@ -0,0 +1,54 @@
+"""Import modules on first use to keep the startup of the app short.
+
+The backend is started next to the Electron frontend, which waits for it.
+Route modules reach their services through lazy modules, so yaml, the
+configurators and the pipeline services are only imported by the first
+request needing them.
+"""
+
+__all__ = ["lazy_import"]
+
+import importlib
+import sys
+
+
+class _LazyModule:
+    """A module imported on its first attribute access."""
+
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str) -> None:
+        """Create a _LazyModule.
+
+        Args:
+            name (str): Absolute name of the module.
+        """
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attribute: str):
+        # import_module is thread-safe and returns sys.modules after the
+        # first call. Attributes aren't cached so module globals stay live.
+        return getattr(importlib.import_module(self._name), attribute)
+
+    def __setattr__(self, attribute: str, value) -> None:
+        setattr(importlib.import_module(self._name), attribute, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._name in sys.modules else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str):
+    """Get a module that is imported on its first attribute access.
+
+    Args:
+        name (str): Absolute name of the module, e.g. "app.services.nodeData".
+
+    Returns:
+        ModuleType | _LazyModule: The module when it's already imported,
+            otherwise a proxy importing it on first use.
+    """
+
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name)
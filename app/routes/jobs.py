@@ -0,0 +1,39 @@
+"""A blue print of /api/jobs
+"""
+
+from flask import Blueprint, jsonify, Response
+
+from app.services.job_queue import get_job_queue
+
+bp = Blueprint("jobs", __name__, url_prefix="/api/jobs")
+
+
+@bp.route("/<job_id>", methods=["GET"])
+def get_job(job_id: str) -> Response:
+    """Get the status and result of a job.
+
+    Returns:
+        Response: {"id", "name", "status", "result", "error", ...}, 404 (Job not found)
+    """
+
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": f'Job "{job_id}" does not exist.'}), 404
+    return jsonify(job.to_dict())
+
+
+@bp.route("/<job_id>", methods=["DELETE"])
+def cancel_job(job_id: str) -> Response:
+    """Cancel a job that hasn't started.
+
+    Returns:
+        Response: {"cancelled": True}, 404 (Job not found), 409 (Job started)
+    """
+
+    try:
+        cancelled = get_job_queue().cancel(job_id)
+    except KeyError as ex:
+        return jsonify({"error": ex.args[0]}), 404
+    if not cancelled:
+        return jsonify({"error": f'Job "{job_id}" has already started.'}), 409
+    return jsonify({"cancelled": True})
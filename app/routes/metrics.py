@@ -0,0 +1,34 @@
+"""A blue print of /metrics and /api/stats
+"""
+
+from flask import Blueprint, current_app, jsonify, Response
+
+from app.services.metrics import collect_stats
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.route("/metrics", methods=["GET"])
+def get_metrics() -> Response:
+    """Get route metrics and internal stats in Prometheus text format.
+
+    Returns:
+        Response: Prometheus exposition text.
+    """
+
+    text = current_app.extensions["metrics"].render_prometheus()
+    return Response(text, mimetype="text/plain; version=0.0.4")
+
+
+@bp.route("/api/stats", methods=["GET"])
+def get_stats() -> Response:
+    """Get a summary of route metrics and internal stats.
+
+    Returns:
+        Response: {"routes": {route: metrics}, "stats": {source: stats}}.
+    """
+
+    return jsonify({
+        "routes": current_app.extensions["metrics"].summary(),
+        "stats": collect_stats(),
+    })
@@ -1,6 +1,15 @@
 import logging
 from flask import Blueprint, jsonify, request, Response
-from app.services.nodeData import deserialize, compile
+from app.lazy_import import lazy_import
+from app.services.job_queue import get_job_queue, QueueFullError
+
+# Imported by the first request, see app.lazy_import.
+nodeData = lazy_import("app.services.nodeData")
+pipeline_graph = lazy_import("app.services.pipeline_graph")
+pipeline_executor = lazy_import("app.services.pipeline_executor")
+batch_compile = lazy_import("app.services.batch_compile")
+pipeline_schema = lazy_import("app.services.pipeline_schema")
+pipeline_ir = lazy_import("app.services.pipeline_ir")
 
 bp = Blueprint("pipeline_design", __name__, url_prefix="/api/pipeline")
 
@@ -8,7 +17,6 @@ bp = Blueprint("pipeline_design", __name__, url_prefix="/api/pipeline")
 @bp.route("/compile", methods=["GET"])
 def call_compile() -> Response:
     payload = request.args
-    print(payload["input"], payload["output"])
     if "input" not in payload:
         error = 'Missing field "input".'
         logging.error(error)
@@ -17,7 +25,280 @@ def call_compile() -> Response:
         error = 'Missing field "output".'
         logging.error(error)
         return jsonify({"error": error}), 400
-    nodes = deserialize(payload["input"])
-    file_path = compile(payload["output"], nodes)
+    # Emit one job per independent branch when "parallel" is set.
+    parallel = payload.get("parallel", "false").lower() in ("1", "true")
+    # Keep the steps in file order when "order" is "file".
+    order = payload.get("order", nodeData.ORDER_TOPOLOGICAL)
+    if order not in (nodeData.ORDER_TOPOLOGICAL, nodeData.ORDER_FILE):
+        error = f'Order "{order}" is not supported.'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+    # Emit the file of another CI system when "target" is set.
+    target = payload.get("target", nodeData.TARGET_GITHUB)
+    if target not in pipeline_ir.get_targets():
+        error = f'Target "{target}" is not supported.'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    # Return a job handle right away when "async" is set.
+    if payload.get("async", "false").lower() in ("1", "true"):
+        try:
+            job = get_job_queue().submit(
+                "compile",
+                _compile_file,
+                payload["input"],
+                payload["output"],
+                parallel,
+                order,
+                target,
+            )
+        except QueueFullError as ex:
+            return jsonify({"error": ex.args[0]}), 503
+        return jsonify({"job": job.id, "status": job.status}), 202
+
+    nodes = nodeData.iter_deserialize(payload["input"])
+    try:
+        file_path = nodeData.compile(
+            payload["output"], nodes, parallel, order, target
+        )
+    except pipeline_graph.CycleError as ex:
+        return jsonify({"error": ex.args[0], "cycle": ex.cycle}), 400
+    except pipeline_schema.PipelineValidationError as ex:
+        return jsonify({"error": ex.args[0], "errors": ex.errors}), 400
+
+    return jsonify(file_path)
+
+
+def _compile_file(
+    input: str, output: str, parallel: bool, order: str, target: str
+) -> str:
+    """Deserialize and compile a pipeline file in a job.
+
+    Args:
+        input (str): Path of the pipeline file.
+        output (str): Path of the compiled file.
+        parallel (bool): Emit one job per independent branch.
+        order (str): Order of the steps, see nodeData.compile.
+        target (str): CI system of the file, see nodeData.compile.
+
+    Returns:
+        str: Path of the compiled file.
+    """
+    return nodeData.compile(
+        output, nodeData.iter_deserialize(input), parallel, order, target
+    )
+
+
+@bp.route("/targets", methods=["GET"])
+def get_targets() -> Response:
+    """List the CI systems pipelines compile to.
+
+    Returns:
+        Response: {"targets": [{"target", "file"}]}
+    """
+
+    targets = [
+        {"target": target, "file": pipeline_ir.get_backend_file(target)}
+        for target in pipeline_ir.get_targets()
+    ]
+    return jsonify({"targets": targets})
+
+
+@bp.route("/compile/targets", methods=["POST"])
+def call_compile_targets() -> Response:
+    """Compile a pipeline file for several CI systems at once.
+
+    Payload: {"input", "folder", "targets": [str], "parallel"?}
+
+    Returns:
+        Response: {target: path of the compiled file},
+            400 (Missing field, unknown target, cycle or invalid pipeline)
+    """
+
+    data: dict = request.get_json()
+    for key in ("input", "folder"):
+        if not isinstance(data.get(key), str):
+            error = f'Missing field "{key}".'
+            logging.error(error)
+            return jsonify({"error": error}), 400
+    targets = data.get("targets")
+    if not isinstance(targets, list) or not targets:
+        error = 'Missing field "targets".'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    try:
+        outputs = nodeData.compile_targets(
+            data["folder"],
+            nodeData.iter_deserialize(data["input"]),
+            targets,
+            bool(data.get("parallel", False)),
+        )
+    except pipeline_graph.CycleError as ex:
+        return jsonify({"error": ex.args[0], "cycle": ex.cycle}), 400
+    except pipeline_schema.PipelineValidationError as ex:
+        return jsonify({"error": ex.args[0], "errors": ex.errors}), 400
+    except ValueError as ex:
+        return jsonify({"error": ex.args[0]}), 400
+
+    return jsonify(outputs)
+
+
+@bp.route("/compile/batch", methods=["POST"])
+def call_compile_batch() -> Response:
+    """Compile many pipeline files on a process pool.
+
+    Payload: {"items": [{"input", "output", "parallel"?, "order"?,
+        "target"?}]}
+
+    Returns:
+        Response: {"results": [{"input", "output", "file" | "error"}]},
+            400 (Missing field, too many items)
+    """
+
+    data: dict = request.get_json()
+    items = data.get("items")
+    if not isinstance(items, list):
+        error = 'Missing field "items".'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+    if len(items) > batch_compile.MAX_ITEMS:
+        error = f"Got {len(items)} items, "
+        error += f"at most {batch_compile.MAX_ITEMS} are allowed."
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    return jsonify({"results": batch_compile.compile_batch(items)})
+
+
+@bp.route("/check", methods=["GET"])
+def check_pipeline() -> Response:
+    """Check the port graph of a pipeline file.
+
+    Returns:
+        Response: {"cycle": [node ids] | None, "dangling": [{"node", "port"}]},
+            400 (Missing field, not a list of nodes), 404 (File not found)
+    """
+
+    path = request.args.get("input")
+    if path is None:
+        error = 'Missing field "input".'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    try:
+        graph = pipeline_graph.PipelineGraph(nodeData.deserialize(path))
+    except FileNotFoundError as ex:
+        return jsonify({"error": ex.args[0]}), 404
+    except pipeline_schema.PipelineValidationError as ex:
+        return jsonify({"error": ex.args[0], "errors": ex.errors}), 400
+    except ValueError as ex:
+        return jsonify({"error": ex.args[0]}), 400
+
+    dangling = [
+        {"node": node, "port": port} for node, port in graph.dangling_ports()
+    ]
+    return jsonify({"cycle": graph.find_cycle(), "dangling": dangling})
+
+
+@bp.route("/validate", methods=["GET"])
+def validate_pipeline() -> Response:
+    """Check every node of a pipeline file against its schema.
+
+    Returns:
+        Response: {"errors": [{"index", "field", "message"}]}, 400 (Missing
+            field, not a list of nodes), 404 (File not found)
+    """
+
+    path = request.args.get("input")
+    if path is None:
+        error = 'Missing field "input".'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    try:
+        for _ in nodeData.iter_deserialize(path):
+            pass
+    except FileNotFoundError as ex:
+        return jsonify({"error": ex.args[0]}), 404
+    except pipeline_schema.PipelineValidationError as ex:
+        return jsonify({"errors": ex.errors})
+    except ValueError as ex:
+        return jsonify({"error": ex.args[0]}), 400
+    return jsonify({"errors": []})
+
+
+@bp.route("/migrate", methods=["POST"])
+def migrate_pipeline() -> Response:
+    """Rewrite a pipeline file in the current schema version.
+
+    Payload: {"input", "output"? (input when missing)}
+
+    Returns:
+        Response: Path of the migrated file, 400 (Missing field, invalid
+            nodes), 404 (File not found)
+    """
+
+    data: dict = request.get_json()
+    if "input" not in data:
+        error = 'Missing field "input".'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    try:
+        file_path = nodeData.migrate(data["input"], data.get("output"))
+    except FileNotFoundError as ex:
+        return jsonify({"error": ex.args[0]}), 404
+    except pipeline_schema.PipelineValidationError as ex:
+        return jsonify({"error": ex.args[0], "errors": ex.errors}), 400
+    except ValueError as ex:
+        return jsonify({"error": ex.args[0]}), 400
+    return jsonify(file_path)
+
+
+@bp.route("/execute", methods=["POST"])
+def execute_pipeline() -> Response:
+    """Run a pipeline file locally.
+
+    Payload: {"input", "workers"?, "policy"? ("fail-fast" | "continue"),
+    "processes"? (bool)}
+
+    Returns:
+        Response: Execution report, 400 (Missing field, invalid value, cycle),
+            404 (File not found)
+    """
+
+    data: dict = request.get_json()
+    if "input" not in data:
+        error = 'Missing field "input".'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+    workers = data.get("workers")
+    # bool is an int too.
+    if workers is not None and (
+        not isinstance(workers, int) or isinstance(workers, bool)
+    ):
+        error = 'Field "workers" has to be an integer.'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+    policy = data.get("policy", pipeline_executor.PipelineExecutor.FAIL_FAST)
+    if not isinstance(policy, str):
+        error = 'Field "policy" has to be a string.'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    try:
+        executor = pipeline_executor.PipelineExecutor(
+            workers, bool(data.get("processes", False)), policy
+        )
+        report = executor.run(nodeData.deserialize(data["input"]))
+    except FileNotFoundError as ex:
+        return jsonify({"error": ex.args[0]}), 404
+    except pipeline_graph.CycleError as ex:
+        return jsonify({"error": ex.args[0], "cycle": ex.cycle}), 400
+    except pipeline_schema.PipelineValidationError as ex:
+        return jsonify({"error": ex.args[0], "errors": ex.errors}), 400
+    except ValueError as ex:
+        return jsonify({"error": ex.args[0]}), 400
 
-    return jsonify(file_path)
\ No newline at end of file
+    return jsonify(report.to_dict())
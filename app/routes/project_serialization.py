@@ -1,23 +1,87 @@
 """A blue print of /api/project
 """
 
+import functools
+import hashlib
 import logging
 
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, current_app, jsonify, request, Response
 
-from app.services.project_serialization import ProjectSerializor
+from app.lazy_import import lazy_import
+from app.services.job_queue import get_job_queue, QueueFullError
+from app.services.metrics import register_stats
+
+# Imported by the first request, see app.lazy_import.
+serialization = lazy_import("app.services.project_serialization")
+bulk_create = lazy_import("app.services.bulk_create")
 
 bp = Blueprint("project", __name__, url_prefix="/api/project")
 
 
+@functools.lru_cache(maxsize=256)
+def _metadata_body(
+    kind: str, language: str, framework: str, fingerprint: str
+) -> tuple[str, str]:
+    """Serialize supported languages, frameworks or configurations once.
+
+    Args:
+        kind (str): "languages", "frameworks" or "configurations".
+        language (str): A programming language.
+        framework (str): A programming language framework.
+        fingerprint (str): Fingerprint of the configurators, a new one
+            misses the cache.
+
+    Returns:
+        tuple[str, str]: The json body and its ETag.
+    """
+
+    serializor = serialization.ProjectSerializor
+    if kind == "languages":
+        value = serializor.get_supported_langauges()
+    elif kind == "frameworks":
+        value = serializor.get_supported_frameworks(language)
+    else:
+        value = serializor.get_configurations(language, framework)
+
+    key = "\0".join((fingerprint, kind, language or "", framework or ""))
+    etag = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return current_app.json.dumps(value) + "\n", etag
+
+
+def _metadata_response(
+    kind: str, language: str = None, framework: str = None
+) -> Response:
+    """Answer a metadata request from the cache, 304 when the client has it.
+
+    Returns:
+        Response: The json body with a strong ETag, or 304 (Not Modified).
+    """
+
+    fingerprint = serialization.ProjectSerializor.get_metadata_fingerprint()
+    body, etag = _metadata_body(kind, language, framework, fingerprint)
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    # Only changes with the configurators, so clients keep it but revalidate.
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def _metadata_stats() -> dict[str, int]:
+    info = _metadata_body.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+register_stats("metadata_cache", _metadata_stats)
+
+
 @bp.route("/languages", methods=["GET"])
 def get_supported_languages() -> Response:
     """Get supported languages.
 
     Returns:
-        Response: [languages].
+        Response: [languages], 304 (Not Modified)
     """
-    return jsonify(ProjectSerializor.get_supported_langauges())
+    return _metadata_response("languages")
 
 
 @bp.route("/frameworks", methods=["GET"])
@@ -25,7 +89,7 @@ def get_supported_frameworks() -> Response:
     """Get supported frameworks of a language.
 
     Returns:
-        Response: [frameworks].
+        Response: [frameworks], 304 (Not Modified)
     """
 
     language = request.args.get("language")
@@ -33,8 +97,7 @@ def get_supported_frameworks() -> Response:
         error = 'Missing field "language".'
         logging.error(error)
         return jsonify({"error": error}), 400
-    result = ProjectSerializor.get_supported_frameworks(language)
-    return jsonify(result)
+    return _metadata_response("frameworks", language)
 
 
 @bp.route("/configurations/supported", methods=["GET"])
@@ -42,7 +105,8 @@ def get_supported_configurations() -> Response:
     """Get supported configurations of a language and a framework.
 
     Returns:
-        Response: {configuration: attributes}, 400 (Missing field), 415 (No payload)
+        Response: {configuration: attributes}, 304 (Not Modified),
+            400 (Missing field), 415 (No payload)
     """
 
     language = request.args.get("language")
@@ -52,8 +116,7 @@ def get_supported_configurations() -> Response:
         return jsonify({"error": error}), 400
 
     framework = request.args.get("framework", None)
-    result = ProjectSerializor.get_configurations(language, framework)
-    return jsonify(result)
+    return _metadata_response("configurations", language, framework)
 
 
 @bp.route("/configurations/initialized", methods=["GET"])
@@ -79,7 +142,7 @@ def get_initialized_configurations() -> Response:
     framework = request.args.get("framework", None)
 
     try:
-        result = ProjectSerializor.get_initialized_configurations(
+        result = serialization.ProjectSerializor.get_initialized_configurations(
             path, language, framework
         )
         return jsonify(result)
@@ -102,24 +165,98 @@ def is_project_initialized() -> Response:
         return jsonify({"error": error}), 400
 
     try:
-        result = ProjectSerializor.is_initialized(path)
+        result = serialization.ProjectSerializor.is_initialized(path)
         return jsonify({"valid": result})
     except NotADirectoryError:
         return jsonify({"error": "Path doesn't exist."}), 400
 
 
+@bp.route("/workspace", methods=["GET"])
+def index_workspace() -> Response:
+    """Find every project under a workspace folder.
+
+    Returns:
+        Response: {"root", "projects": [{"path", "attributes" | "error"}],
+            "folders", "read", "parsed", "duration"}, 400 (Missing field,
+            path doesn't exist)
+    """
+
+    root = request.args.get("root")
+    if root is None:
+        error = 'Missing field "root".'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    try:
+        result = serialization.ProjectSerializor.index_workspace(
+            root, current_app.config.get("WORKSPACE_INDEX_PATH")
+        )
+    except NotADirectoryError as ex:
+        return jsonify({"error": ex.args[0]}), 400
+    return jsonify(result)
+
+
 @bp.route("/create", methods=["POST"])
 def create_project() -> Response:
     """Call create_project service.
 
     Returns:
-        Response: 200, 400 (Missing fields, path doesn't exist), 500 (Unknown)
+        Response: 200, 202 ({"job"} when "async" is set), 400 (Missing fields,
+            path doesn't exist), 500 (Unknown), 503 (Job queue is full)
     """
 
     # Get attributes.
     data: dict = request.get_json()
+
+    # Return a job handle right away when "async" is set.
+    if request.args.get("async", "false").lower() in ("1", "true"):
+        try:
+            job = get_job_queue().submit(
+                "create", serialization.ProjectSerializor.create_project, data
+            )
+        except QueueFullError as ex:
+            return jsonify({"error": ex.args[0]}), 503
+        return jsonify({"job": job.id, "status": job.status}), 202
+
     try:
-        ProjectSerializor.create_project(data)
+        serialization.ProjectSerializor.create_project(data)
         return "", 200
     except (KeyError, ValueError, NotADirectoryError) as ex:
         return jsonify({"error": ex.args[0]}), 400
+
+
+@bp.route("/create/bulk", methods=["POST"])
+def create_projects() -> Response:
+    """Create many projects on a thread pool.
+
+    Payload: {"projects": [payload of /create]}
+
+    Returns:
+        Response: {"results": [{"path", "status", "error"?}], "created",
+            "failed"}, 202 ({"job"} when "async" is set), 400 (Missing field,
+            too many projects), 503 (Job queue is full)
+    """
+
+    data: dict = request.get_json()
+    projects = data.get("projects") if isinstance(data, dict) else None
+    if not isinstance(projects, list):
+        error = 'Missing field "projects".'
+        logging.error(error)
+        return jsonify({"error": error}), 400
+    if len(projects) > bulk_create.MAX_PROJECTS:
+        error = f"Got {len(projects)} projects, "
+        error += f"at most {bulk_create.MAX_PROJECTS} are allowed."
+        logging.error(error)
+        return jsonify({"error": error}), 400
+
+    # Return a job handle right away when "async" is set.
+    if request.args.get("async", "false").lower() in ("1", "true"):
+        try:
+            job = get_job_queue().submit(
+                "create_bulk", bulk_create.create_projects, projects
+            )
+        except QueueFullError as ex:
+            return jsonify({"error": ex.args[0]}), 503
+        return jsonify({"job": job.id, "status": job.status}), 202
+
+    return jsonify(bulk_create.create_projects(projects))
@@ -0,0 +1,118 @@
+"""Keep validated project attributes until their file changes."""
+
+__all__ = ["AttributeCache"]
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from app.services.fs_snapshot import RACY_WINDOW_NS
+
+
+class AttributeCache:
+    """LRU cache of attribute dicts keyed by path, validated by file version."""
+
+    def __init__(self, max_size: int) -> None:
+        """Create an AttributeCache.
+
+        Args:
+            max_size (int): Projects to keep, 0 to disable the cache.
+        """
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[tuple, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, version: tuple):
+        """Get the attributes of a file unless it changed.
+
+        Args:
+            path (str): Absolute path of the attribute file.
+            version (tuple): Inode, size, mtime and ctime of the file now,
+                and anything else the attributes were validated against.
+
+        Returns:
+            dict[str, any] | None: A copy the caller can change, None when
+                missing or outdated.
+        """
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def put(
+        self, path: str, version: tuple, attributes: dict, changed: int
+    ) -> None:
+        """Keep the validated attributes of a file.
+
+        Args:
+            path (str): Absolute path of the attribute file.
+            version (tuple): Version given to get.
+            attributes (dict): Attributes read with that version.
+            changed (int): Last mtime or ctime of the file in nanoseconds. A
+                file changed within RACY_WINDOW_NS isn't kept, a write in the
+                same timestamp tick wouldn't change its version.
+        """
+
+        if time.time_ns() - changed <= RACY_WINDOW_NS:
+            return
+        attributes = copy.deepcopy(attributes)
+        with self._lock:
+            self._entries[path] = (version, attributes)
+            self._entries.move_to_end(path)
+            self._evict()
+
+    def discard(self, path: str) -> None:
+        """Forget the attributes of a file.
+
+        Args:
+            path (str): Absolute path of the attribute file.
+        """
+
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def resize(self, max_size: int) -> None:
+        """Change the number of projects kept, evicting the oldest ones.
+
+        Args:
+            max_size (int): Projects to keep, 0 to disable the cache.
+        """
+
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self) -> None:
+        """Forget every cached project."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> dict[str, int]:
+        """Get cache usage.
+
+        Returns:
+            dict[str, int]: {"hits", "misses", "size", "max_size"}.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries over max_size. Needs the lock."""
+
+        while len(self._entries) > max(self.max_size, 0):
+            self._entries.popitem(last=False)
@@ -0,0 +1,135 @@
+"""Compile many pipeline files on a process pool."""
+
+__all__ = ["MAX_ITEMS", "compile_batch", "shutdown_pool"]
+
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import yaml
+
+from app.services.nodeData import (
+    ORDER_TOPOLOGICAL,
+    TARGET_GITHUB,
+    compile,
+    iter_deserialize,
+)
+
+# Pipeline files of one request, more have to be split into several requests.
+MAX_ITEMS = 1000
+
+_pool: ProcessPoolExecutor = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Get the process pool shared by every batch, created on first use.
+
+    Returns:
+        ProcessPoolExecutor: The pool, sized by the CPU count.
+    """
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor()
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Shut the shared process pool down. A new one is created when needed."""
+
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _compile_item(
+    input: str, output: str, parallel: bool, order: str, target: str
+) -> str:
+    """Deserialize and compile one pipeline file. Runs in the pool workers.
+
+    Args:
+        input (str): Path of the pipeline file.
+        output (str): Path of the compiled file.
+        parallel (bool): Emit one job per independent branch.
+        order (str): Order of the steps, see nodeData.compile.
+        target (str): CI system of the file, see nodeData.compile.
+
+    Returns:
+        str: Path of the compiled file.
+    """
+    return compile(output, iter_deserialize(input), parallel, order, target)
+
+
+def compile_batch(items: list[dict[str, any]]) -> list[dict[str, any]]:
+    """Compile pipeline files in parallel.
+
+    Args:
+        items (list[dict[str, any]]): {"input", "output", "parallel"?,
+            "order"?, "target"?} of every pipeline file.
+
+    Raises:
+        ValueError: When there are more than MAX_ITEMS items.
+
+    Returns:
+        list[dict[str, any]]: {"input", "output", "file"} or
+            {"input", "output", "error"} of every item, in the same order.
+    """
+
+    if len(items) > MAX_ITEMS:
+        error = f"Got {len(items)} items, at most {MAX_ITEMS} are allowed."
+        logging.error(error)
+        raise ValueError(error)
+
+    results = [None] * len(items)
+    futures = {}
+    outputs = set()
+    pool = _get_pool()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {"error": "Item has to be an object."}
+            continue
+        result = {"input": item.get("input"), "output": item.get("output")}
+        results[index] = result
+        for key in ("input", "output"):
+            if not isinstance(item.get(key), str):
+                result["error"] = f'Missing field "{key}".'
+                break
+        else:
+            # Workers writing the same file would overwrite each other.
+            output = os.path.abspath(item["output"])
+            if output in outputs:
+                result["error"] = f'Output "{item["output"]}" is duplicated.'
+                continue
+            outputs.add(output)
+            futures[index] = pool.submit(
+                _compile_item,
+                item["input"],
+                item["output"],
+                bool(item.get("parallel", False)),
+                item.get("order", ORDER_TOPOLOGICAL),
+                item.get("target", TARGET_GITHUB),
+            )
+
+    broken = False
+    for index, future in futures.items():
+        try:
+            results[index]["file"] = future.result()
+        except (
+            BrokenProcessPool, OSError, ValueError, KeyError, TypeError,
+            yaml.YAMLError,
+        ) as ex:
+            broken = broken or isinstance(ex, BrokenProcessPool)
+            results[index]["error"] = (
+                str(ex.args[0]) if len(ex.args) == 1 else str(ex)
+            )
+
+    # A worker died, start over with a fresh pool for the next batch.
+    if broken:
+        shutdown_pool()
+    return results
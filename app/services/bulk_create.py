@@ -0,0 +1,108 @@
+"""Create many projects on a thread pool."""
+
+__all__ = ["MAX_PROJECTS", "create_projects", "shutdown_pool"]
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from app.services.project_serialization import ProjectSerializor
+
+# Projects of one request, more have to be split into several requests.
+MAX_PROJECTS = 1000
+
+_pool: ThreadPoolExecutor = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Get the thread pool shared by every request, created on first use.
+
+    Returns:
+        ThreadPoolExecutor: The pool, 4 threads per CPU up to 32 since the
+            work is waiting for the disk.
+    """
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                min(32, 4 * (os.cpu_count() or 1)), "bulk-create"
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Shut the shared thread pool down. A new one is created when needed."""
+
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def create_projects(items: list[dict[str, any]]) -> dict[str, any]:
+    """Create projects in parallel, one failing doesn't stop the others.
+
+    Args:
+        items (list[dict[str, any]]): Payload of /api/project/create of every
+            project.
+
+    Raises:
+        ValueError: When there are more than MAX_PROJECTS items.
+
+    Returns:
+        dict[str, any]: {"results": [{"path", "status": "created"} or
+            {"path", "status": "failed", "error"}], "created", "failed"},
+            results in the same order as items.
+    """
+
+    if len(items) > MAX_PROJECTS:
+        error = f"Got {len(items)} projects, at most {MAX_PROJECTS} are allowed."
+        logging.error(error)
+        raise ValueError(error)
+
+    results = [None] * len(items)
+    futures = {}
+    paths = set()
+    pool = _get_pool()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {
+                "path": None,
+                "status": "failed",
+                "error": "Item has to be an object.",
+            }
+            continue
+        result = {"path": item.get("path"), "status": "failed"}
+        results[index] = result
+        if not isinstance(item.get("path"), str):
+            result["error"] = 'Missing field "path".'
+            continue
+        # Two items of the same folder would overwrite each other.
+        path = os.path.realpath(item["path"])
+        if path in paths:
+            result["error"] = f'Path "{item["path"]}" is duplicated.'
+            continue
+        paths.add(path)
+        futures[index] = pool.submit(ProjectSerializor.create_project, item)
+
+    for index, future in futures.items():
+        try:
+            future.result()
+            results[index]["status"] = "created"
+        except (KeyError, ValueError, OSError, yaml.YAMLError) as ex:
+            results[index]["error"] = (
+                str(ex.args[0]) if len(ex.args) == 1 else str(ex)
+            )
+
+    created = sum(result["status"] == "created" for result in results)
+    return {
+        "results": results,
+        "created": created,
+        "failed": len(results) - created,
+    }
@@ -0,0 +1,203 @@
+"""Lower pipelines to GitLab CI, a Makefile or a shell script.
+
+GitHub Actions is lowered in app.services.nodeData. Every step runs its
+action like the GitHub step does, with an echo of the action name.
+"""
+
+__all__ = ["lower_gitlab", "lower_makefile", "lower_shell"]
+
+import shlex
+
+import yaml
+
+from app.services.pipeline_ir import PipelineIR, chain_name, register_backend
+
+_HEADER = "Generated by ResiliFlow from a pipeline file, edit the pipeline instead."
+
+# Top level keys of .gitlab-ci.yml that aren't jobs.
+_GITLAB_KEYWORDS = frozenset(
+    [
+        "after_script",
+        "before_script",
+        "cache",
+        "default",
+        "image",
+        "include",
+        "services",
+        "stages",
+        "types",
+        "variables",
+        "workflow",
+    ]
+)
+
+
+def _jobs(ir: PipelineIR, parallel: bool) -> list[tuple[str, list[int], list[int]]]:
+    """Get (name, steps, needs) of every job, a single "build" job unless parallel."""
+
+    if not parallel:
+        return [("build", list(range(len(ir.steps))), [])]
+    return [
+        (chain.name, list(chain.steps), list(chain.needs)) for chain in ir.chains
+    ]
+
+
+def _job_names(
+    jobs: list[tuple[str, list[int], list[int]]],
+    reserved: frozenset[str] = frozenset(),
+    prefix: str = "",
+) -> list[str]:
+    """Rename jobs that would clash with the names a target reserves.
+
+    Args:
+        jobs (list[tuple[str, list[int], list[int]]]): Jobs from _jobs.
+        reserved (frozenset[str]): Names jobs can't have.
+        prefix (str): Prefix of every name, "-" is replaced with "_" then.
+
+    Returns:
+        list[str]: Unique name of every job, in the same order.
+    """
+
+    taken = set(reserved)
+    names = []
+    for name, _, _ in jobs:
+        if prefix:
+            name = prefix + name.replace("-", "_")
+        name = chain_name(name, taken)
+        taken.add(name)
+        names.append(name)
+    return names
+
+
+def _command(action: str) -> str:
+    """Get the shell command of an action."""
+    return f"echo {shlex.quote(action)}"
+
+
+def _comment(label: str) -> str:
+    """Get a label on a single comment line."""
+    return "# " + " ".join(str(label).split())
+
+
+@register_backend("gitlab", ".gitlab-ci.yml")
+def lower_gitlab(ir: PipelineIR, parallel: bool) -> str:
+    """Lower a pipeline to GitLab CI.
+
+    Parallel jobs list the jobs they need, so they start as soon as their
+    ports are produced. Ports crossing jobs are handed over as artifacts,
+    which jobs download from the jobs they need.
+
+    Args:
+        ir (PipelineIR): The pipeline.
+        parallel (bool): One job per chain instead of one for every step.
+
+    Returns:
+        str: Content of .gitlab-ci.yml.
+    """
+
+    document = {"stages": ["build"]}
+    jobs = _jobs(ir, parallel)
+    names = _job_names(jobs, _GITLAB_KEYWORDS)
+    for index, (name, (_, steps, needs)) in enumerate(zip(names, jobs)):
+        job = {
+            "stage": "build",
+            "script": [_command(ir.steps[step].action) for step in steps],
+        }
+        if needs:
+            job["needs"] = [
+                {"job": names[need], "artifacts": True} for need in needs
+            ]
+        if parallel and ir.chains[index].exports:
+            job["artifacts"] = {
+                "paths": [f"ports/{port}" for port in ir.chains[index].exports]
+            }
+        document[name] = job
+    return f"# {_HEADER}\n" + yaml.dump(
+        document, default_flow_style=False, sort_keys=False, allow_unicode=True
+    )
+
+
+@register_backend("makefile", "Makefile")
+def lower_makefile(ir: PipelineIR, parallel: bool) -> str:
+    """Lower a pipeline to a Makefile.
+
+    Every job is a phony target depending on the jobs it needs, so
+    "make -j" runs independent chains in parallel.
+
+    Args:
+        ir (PipelineIR): The pipeline.
+        parallel (bool): One target per chain instead of one for every step.
+
+    Returns:
+        str: Content of the Makefile.
+    """
+
+    jobs = _jobs(ir, parallel)
+    names = _job_names(jobs, frozenset(["all"]))
+    lines = [
+        f"# {_HEADER}",
+        "",
+        ".PHONY: " + " ".join(["all"] + names),
+        "",
+        " ".join(["all:"] + names),
+    ]
+    for name, (_, steps, needs) in zip(names, jobs):
+        lines.append("")
+        lines.append(f"{name}:" + "".join(f" {names[need]}" for need in needs))
+        for step in steps:
+            # Make expands "$", the shell has to get it as is.
+            comment = _comment(ir.steps[step].label).replace("$", "$$")
+            command = _command(ir.steps[step].action).replace("$", "$$")
+            lines.append(f"\t{comment}")
+            lines.append(f"\t@{command}")
+    return "\n".join(lines) + "\n"
+
+
+@register_backend("shell", "pipeline.sh")
+def lower_shell(ir: PipelineIR, parallel: bool) -> str:
+    """Lower a pipeline to a POSIX shell script.
+
+    Parallel jobs run in waves: every job of a wave runs in the background
+    once the jobs it needs are done, and a failed job stops the script.
+
+    Args:
+        ir (PipelineIR): The pipeline.
+        parallel (bool): One function per chain instead of one for every
+            step.
+
+    Returns:
+        str: Content of the script.
+    """
+
+    jobs = _jobs(ir, parallel)
+    # Function names are letters, digits and "_", and mustn't hide commands.
+    names = _job_names(jobs, prefix="job_")
+    lines = ["#!/bin/sh", f"# {_HEADER}", "set -e"]
+    for name, (_, steps, _) in zip(names, jobs):
+        lines.append("")
+        lines.append(f"{name}() {{")
+        for step in steps:
+            lines.append("    " + _comment(ir.steps[step].label))
+            lines.append("    " + _command(ir.steps[step].action))
+        if not steps:
+            lines.append("    :")
+        lines.append("}")
+
+    # Jobs only need jobs before them, so a wave is one more than the
+    # latest wave of the jobs it needs.
+    waves = []
+    for index, (_, _, needs) in enumerate(jobs):
+        waves.append(1 + max((waves[need] for need in needs), default=-1))
+    for wave in range(max(waves, default=-1) + 1):
+        wave_names = [
+            names[index] for index in range(len(jobs)) if waves[index] == wave
+        ]
+        lines.append("")
+        if len(wave_names) == 1:
+            lines.append(wave_names[0])
+            continue
+        lines.append('pids=""')
+        for name in wave_names:
+            lines.append(f'{name} & pids="$pids $!"')
+        lines.append('for pid in $pids; do wait "$pid" || exit 1; done')
+    return "\n".join(lines) + "\n"
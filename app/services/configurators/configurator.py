@@ -6,6 +6,9 @@ import os
 import logging
 from abc import ABC, abstractmethod
 
+from app.services.configurators.registry import registry
+from app.services.fs_snapshot import DirectorySnapshot, scan_directory
+
 
 class Configurator(ABC):
     """Configurator of a specific language and framework.
@@ -14,6 +17,21 @@ class Configurator(ABC):
         ABC (_type_): Abstract class.
     """
 
+    def __init_subclass__(
+        cls, language: str = None, framework: str = None, **kwargs
+    ) -> None:
+        """Register a configurator class of a language and framework.
+
+        Args:
+            language (str): Language of the class, None to not register it.
+            framework (str): Framework of the class, None for the language
+                without a framework.
+        """
+
+        super().__init_subclass__(**kwargs)
+        if language is not None:
+            registry.register(cls, language, framework)
+
     def __init__(self, attributes: dict[str, any]) -> None:
         """Create a Configurator.
 
@@ -76,17 +94,22 @@ class Configurator(ABC):
             list[str]: A list of configuration files which this project has initialized.
         """
 
-        if not os.path.isdir(path):
-            error = f'Path "{path}" does not exist.'
-            logging.error(error)
-            raise NotADirectoryError(error)
+        return cls.detect_configurations(scan_directory(path))
 
-        keys = cls.get_configurations().keys()
-        initialized = []
-        for key in keys:
-            if os.path.isfile(os.path.join(path, key)):
-                initialized.append(key)
-        return initialized
+    @classmethod
+    def detect_configurations(cls, snapshot: DirectorySnapshot) -> list[str]:
+        """Get the configurations initialized in a directory snapshot.
+
+        Subclasses with configurations that aren't a file of the same name
+        extend this.
+
+        Args:
+            snapshot (DirectorySnapshot): Entries of the project folder.
+
+        Returns:
+            list[str]: Initialized configurations, without duplicates.
+        """
+        return [key for key in cls.get_configurations() if snapshot.has_file(key)]
 
     def get_serialize_data(self) -> dict[str, any]:
         """Get data to be serialized to the yaml.
@@ -2,19 +2,20 @@
 
 __all__ = ["ConfiguratorFactory"]
 
+import copy
 import logging
 
 from app.services.configurators.configurator import Configurator
-from app.services.configurators.python_configurator import (
-    PythonConfigurator,
-    FlaskConfigurator,
-)
+from app.services.configurators.registry import registry
+from app.services.fs_snapshot import DirectorySnapshot
 
 
 class ConfiguratorFactory:
-    """Factory that creates Configurator based on attributes."""
+    """Factory that creates Configurator based on attributes.
 
-    __CONFIGURATOR = {"Python": PythonConfigurator, "Python@Flask": FlaskConfigurator}
+    Configurators are looked up in the registry, see
+    app.services.configurators.registry.
+    """
 
     @classmethod
     def get_configurator(cls, attributes: dict[str, any]) -> Configurator:
@@ -36,15 +37,15 @@ class ConfiguratorFactory:
             raise KeyError(error)
 
         language = attributes["language"]
-        if "framework" in attributes:
-            language += "@" + attributes["framework"]
-
-        if language not in cls.__CONFIGURATOR:
-            error = f'Language and framework "{language}" are not supported.'
+        framework = attributes.get("framework")
+        configurator = registry.get(language, framework)
+        if configurator is None:
+            name = language if framework is None else f"{language}@{framework}"
+            error = f'Language and framework "{name}" are not supported.'
             logging.error(error)
             raise ValueError(error)
 
-        return cls.__CONFIGURATOR[language](attributes)
+        return configurator(attributes)
 
     @classmethod
     def get_supported_languages(cls) -> tuple[str]:
@@ -53,12 +54,7 @@ class ConfiguratorFactory:
         Returns:
             tuple[str]: A tuple of suppoerted languages.
         """
-
-        languages = set()
-        for key in cls.__CONFIGURATOR:
-            languages.add(key.split("@")[0])
-
-        return tuple(languages)
+        return registry.languages()
 
     @classmethod
     def get_supported_frameworks(cls, language: str) -> tuple[str]:
@@ -70,13 +66,16 @@ class ConfiguratorFactory:
         Returns:
             tuple[str]: A tuple of supported frameworks.
         """
+        return registry.frameworks(language)
 
-        frameworks = set()
-        for key in cls.__CONFIGURATOR:
-            if language in key and language != key:
-                frameworks.add(key.split("@")[1])
+    @classmethod
+    def get_fingerprint(cls) -> str:
+        """Get a hash of the supported languages, frameworks and configurations.
 
-        return tuple(frameworks)
+        Returns:
+            str: Hex digest, changes when any of them changes.
+        """
+        return registry.fingerprint()
 
     @classmethod
     def get_configurations(
@@ -91,13 +90,11 @@ class ConfiguratorFactory:
             dict[str, any]: Json of supported configuration methods and attributes of those method.
         """
 
-        if framework is not None:
-            language += f"@{framework}"
-
-        if language not in cls.__CONFIGURATOR:
+        configurations = registry.configurations(language, framework)
+        if configurations is None:
             return {}
-
-        return cls.__CONFIGURATOR[language].get_configurations()
+        # Callers may change the result, the registry's copy is shared.
+        return copy.deepcopy(dict(configurations))
 
     @classmethod
     def get_initialized_configurations(
@@ -117,12 +114,29 @@ class ConfiguratorFactory:
             list[str]: A list of configuration files which this project has initialized.
         """
 
-        if framework is not None:
-            language += f"@{framework}"
+        configurator = registry.get(language, framework)
+        if configurator is None:
+            return {}
+
+        return configurator.get_initialized_configurations(path)
+
+    @classmethod
+    def detect_configurations(
+        cls, snapshot: DirectorySnapshot, language: str, framework: str = None
+    ) -> list[str]:
+        """Get the configurations initialized in a snapshot of a project folder.
+
+        Args:
+            snapshot (DirectorySnapshot): Entries of the project folder.
+            language: A coding language.
+            framework: A coding language framework.
+
+        Returns:
+            list[str]: A list of configuration files which this project has initialized.
+        """
 
-        if language not in cls.__CONFIGURATOR:
+        configurator = registry.get(language, framework)
+        if configurator is None:
             return {}
 
-        return cls.__CONFIGURATOR[language].get_initialized_configurations(
-            path
-        )
+        return configurator.detect_configurations(snapshot)
@@ -4,13 +4,15 @@ __all__ = ["PythonConfigurator", "FlaskConfigurator"]
 
 import os
 import sys
-import shutil
+import keyword
 import logging
 
 from app.services.configurators.configurator import Configurator
+from app.services.configurators.template_engine import materialize
+from app.services.fs_snapshot import DirectorySnapshot
 
 
-class PythonConfigurator(Configurator):
+class PythonConfigurator(Configurator, language="Python"):
     """Configurator of Python with no specific framework.
 
     Args:
@@ -72,27 +74,6 @@ class PythonConfigurator(Configurator):
             configurations[key] = value
         return configurations
 
-    @classmethod
-    def get_initialized_configurations(cls, path: str) -> list[str]:
-        """Get a list of configuration files which this project has initialized.
-
-        Args:
-            path (str): Path of the project.
-
-        Raises:
-            NotADirectoryError: When path does not exist.
-
-        Returns:
-            list[str]: A list of configuration files which this project has initialized.
-        """
-
-        initialized = Configurator.get_initialized_configurations(path)
-        keys = cls.__SPECIFIC_CONFIGURATIONS.keys()
-        for key in keys:
-            if os.path.isfile(os.path.join(path, key)):
-                initialized.append(key)
-        return initialized
-
     def get_serialize_data(self) -> dict[str, any]:
         """Get data to be serialized to the yaml.
 
@@ -128,7 +109,7 @@ class PythonConfigurator(Configurator):
                 call[key]()
 
 
-class FlaskConfigurator(PythonConfigurator):
+class FlaskConfigurator(PythonConfigurator, language="Python", framework="Flask"):
     """Configurator of Python with Flask framework.
 
     Args:
@@ -177,6 +158,54 @@ class FlaskConfigurator(PythonConfigurator):
             logging.error(error)
             raise ValueError(error)
 
+        self._validate_starter_code(attributes.get("starter code"))
+
+    @classmethod
+    def _validate_starter_code(cls, variables: dict[str, any]) -> None:
+        """Validate the template variables of the starter code.
+
+        Args:
+            variables (dict[str, any]): "project_name", "package_name" and
+                "port", each optional, or None for the defaults.
+        Raises:
+            ValueError: When a variable is unknown or its value is not
+                supported.
+        """
+
+        if variables is None:
+            return
+        if not isinstance(variables, dict):
+            error = "Starter code has to be null or an object of variables."
+            logging.error(error)
+            raise ValueError(error)
+
+        for key in variables:
+            if key not in ("project_name", "package_name", "port"):
+                error = f'Unknown starter code variable "{key}".'
+                logging.error(error)
+                raise ValueError(error)
+
+        package_name = variables.get("package_name", "app")
+        if (
+            not isinstance(package_name, str)
+            or not package_name.isidentifier()
+            or keyword.iskeyword(package_name)
+        ):
+            error = f'Package name "{package_name}" is not a Python identifier.'
+            logging.error(error)
+            raise ValueError(error)
+
+        port = variables.get("port", 5000)
+        if not isinstance(port, int) or isinstance(port, bool) or not 0 < port < 65536:
+            error = f'Port "{port}" has to be an integer from 1 to 65535.'
+            logging.error(error)
+            raise ValueError(error)
+
+        if not isinstance(variables.get("project_name", ""), str):
+            error = "Project name has to be a string."
+            logging.error(error)
+            raise ValueError(error)
+
     @classmethod
     def get_configurations(cls) -> dict[str, any]:
         """Get supported configuration methods and attributes of those method.
@@ -191,28 +220,20 @@ class FlaskConfigurator(PythonConfigurator):
         return configurations
 
     @classmethod
-    def get_initialized_configurations(cls, path: str) -> list[str]:
-        """Get a list of configuration files which this project has initialized.
+    def detect_configurations(cls, snapshot: DirectorySnapshot) -> list[str]:
+        """Get the configurations initialized in a directory snapshot.
 
         Args:
-            path (str): Path of the project.
-
-        Raises:
-            NotADirectoryError: When path does not exist.
+            snapshot (DirectorySnapshot): Entries of the project folder.
 
         Returns:
-            list[str]: A list of configuration files which this project has initialized.
+            list[str]: Initialized configurations, without duplicates.
         """
 
-        initialized = PythonConfigurator.get_initialized_configurations(path)
-        keys = cls.__SPECIFIC_CONFIGURATIONS.keys()
-        for key in keys:
-            if os.path.isfile(os.path.join(path, key)):
-                initialized.append(key)
+        initialized = super().detect_configurations(snapshot)
         # Seem the project as initialized if containing any .py file.
-        for file in os.listdir(path):
-            if file.endswith(".py"):
-                initialized.append("starter code")
+        if "starter code" not in initialized and snapshot.has_suffix(".py"):
+            initialized.append("starter code")
         return initialized
 
     def get_serialize_data(self) -> dict[str, any]:
@@ -226,8 +247,14 @@ class FlaskConfigurator(PythonConfigurator):
         data["framework"] = "Flask"
         return data
 
-    def _build_starter_code(self) -> None:
-        """Create a starter code for Flask framework."""
+    def _build_starter_code(self, variables: dict[str, any] = None) -> None:
+        """Create a starter code for Flask framework.
+
+        Args:
+            variables (dict[str, any]): Template variables overriding the
+                defaults, a project named after its folder, package "app" and
+                port 5000.
+        """
 
         # Use absolute path.
         if hasattr(sys, "_MEIPASS"):
@@ -235,9 +262,21 @@ class FlaskConfigurator(PythonConfigurator):
             base_dir = sys._MEIPASS
         else:
             base_dir = os.path.dirname(os.path.abspath(__file__))
-        # Copy a starter code from the template file.
+        # Render a starter code from the template file.
         source = os.path.join(base_dir, "templates", "flask")
-        shutil.copytree(source, self._path, dirs_exist_ok=True)
+        template_variables = {
+            "project_name": os.path.basename(os.path.abspath(self._path)),
+            "package_name": "app",
+            "port": 5000,
+        }
+        template_variables.update(variables or {})
+        report = materialize(source, self._path, template_variables)
+        logging.info(
+            "Starter code: %d created, %d updated, %d unchanged.",
+            len(report["created"]),
+            len(report["updated"]),
+            len(report["unchanged"]),
+        )
 
     def build_configurations(self) -> None:
         """Build configurations for the project in local storage."""
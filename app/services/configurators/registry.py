@@ -0,0 +1,222 @@
+"""Registry of configurators by language and framework.
+
+Configurators register themselves when their class is defined:
+
+    class DjangoConfigurator(PythonConfigurator, language="Python", framework="Django"):
+        ...
+
+Plugins register configurators from other packages with an entry point in
+the "resiliflow.configurators" group, naming a module or a class that
+defines them. Built-in configurators and plugins are loaded on the first
+query, then every query is answered from immutable indexes.
+"""
+
+__all__ = ["ConfiguratorRegistry", "ENTRY_POINT_GROUP", "registry"]
+
+import hashlib
+import importlib
+import importlib.metadata
+import json
+import logging
+import threading
+from types import MappingProxyType
+
+ENTRY_POINT_GROUP = "resiliflow.configurators"
+
+# Modules defining the built-in configurators.
+_BUILTIN_MODULES = ("app.services.configurators.python_configurator",)
+
+
+class _Index:
+    """Immutable lookup tables built from the registered configurators."""
+
+    __slots__ = (
+        "languages",
+        "frameworks",
+        "configurators",
+        "configurations",
+        "fingerprint",
+    )
+
+    def __init__(self, configurators: dict[tuple[str, str], type]) -> None:
+        """Create an _Index.
+
+        Args:
+            configurators (dict[tuple[str, str], type]): Configurator classes
+                by (language, framework), framework None for plain languages.
+        """
+
+        frameworks: dict[str, list[str]] = {}
+        for language, framework in configurators:
+            frameworks.setdefault(language, [])
+            if framework is not None:
+                frameworks[language].append(framework)
+
+        self.languages = tuple(sorted(frameworks))
+        self.frameworks = MappingProxyType(
+            {
+                language: tuple(sorted(names))
+                for language, names in frameworks.items()
+            }
+        )
+        self.configurators = MappingProxyType(dict(configurators))
+        self.configurations = MappingProxyType(
+            {
+                key: MappingProxyType(configurator.get_configurations())
+                for key, configurator in configurators.items()
+            }
+        )
+        # Changes whenever a query could answer differently.
+        state = {
+            _name(key): [_path(configurator), configurator.get_configurations()]
+            for key, configurator in configurators.items()
+        }
+        self.fingerprint = hashlib.sha256(
+            json.dumps(state, sort_keys=True, default=repr).encode("utf-8")
+        ).hexdigest()
+
+
+class ConfiguratorRegistry:
+    """Configurator classes by language and framework."""
+
+    def __init__(self, modules: tuple[str] = (), group: str = None) -> None:
+        """Create a ConfiguratorRegistry.
+
+        Args:
+            modules (tuple[str]): Modules imported before the first query.
+            group (str): Entry point group of plugins, None for no plugins.
+        """
+
+        self._modules = modules
+        self._group = group
+        self._loaded = False
+        self._configurators: dict[tuple[str, str], type] = {}
+        self._index: _Index = None
+        self._lock = threading.RLock()
+
+    def register(
+        self, configurator: type, language: str, framework: str = None
+    ) -> None:
+        """Register a configurator class.
+
+        Args:
+            configurator (type): Configurator class.
+            language (str): Language of the configurator.
+            framework (str): Framework of the configurator, None for the
+                language without a framework.
+
+        Raises:
+            ValueError: When another class is registered for the language and
+                framework.
+        """
+
+        key = (language, framework)
+        with self._lock:
+            registered = self._configurators.get(key)
+            # Reloading a module defines its classes again.
+            if registered is not None and _path(registered) != _path(configurator):
+                error = f'Language and framework "{_name(key)}" are already '
+                error += f"registered by {_path(registered)}."
+                logging.error(error)
+                raise ValueError(error)
+            self._configurators[key] = configurator
+            self._index = None
+
+    def _load(self) -> None:
+        """Import the built-in configurators and plugins once. Needs the lock."""
+
+        if self._loaded:
+            return
+        self._loaded = True
+        for module in self._modules:
+            importlib.import_module(module)
+        if self._group is None:
+            return
+        for entry_point in importlib.metadata.entry_points(group=self._group):
+            try:
+                entry_point.load()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # A broken plugin shouldn't take the built-in ones down.
+                logging.exception(
+                    'Failed to load configurator "%s".', entry_point.name
+                )
+
+    def _get_index(self) -> _Index:
+        """Get the indexes, built after the first query and registrations."""
+
+        index = self._index
+        if index is not None:
+            return index
+        with self._lock:
+            self._load()
+            if self._index is None:
+                self._index = _Index(self._configurators)
+            return self._index
+
+    def get(self, language: str, framework: str = None):
+        """Get the configurator class of a language and framework.
+
+        Args:
+            language (str): A programming language.
+            framework (str): A framework of the language.
+
+        Returns:
+            type | None: The configurator class, None when not supported.
+        """
+        return self._get_index().configurators.get((language, framework))
+
+    def languages(self) -> tuple[str]:
+        """Get the supported languages.
+
+        Returns:
+            tuple[str]: Supported languages, sorted.
+        """
+        return self._get_index().languages
+
+    def frameworks(self, language: str) -> tuple[str]:
+        """Get the supported frameworks of a language.
+
+        Args:
+            language (str): A programming language.
+
+        Returns:
+            tuple[str]: Supported frameworks, sorted, empty for unknown languages.
+        """
+        return self._get_index().frameworks.get(language, ())
+
+    def configurations(self, language: str, framework: str = None):
+        """Get the configurations of a language and framework.
+
+        Args:
+            language (str): A programming language.
+            framework (str): A framework of the language.
+
+        Returns:
+            Mapping[str, any] | None: Read-only configurations, None when not
+                supported.
+        """
+        return self._get_index().configurations.get((language, framework))
+
+    def fingerprint(self) -> str:
+        """Get a hash of every registered configurator and configuration.
+
+        Returns:
+            str: Hex digest, the same as long as the registry answers every
+                query the same.
+        """
+        return self._get_index().fingerprint
+
+
+def _path(configurator: type) -> str:
+    """Get the import path of a class."""
+    return f"{configurator.__module__}.{configurator.__qualname__}"
+
+
+def _name(key: tuple[str, str]) -> str:
+    """Format a (language, framework) key like "Python@Flask"."""
+
+    language, framework = key
+    return language if framework is None else f"{language}@{framework}"
+
+
+registry = ConfiguratorRegistry(_BUILTIN_MODULES, ENTRY_POINT_GROUP)
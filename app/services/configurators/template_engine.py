@@ -0,0 +1,408 @@
+"""Copy starter templates into projects.
+
+The files of a template are listed and hashed once per process. Copies
+skip files that are already identical at the destination and use the
+fastest way the platform offers: a reflink (copy-on-write clone), then
+copy_file_range, then shutil.copyfile, which uses sendfile or fcopyfile.
+
+Files ending with ".j2" and path segments like "{{package_name}}" are
+Jinja2 templates rendered with the variables of each project. They are
+compiled with the manifest, once per process, and the bytecode is cached
+on disk so other processes skip compiling too. Values written into Python
+code go through the "python_string" filter, which quotes them as a string
+literal.
+"""
+
+__all__ = [
+    "TEMPLATE_SUFFIX",
+    "TemplateFile",
+    "TemplateManifest",
+    "get_manifest",
+    "materialize",
+]
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import jinja2
+
+# Suffix of files rendered with Jinja2, removed from the rendered file name.
+TEMPLATE_SUFFIX = ".j2"
+
+# Never part of a template, e.g. left by running its code.
+_IGNORED_FOLDERS = frozenset(["__pycache__", ".git"])
+
+# ioctl cloning a file on btrfs, xfs and other copy-on-write file systems.
+_FICLONE = 0x40049409
+
+_CHUNK_SIZE = 1 << 20
+
+
+class TemplateFile:
+    """A file of a template."""
+
+    __slots__ = ("path", "size", "sha256", "mode", "template")
+
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        sha256: str,
+        mode: int,
+        template: jinja2.Template = None,
+    ) -> None:
+        """Create a TemplateFile.
+
+        Args:
+            path (str): Path relative to the template root.
+            size (int): Size in bytes.
+            sha256 (str): Hex digest of the content.
+            mode (int): Permission bits.
+            template (jinja2.Template): Compiled content of a ".j2" file, None
+                for files copied as they are.
+        """
+
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.mode = mode
+        self.template = template
+
+
+class TemplateManifest:
+    """Folders and files of a template."""
+
+    __slots__ = ("root", "directories", "files", "path_templates")
+
+    def __init__(
+        self,
+        root: str,
+        directories: tuple[str],
+        files: tuple[TemplateFile],
+        path_templates: dict[str, jinja2.Template] = None,
+    ) -> None:
+        """Create a TemplateManifest.
+
+        Args:
+            root (str): Absolute path of the template.
+            directories (tuple[str]): Relative paths of the folders, parents
+                first.
+            files (tuple[TemplateFile]): Files of the template.
+            path_templates (dict[str, jinja2.Template]): Compiled relative
+                paths containing variables, by path.
+        """
+
+        self.root = root
+        self.directories = directories
+        self.files = files
+        self.path_templates = MappingProxyType(dict(path_templates or {}))
+
+    def render_path(self, path: str, variables: dict[str, any]) -> str:
+        """Render the variables of a relative path and drop TEMPLATE_SUFFIX.
+
+        Args:
+            path (str): Path of a folder or file relative to the root.
+            variables (dict[str, any]): Variables of the project.
+
+        Raises:
+            ValueError: When a variable is missing or a segment renders empty
+                or out of its folder.
+
+        Returns:
+            str: The relative path in the project.
+        """
+
+        template = self.path_templates.get(path)
+        rendered = path if template is None else _render(template, variables)
+        if rendered.endswith(TEMPLATE_SUFFIX):
+            rendered = rendered[: -len(TEMPLATE_SUFFIX)]
+        for segment in rendered.split(os.sep):
+            if segment in ("", os.curdir, os.pardir) or "/" in segment:
+                error = f'Template path "{path}" renders to "{rendered}".'
+                logging.error(error)
+                raise ValueError(error)
+        return rendered
+
+
+def _hash_file(path: str) -> str:
+    """Get the sha256 hex digest of a file."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(functools.partial(file.read, _CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _render(template: jinja2.Template, variables: dict[str, any]) -> str:
+    """Render a compiled template, every variable it uses is required."""
+
+    try:
+        return template.render(variables)
+    except jinja2.UndefinedError as ex:
+        error = f'Missing template variable: {ex.message}.'
+        logging.error(error)
+        raise ValueError(error) from ex
+
+
+def _python_string(value) -> str:
+    """Quote a value as a Python string literal, whatever it contains."""
+
+    # Json strings are valid Python strings, and always in double quotes.
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _get_environment(root: str) -> jinja2.Environment:
+    """Create the environment compiling the templates of a root."""
+
+    environment = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(root),
+        # Templates compiled by earlier processes are loaded from disk.
+        bytecode_cache=jinja2.FileSystemBytecodeCache(),
+        undefined=jinja2.StrictUndefined,
+        keep_trailing_newline=True,
+        # Sources are read once, the manifest keeps the compiled templates.
+        auto_reload=False,
+        cache_size=-1,
+    )
+    environment.filters["python_string"] = _python_string
+    return environment
+
+
+@functools.lru_cache(maxsize=None)
+def get_manifest(root: str) -> TemplateManifest:
+    """List, hash and compile the files of a template, once per process.
+
+    Args:
+        root (str): Absolute path of the template.
+
+    Raises:
+        NotADirectoryError: When root does not exist.
+
+    Returns:
+        TemplateManifest: The manifest.
+    """
+
+    if not os.path.isdir(root):
+        error = f'Path "{root}" does not exist.'
+        logging.error(error)
+        raise NotADirectoryError(error)
+
+    environment = _get_environment(root)
+    directories, files, path_templates = [], [], {}
+    for folder, subfolders, names in os.walk(root):
+        subfolders[:] = sorted(
+            name for name in subfolders if name not in _IGNORED_FOLDERS
+        )
+        relative = os.path.relpath(folder, root)
+        if relative != os.curdir:
+            directories.append(relative)
+        for name in sorted(names):
+            path = os.path.join(folder, name)
+            status = os.stat(path)
+            template_file = TemplateFile(
+                os.path.normpath(os.path.join(relative, name)),
+                status.st_size,
+                _hash_file(path),
+                stat.S_IMODE(status.st_mode),
+            )
+            if name.endswith(TEMPLATE_SUFFIX):
+                # Loader names use "/" on every platform.
+                template_file.template = environment.get_template(
+                    template_file.path.replace(os.sep, "/")
+                )
+            files.append(template_file)
+
+    for path in directories + [template_file.path for template_file in files]:
+        if "{{" in path:
+            path_templates[path] = environment.from_string(path)
+    return TemplateManifest(
+        root, tuple(directories), tuple(files), path_templates
+    )
+
+
+def _is_identical(path: str, template_file: TemplateFile) -> bool:
+    """Check whether a file already has the content of a template file."""
+
+    try:
+        if os.stat(path).st_size != template_file.size:
+            return False
+        return _hash_file(path) == template_file.sha256
+    except OSError:
+        return False
+
+
+def _has_content(path: str, content: bytes) -> bool:
+    """Check whether a file already has a rendered content."""
+
+    try:
+        if os.stat(path).st_size != len(content):
+            return False
+        with open(path, "rb") as file:
+            return file.read() == content
+    except OSError:
+        return False
+
+
+def _write_file(destination: str, content: bytes, mode: int) -> None:
+    """Replace a file with a rendered content, never half written."""
+
+    temporary = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            file.write(content)
+        os.chmod(temporary, mode)
+        os.replace(temporary, destination)
+    except BaseException:
+        if os.path.lexists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _reflink(source: str, destination: str) -> bool:
+    """Clone a file sharing its blocks, False when the file system can't."""
+
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl  # pylint: disable=import-outside-toplevel
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            # Not a copy-on-write file system, or across file systems.
+            return False
+    return True
+
+
+def _copy_range(source: str, destination: str, size: int) -> bool:
+    """Copy a file in the kernel, False when copy_file_range isn't usable."""
+
+    if not hasattr(os, "copy_file_range"):
+        return False
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        copied = 0
+        try:
+            while copied < size:
+                count = os.copy_file_range(
+                    src.fileno(), dst.fileno(), size - copied
+                )
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            return False
+    return copied == size
+
+
+def _copy_file(
+    source: str, destination: str, template_file: TemplateFile, link: bool
+) -> None:
+    """Replace a file with a copy of a template file.
+
+    The copy is written next to the destination and moved over it, so a
+    failed copy never leaves a half written file.
+    """
+
+    temporary = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if link:
+            os.link(source, temporary)
+        elif not (
+            _reflink(source, temporary)
+            or _copy_range(source, temporary, template_file.size)
+        ):
+            shutil.copyfile(source, temporary)
+        if not link:
+            os.chmod(temporary, template_file.mode)
+        os.replace(temporary, destination)
+    except BaseException:
+        if os.path.lexists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def materialize(
+    root: str,
+    destination: str,
+    variables: dict[str, any] = None,
+    link: bool = False,
+    workers: int = None,
+) -> dict[str, list[str]]:
+    """Copy a template into a folder, leaving identical files untouched.
+
+    Args:
+        root (str): Absolute path of the template.
+        destination (str): Folder to copy into.
+        variables (dict[str, any]): Variables rendered in ".j2" files and
+            paths.
+        link (bool): Hard link the files instead of copying them. Editing a
+            linked file also edits the template, so only use it for
+            read-only output. Rendered files are always written.
+        workers (int): Threads copying files, defaults to 4 per CPU since
+            the work is waiting for the disk.
+
+    Raises:
+        NotADirectoryError: When root or destination does not exist.
+        ValueError: When a template uses a missing variable or a path
+            renders out of its folder.
+
+    Returns:
+        dict[str, list[str]]: Relative paths in the destination that were
+            "created", "updated" or "unchanged".
+    """
+
+    if not os.path.isdir(destination):
+        error = f'Path "{destination}" does not exist.'
+        logging.error(error)
+        raise NotADirectoryError(error)
+
+    variables = variables or {}
+    manifest = get_manifest(os.path.abspath(root))
+    # Paths are rendered first, so a bad variable fails before any write.
+    paths = [
+        manifest.render_path(template_file.path, variables)
+        for template_file in manifest.files
+    ]
+    for directory in manifest.directories:
+        directory = manifest.render_path(directory, variables)
+        os.makedirs(os.path.join(destination, directory), exist_ok=True)
+
+    def copy(template_file: TemplateFile, path: str) -> str:
+        target = os.path.join(destination, path)
+        if template_file.template is not None:
+            content = _render(template_file.template, variables).encode("utf-8")
+            if _has_content(target, content):
+                return "unchanged"
+            existed = os.path.lexists(target)
+            _write_file(target, content, template_file.mode)
+            return "updated" if existed else "created"
+
+        if _is_identical(target, template_file):
+            return "unchanged"
+        existed = os.path.lexists(target)
+        _copy_file(
+            os.path.join(manifest.root, template_file.path),
+            target,
+            template_file,
+            link,
+        )
+        return "updated" if existed else "created"
+
+    report = {"created": [], "updated": [], "unchanged": []}
+    workers = workers or min(32, 4 * (os.cpu_count() or 1))
+    with ThreadPoolExecutor(max(1, min(workers, len(manifest.files)))) as pool:
+        for path, result in zip(
+            paths, pool.map(copy, manifest.files, paths)
+        ):
+            report[result].append(path)
+    return report
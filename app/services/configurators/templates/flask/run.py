@@ -1,10 +0,0 @@
-"""A Flask template.
-"""
-
-from app import create_app
-
-
-app = create_app()
-
-if __name__ == "__main__":
-    app.run(debug=True)
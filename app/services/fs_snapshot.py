@@ -0,0 +1,176 @@
+"""Read a directory once and answer file checks from memory."""
+
+__all__ = ["DirectorySnapshot", "scan_directory", "clear_snapshots"]
+
+import logging
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+from app.services.metrics import register_stats
+
+# Directories changed this recently aren't cached. A file created in the same
+# timestamp tick as the last scan wouldn't change the directory times.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def _version(status: os.stat_result) -> tuple[int, int, int]:
+    """Get what changes when entries of a directory change.
+
+    The mtime alone isn't enough: copytree and archive tools set it back to
+    an old value, but that changes the ctime.
+    """
+    return status.st_ino, status.st_mtime_ns, status.st_ctime_ns
+
+
+class DirectorySnapshot:
+    """Names of the entries of a directory at one point in time."""
+
+    __slots__ = ("path", "version", "files", "directories")
+
+    def __init__(
+        self,
+        path: str,
+        version: tuple[int, int, int],
+        files: frozenset[str],
+        directories: frozenset[str],
+    ) -> None:
+        """Create a DirectorySnapshot.
+
+        Args:
+            path (str): Absolute path of the directory.
+            version (tuple[int, int, int]): Inode, mtime and ctime of the
+                directory when scanned.
+            files (frozenset[str]): Names of the files, links to files included.
+            directories (frozenset[str]): Names of the sub directories.
+        """
+
+        self.path = path
+        self.version = version
+        self.files = files
+        self.directories = directories
+
+    def has_file(self, name: str) -> bool:
+        """Check whether a file is in the directory.
+
+        Args:
+            name (str): File name.
+
+        Returns:
+            bool: Is there a file with that name.
+        """
+        return name in self.files
+
+    def has_suffix(self, suffix: str) -> bool:
+        """Check whether any file name ends with a suffix, e.g. ".py".
+
+        Args:
+            suffix (str): Suffix of the file name.
+
+        Returns:
+            bool: Is there a file with that suffix.
+        """
+        return any(name.endswith(suffix) for name in self.files)
+
+
+class _SnapshotCache:
+    """An LRU cache of snapshots keyed by path, validated by version."""
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._snapshots: OrderedDict[str, DirectorySnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, version: tuple[int, int, int]):
+        with self._lock:
+            snapshot = self._snapshots.get(path)
+            if snapshot is not None and snapshot.version == version:
+                self._snapshots.move_to_end(path)
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+            return None
+
+    def put(self, snapshot: DirectorySnapshot) -> None:
+        with self._lock:
+            self._snapshots[snapshot.path] = snapshot
+            self._snapshots.move_to_end(snapshot.path)
+            while len(self._snapshots) > self._max_size:
+                self._snapshots.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._snapshots),
+                "max_size": self._max_size,
+            }
+
+
+_cache = _SnapshotCache(1024)
+register_stats("directory_snapshots", _cache.info)
+
+
+def scan_directory(path: str) -> DirectorySnapshot:
+    """Get a snapshot of a directory, read with a single os.scandir.
+
+    Snapshots are cached until the directory changes, so checking an
+    unchanged directory costs one stat.
+
+    Args:
+        path (str): Path of the directory.
+
+    Raises:
+        NotADirectoryError: When path does not exist.
+
+    Returns:
+        DirectorySnapshot: The entries of the directory.
+    """
+
+    try:
+        status = os.stat(path)
+    except OSError:
+        status = None
+    if status is None or not stat.S_ISDIR(status.st_mode):
+        error = f'Path "{path}" does not exist.'
+        logging.error(error)
+        raise NotADirectoryError(error)
+
+    path = os.path.abspath(path)
+    version = _version(status)
+    snapshot = _cache.get(path, version)
+    if snapshot is not None:
+        return snapshot
+
+    files, directories = set(), set()
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    directories.add(entry.name)
+                elif entry.is_file():
+                    files.add(entry.name)
+            except OSError:
+                continue
+
+    snapshot = DirectorySnapshot(
+        path, version, frozenset(files), frozenset(directories)
+    )
+    changed = max(status.st_mtime_ns, status.st_ctime_ns)
+    if time.time_ns() - changed > RACY_WINDOW_NS:
+        _cache.put(snapshot)
+    return snapshot
+
+
+def clear_snapshots() -> None:
+    """Forget every cached snapshot."""
+    _cache.clear()
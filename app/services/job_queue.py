@@ -0,0 +1,255 @@
+"""Run long operations in the background and poll their results."""
+
+__all__ = ["Job", "JobQueue", "QueueFullError", "get_job_queue"]
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from app.services.metrics import register_stats
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted to a full queue."""
+
+
+class Job:
+    """A function call waiting for or running on a worker."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, name: str, function, args: tuple, kwargs: dict) -> None:
+        """Create a Job.
+
+        Args:
+            name (str): Name of the operation, e.g. "compile".
+            function (Callable): Function to call.
+            args (tuple): Positional arguments of the function.
+            kwargs (dict): Keyword arguments of the function.
+        """
+
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = Job.QUEUED
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._function = function
+        self._args = args
+        self._kwargs = kwargs
+
+    @property
+    def done(self) -> bool:
+        """Has the job stopped for good."""
+        return self.status in (Job.SUCCEEDED, Job.FAILED, Job.CANCELLED)
+
+    def to_dict(self) -> dict[str, any]:
+        """Get the job as json.
+
+        Returns:
+            dict[str, any]: The job.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobQueue:
+    """A bounded queue of jobs served by a pool of worker threads."""
+
+    def __init__(
+        self, max_size: int = 64, workers: int = 2, max_finished: int = 1000
+    ) -> None:
+        """Create a JobQueue. Workers start with the first job.
+
+        Args:
+            max_size (int): Jobs that can wait at the same time.
+            workers (int): Worker threads.
+            max_finished (int): Finished jobs kept for polling, the oldest
+                ones are forgotten first.
+        """
+
+        self._queue = queue.Queue(max_size)
+        self._max_size = max_size
+        self._worker_count = workers
+        self._max_finished = max_finished
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._running = 0
+        self._workers: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, function, *args, **kwargs) -> Job:
+        """Queue a function call.
+
+        Args:
+            name (str): Name of the operation, e.g. "compile".
+            function (Callable): Function to call.
+            *args: Positional arguments of the function.
+            **kwargs: Keyword arguments of the function.
+
+        Raises:
+            QueueFullError: When max_size jobs are already waiting.
+
+        Returns:
+            Job: The queued job.
+        """
+
+        job = Job(name, function, args, kwargs)
+        with self._lock:
+            self._start_workers()
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                error = "Job queue is full."
+                logging.error(error)
+                raise QueueFullError(error) from None
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str):
+        """Get a job.
+
+        Args:
+            job_id (str): Id of the job.
+
+        Returns:
+            Job | None: The job, None when it doesn't exist or was forgotten.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that hasn't started. Running jobs can't be stopped.
+
+        Args:
+            job_id (str): Id of the job.
+
+        Raises:
+            KeyError: When the job doesn't exist.
+
+        Returns:
+            bool: Was the job cancelled.
+        """
+
+        with self._lock:
+            if job_id not in self._jobs:
+                raise KeyError(f'Job "{job_id}" does not exist.')
+            job = self._jobs[job_id]
+            if job.status != Job.QUEUED:
+                return False
+            # The worker drops cancelled jobs when it takes them.
+            job.status = Job.CANCELLED
+            job.finished = time.time()
+            self._forget_finished(job)
+            return True
+
+    def stats(self) -> dict[str, int]:
+        """Get queue depth and worker usage.
+
+        Returns:
+            dict[str, int]: {"queued", "running", "capacity", "workers", "jobs"}.
+        """
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "running": self._running,
+                "capacity": self._max_size,
+                "workers": self._worker_count,
+                "jobs": len(self._jobs),
+            }
+
+    def _start_workers(self) -> None:
+        """Start the worker threads if they aren't running. Needs the lock."""
+
+        if self._workers:
+            return
+        for index in range(self._worker_count):
+            worker = threading.Thread(
+                target=self._work, name=f"job-worker-{index}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self) -> None:
+        """Run jobs forever."""
+
+        while True:
+            job: Job = self._queue.get()
+            with self._lock:
+                if job.status == Job.CANCELLED:
+                    continue
+                job.status = Job.RUNNING
+                job.started = time.time()
+                self._running += 1
+
+            try:
+                result = job._function(*job._args, **job._kwargs)
+                status, error = Job.SUCCEEDED, None
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                logging.exception('Job "%s" failed.', job.id)
+                result, status = None, Job.FAILED
+                error = str(ex.args[0]) if len(ex.args) == 1 else str(ex)
+
+            with self._lock:
+                job.result = result
+                job.error = error
+                job.status = status
+                job.finished = time.time()
+                job._function = job._args = job._kwargs = None
+                self._running -= 1
+                self._forget_finished(job)
+
+    def _forget_finished(self, job: Job) -> None:
+        """Track a finished job and forget the oldest ones. Needs the lock.
+
+        Args:
+            job (Job): The finished job.
+        """
+
+        self._finished[job.id] = None
+        while len(self._finished) > self._max_finished:
+            job_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(job_id, None)
+
+
+_job_queue: JobQueue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the job queue of the service.
+
+    Returns:
+        JobQueue: The job queue.
+    """
+
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
+
+
+def _stats() -> dict[str, int]:
+    """Get the stats of the job queue without creating it."""
+    return _job_queue.stats() if _job_queue is not None else {}
+
+
+register_stats("job_queue", _stats)
@@ -0,0 +1,254 @@
+"""Per-route request metrics and internal stats of caches and queues."""
+
+__all__ = ["RequestMetrics", "register_stats", "collect_stats"]
+
+import bisect
+import threading
+import time
+
+from flask import Flask, Response, g, request
+
+# Upper bounds of the latency histogram buckets in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_stats_providers = {}
+_stats_lock = threading.Lock()
+
+
+def register_stats(name: str, provider) -> None:
+    """Register a source of internal stats, e.g. a cache or a queue.
+
+    Args:
+        name (str): Name of the source.
+        provider (Callable[[], dict[str, int | float]]): Returns the current
+            stats. Caches should report "hits" and "misses".
+    """
+    with _stats_lock:
+        _stats_providers[name] = provider
+
+
+def collect_stats() -> dict[str, dict[str, int | float]]:
+    """Get the stats of every registered source.
+
+    Returns:
+        dict[str, dict[str, int | float]]: Stats by source. Sources with
+            "hits" and "misses" get a "hit_ratio".
+    """
+
+    with _stats_lock:
+        providers = dict(_stats_providers)
+
+    stats = {}
+    for name, provider in sorted(providers.items()):
+        values = dict(provider())
+        if "hits" in values and "misses" in values:
+            lookups = values["hits"] + values["misses"]
+            values["hit_ratio"] = values["hits"] / lookups if lookups else None
+        stats[name] = values
+    return stats
+
+
+class _RouteMetrics:
+    """Metrics of one endpoint and method."""
+
+    __slots__ = ("buckets", "total", "count", "statuses", "errors", "in_flight")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.statuses: dict[int, int] = {}
+        self.errors = 0
+        self.in_flight = 0
+
+    def percentile(self, fraction: float):
+        """Estimate a latency percentile from the histogram.
+
+        Args:
+            fraction (float): Percentile between 0 and 1.
+
+        Returns:
+            float | None: Upper bound of the bucket holding the percentile,
+                None without requests or when it's above the last bucket.
+        """
+
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def _labels(**labels) -> str:
+    """Format Prometheus labels."""
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+class RequestMetrics:
+    """Latency, request, error and in-flight metrics of every route.
+
+    Routes are identified by their URL rule, requests matching no rule are
+    counted under "unmatched".
+    """
+
+    def __init__(self) -> None:
+        """Create a RequestMetrics."""
+
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        """Record every request of an app.
+
+        Args:
+            app (Flask): The app.
+        """
+
+        app.extensions["metrics"] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    @staticmethod
+    def _key() -> tuple[str, str]:
+        rule = request.url_rule.rule if request.url_rule else "unmatched"
+        return rule, request.method
+
+    def _route(self, key: tuple[str, str]) -> _RouteMetrics:
+        """Get the metrics of a route. Needs the lock."""
+
+        if key not in self._routes:
+            self._routes[key] = _RouteMetrics()
+        return self._routes[key]
+
+    def _before_request(self) -> None:
+        g.metrics_start = time.perf_counter()
+        g.metrics_recorded = False
+        with self._lock:
+            self._route(self._key()).in_flight += 1
+
+    def _after_request(self, response: Response) -> Response:
+        self._record(response.status_code)
+        return response
+
+    def _teardown_request(self, _exception) -> None:
+        # after_request is skipped when building the response fails.
+        if "metrics_start" not in g:
+            return
+        self._record(500)
+        with self._lock:
+            self._route(self._key()).in_flight -= 1
+
+    def _record(self, status: int) -> None:
+        """Record the end of the current request once."""
+
+        if "metrics_start" not in g or g.metrics_recorded:
+            return
+        g.metrics_recorded = True
+        duration = time.perf_counter() - g.metrics_start
+        with self._lock:
+            route = self._route(self._key())
+            route.buckets[bisect.bisect_left(BUCKETS, duration)] += 1
+            route.total += duration
+            route.count += 1
+            route.statuses[status] = route.statuses.get(status, 0) + 1
+            if status >= 500:
+                route.errors += 1
+
+    def summary(self) -> dict[str, dict[str, any]]:
+        """Get a summary of every route.
+
+        Returns:
+            dict[str, dict[str, any]]: {"requests", "errors", "in_flight",
+                "mean", "p50", "p95", "statuses"} by "METHOD rule".
+        """
+
+        with self._lock:
+            return {
+                f"{method} {rule}": {
+                    "requests": route.count,
+                    "errors": route.errors,
+                    "in_flight": route.in_flight,
+                    "mean": route.total / route.count if route.count else None,
+                    "p50": route.percentile(0.5),
+                    "p95": route.percentile(0.95),
+                    "statuses": {
+                        str(status): count
+                        for status, count in sorted(route.statuses.items())
+                    },
+                }
+                for (rule, method), route in sorted(self._routes.items())
+            }
+
+    def render_prometheus(self) -> str:
+        """Render the metrics and internal stats in Prometheus text format.
+
+        Returns:
+            str: Prometheus exposition text.
+        """
+
+        latency = "resiliflow_http_request_duration_seconds"
+        lines = [
+            f"# HELP {latency} Request latency in seconds.",
+            f"# TYPE {latency} histogram",
+        ]
+        requests = [
+            "# HELP resiliflow_http_requests_total Finished requests.",
+            "# TYPE resiliflow_http_requests_total counter",
+        ]
+        errors = [
+            "# HELP resiliflow_http_request_errors_total Requests answered with 5xx.",
+            "# TYPE resiliflow_http_request_errors_total counter",
+        ]
+        in_flight = [
+            "# HELP resiliflow_http_requests_in_flight Requests being served.",
+            "# TYPE resiliflow_http_requests_in_flight gauge",
+        ]
+
+        with self._lock:
+            for (rule, method), route in sorted(self._routes.items()):
+                labels = _labels(endpoint=rule, method=method)
+                cumulative = 0
+                for bound, count in zip(BUCKETS, route.buckets):
+                    cumulative += count
+                    lines.append(
+                        f'{latency}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'{latency}_bucket{{{labels},le="+Inf"}} {route.count}')
+                lines.append(f"{latency}_sum{{{labels}}} {route.total}")
+                lines.append(f"{latency}_count{{{labels}}} {route.count}")
+                for status, count in sorted(route.statuses.items()):
+                    status_labels = _labels(endpoint=rule, method=method, status=status)
+                    requests.append(
+                        f"resiliflow_http_requests_total{{{status_labels}}} {count}"
+                    )
+                errors.append(
+                    f"resiliflow_http_request_errors_total{{{labels}}} {route.errors}"
+                )
+                in_flight.append(
+                    f"resiliflow_http_requests_in_flight{{{labels}}} {route.in_flight}"
+                )
+
+        stats = [
+            "# HELP resiliflow_stat Internal stats of caches and queues.",
+            "# TYPE resiliflow_stat gauge",
+        ]
+        for source, values in collect_stats().items():
+            for name, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                stat_labels = _labels(source=source, name=name)
+                stats.append(f"resiliflow_stat{{{stat_labels}}} {value}")
+
+        return "\n".join(lines + requests + errors + in_flight + stats) + "\n"
@@ -1,39 +1,303 @@
 """serialize created nodes into a pipeline1 yaml file"""
 """deserialize pipeline1.yaml into node structure (array)"""
 
-import yaml
+import functools
+import itertools
+import logging
 import os
-from app.services.pipelineDesign import Node, Position
+import re
+import threading
+from collections import OrderedDict
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
+from app.services.pipelineDesign import Node, NodeTable, Position, intern_strings
+from app.services.pipeline_graph import PipelineGraph
+from app.services.metrics import register_stats
+from app.services import sidecar
+from app.services.pipeline_schema import iter_validate
+from app.services.pipeline_ir import (
+    PipelineIR,
+    build_ir,
+    get_backend_file,
+    lower,
+    register_backend,
+)
+
+# A project is a folder with this attribute file, as in ProjectSerializor.
+_PROJECT_ATTRIBUTE_FILE = os.path.join(".hlzcs", "project_attributes.yaml")
+# Sidecars of the pipelines of a project, by path relative to the project.
+_SIDECAR_FOLDER = os.path.join(".hlzcs", "sidecars")
 
 
 def deserialize(input: str):
+    return list(iter_deserialize(input))
+
+
+def iter_deserialize(input: str):
+    """Read a pipeline file and yield its nodes one at a time.
+
+    Entries are composed from yaml events one by one, so only the current
+    entry is held in memory instead of the whole document. Entries of both
+    schema versions are accepted, see app.services.pipeline_schema.
+
+    Args:
+        input (str): Path of the pipeline file.
+
+    Raises:
+        FileNotFoundError: When the file doesn't exist.
+        ValueError: When the file isn't a list of nodes.
+        PipelineValidationError: After the valid nodes before the first
+            invalid one, listing every error of the file.
+
+    Returns:
+        Iterator[Node]: Nodes in file order.
+    """
+
     file_path = input
 
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"{file_path} do not exist")
 
+    return (
+        _entry_to_node(entry)
+        for entry in iter_validate(_iter_entries(file_path))
+    )
+
+
+if yaml.__with_libyaml__:
+    class _StreamLoader(yaml.cyaml.CParser, Composer, SafeConstructor, Resolver):
+        """Safe loader that parses with libyaml and composes entries one by one.
+
+        CSafeLoader can only compose whole documents, so the composer comes
+        from the pure Python loader.
+        """
+
+        def __init__(self, stream) -> None:
+            yaml.cyaml.CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+else:
+    _StreamLoader = yaml.SafeLoader
+
+
+def _sidecar_path(file_path: str):
+    """Get the sidecar path of a pipeline file in a project.
+
+    Args:
+        file_path (str): Path of the pipeline file.
+
+    Returns:
+        str | None: Path in the .hlzcs folder of the closest project holding
+            the file, None when it isn't in a project.
+    """
+
+    file_path = os.path.abspath(file_path)
+    folder = os.path.dirname(file_path)
+    while True:
+        if os.path.isfile(os.path.join(folder, _PROJECT_ATTRIBUTE_FILE)):
+            relative = os.path.relpath(file_path, folder)
+            return os.path.join(folder, _SIDECAR_FOLDER, relative + ".json")
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+
+def _iter_entries(file_path: str):
+    """Yield the entries of a pipeline file.
+
+    Pipelines in a project are loaded from their sidecar while it has the
+    content of the file, and the sidecar is written again when it doesn't
+    or when it turns out broken.
+
+    Args:
+        file_path (str): Path of the yaml file.
+
+    Raises:
+        ValueError: When the document isn't a sequence.
+
+    Yields:
+        Any: Entries in file order.
+    """
+
+    sidecar_path = _sidecar_path(file_path)
+    if sidecar_path is None:
+        yield from _iter_yaml_entries(file_path)
+        return
+
+    source = sidecar.fingerprint_file(file_path)
+    if source is None:
+        yield from _iter_yaml_entries(file_path)
+        return
+
+    entries = sidecar.iter_sequence(sidecar_path, source)
+    count = 0
+    if entries is not None:
+        while True:
+            try:
+                entry = next(entries)
+            except StopIteration:
+                return
+            except ValueError:
+                # The sidecar broke, the yaml has the entries left.
+                break
+            yield entry
+            count += 1
+
+    yield from itertools.islice(
+        sidecar.tee_sequence(sidecar_path, source, _iter_yaml_entries(file_path)),
+        count,
+        None,
+    )
+
+
+def _iter_yaml_entries(file_path: str):
+    """Yield the entries of the top level yaml sequence of a file.
+
+    Args:
+        file_path (str): Path of the yaml file.
+
+    Raises:
+        ValueError: When the file isn't valid yaml or the document isn't a
+            sequence.
+
+    Yields:
+        Any: Constructed entries.
+    """
+
     with open(file_path, 'r') as file:
-        data = yaml.safe_load(file)
-        if not data:
-            return []
+        loader = _StreamLoader(file)
+        try:
+            loader.get_event()  # StreamStartEvent
+            if loader.check_event(yaml.StreamEndEvent):
+                return
+            loader.get_event()  # DocumentStartEvent
+            if not loader.check_event(yaml.SequenceStartEvent):
+                # Empty documents are empty pipelines.
+                if loader.construct_document(loader.compose_node(None, None)):
+                    raise ValueError(f"{file_path} is not a list of nodes")
+                return
+            loader.get_event()
+
+            while not loader.check_event(yaml.SequenceEndEvent):
+                node = loader.compose_node(None, None)
+                # construct_document resets the constructed object cache,
+                # so nothing is kept alive once the entry is yielded.
+                yield loader.construct_document(node)
+        except yaml.YAMLError as ex:
+            raise ValueError(f"{file_path} is not valid yaml: {ex}") from ex
+        finally:
+            loader.dispose()
+
+
+def deserialize_table(input: str) -> NodeTable:
+    """Read a pipeline file into columnar node storage.
+
+    Args:
+        input (str): Path of the pipeline file.
+
+    Raises:
+        FileNotFoundError: When the file doesn't exist.
+        ValueError: When the file isn't a list of nodes.
+        PipelineValidationError: When any node doesn't match its schema.
+
+    Returns:
+        NodeTable: Nodes in file order.
+    """
 
-    nodes = []
+    file_path = input
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"{file_path} do not exist")
+
+    table = NodeTable()
+    for entry in iter_validate(_iter_entries(file_path)):
+        table.append(*_entry_fields(entry))
+    return table
+
+
+def _entry_fields(entry: dict) -> tuple:
+    """Read the node fields of a pipeline file entry.
+
+    Args:
+        entry (dict): An entry of the pipeline file.
+
+    Returns:
+        tuple: (id, x, y, action, label, input port, output port).
+    """
+
+    nodeId = entry['id']
+    action: str = entry['__class']
+    action = action.removesuffix("NodeData")
+
+    return (
+        nodeId,
+        entry['position']['x'],
+        entry['position']['y'],
+        action,
+        entry.get('label', nodeId),
+        entry.get('inputPort', ""),
+        entry.get('outputPort', ""),
+    )
+
+
+def _entry_to_node(entry: dict) -> Node:
+    """Create a Node from a pipeline file entry.
+
+    Args:
+        entry (dict): An entry of the pipeline file.
+
+    Returns:
+        Node: The node.
+    """
+
+    nodeId, x, y, action, label, input_port, output_port = _entry_fields(entry)
+
+    node = Node(intern_strings(nodeId), Position(x, y), intern_strings(action))
+
+    node.label = label
+    node.input_port = intern_strings(input_port)
+    node.output_port = intern_strings(output_port)
+
+    return node
+
+
+def migrate(input: str, output: str = None) -> str:
+    """Rewrite a pipeline file in the current schema version.
 
-    for entry in data:
-        nodeId = entry['id']
-        position = Position(entry['position']['x'], entry['position']['y'])
-        action: str = entry['__class']
-        action = action.removesuffix("NodeData")
+    Every entry is checked before anything is written.
 
-        node = Node(nodeId, position, action)
+    Args:
+        input (str): Path of the pipeline file.
+        output (str): Path of the migrated file, input when None.
 
-        node.label = entry.get('label', nodeId)
-        node.input_port = entry.get('inputPort', "")
-        node.output_port = entry.get('outputPort', "")
+    Raises:
+        FileNotFoundError: When the file doesn't exist.
+        ValueError: When the file isn't a list of nodes.
+        PipelineValidationError: When any node doesn't match its schema.
 
-        nodes.append(node)
+    Returns:
+        str: Path of the migrated file.
+    """
 
-    return nodes
+    if not os.path.exists(input):
+        raise FileNotFoundError(f"{input} do not exist")
+
+    entries = list(iter_validate(_iter_entries(input)))
+    output = output or input
+    folder = os.path.dirname(output)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    # Migrating in place never leaves a half written file.
+    temporary = f"{output}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        yaml.dump(entries, file, default_flow_style=False)
+    os.replace(temporary, output)
+    return output
 
 
 """nodes = deserialize()
@@ -41,13 +305,284 @@ for node in nodes:
      print(repr(node))"""
 
 
+# Orders of the steps of a compiled file.
+ORDER_TOPOLOGICAL = "topological"
+ORDER_FILE = "file"
+
+# Steps rendered per yaml.dump call when streaming a compiled file.
+_STREAM_BATCH_SIZE = 1024
+
+# Target of the files compiled by default, see app.services.pipeline_ir.
+TARGET_GITHUB = "github"
+
+
 # serialize the deserialed yaml file which pass from frontend into github action yaml format
-def compile(output: str, nodes):
+def compile(
+    output: str,
+    nodes,
+    parallel: bool = False,
+    order: str = ORDER_TOPOLOGICAL,
+    target: str = TARGET_GITHUB,
+):
+    """Compile pipeline nodes into a github action or another CI file.
+
+    Steps of a github action are written to the file as they are rendered.
+    The file is left untouched when its content doesn't change.
+
+    Args:
+        output (str): Path of the compiled file.
+        nodes (Iterable[Node]): Nodes of the pipeline.
+        parallel (bool): Emit one job per independent branch.
+        order (str): ORDER_TOPOLOGICAL runs producers before the nodes
+            consuming their ports. ORDER_FILE keeps the order of the nodes
+            and never holds them all in memory, for pipelines already in run
+            order. Only for sequential github actions.
+        target (str): CI system of the file, see pipeline_ir.get_targets.
+
+    Raises:
+        ValueError: When order or target is unknown.
+        CycleError: When the nodes depend on each other in a cycle.
+
+    Returns:
+        str: Path of the compiled file.
+    """
+
+    if order not in (ORDER_TOPOLOGICAL, ORDER_FILE):
+        error = f'Order "{order}" is not supported.'
+        logging.error(error)
+        raise ValueError(error)
+    get_backend_file(target)
+
     if not os.path.exists(output):
         folder = os.path.dirname(output)
         if folder:
             os.makedirs(folder, exist_ok=True)
 
+    if parallel or target != TARGET_GITHUB:
+        chunks = [lower(build_ir(nodes), target, parallel)]
+    else:
+        if order == ORDER_TOPOLOGICAL:
+            # Producers have to run before the nodes consuming their ports.
+            nodes = PipelineGraph(nodes).topological_order()
+        head, tail = _document_frame()
+        chunks = itertools.chain([head], _iter_fragments(nodes), [tail])
+
+    _write_if_changed(output, chunks)
+    return output
+
+
+def compile_targets(
+    folder: str, nodes, targets: list[str], parallel: bool = False
+) -> dict[str, str]:
+    """Compile pipeline nodes into the files of several CI systems.
+
+    The graph is analyzed once for every target.
+
+    Args:
+        folder (str): Project folder, files are written at the usual path of
+            their target, e.g. ".gitlab-ci.yml".
+        nodes (Iterable[Node]): Nodes of the pipeline.
+        targets (list[str]): CI systems, see pipeline_ir.get_targets.
+        parallel (bool): Emit one job per independent branch.
+
+    Raises:
+        ValueError: When a target is unknown.
+        CycleError: When the nodes depend on each other in a cycle.
+
+    Returns:
+        dict[str, str]: Path of the compiled file of every target.
+    """
+
+    files = {target: get_backend_file(target) for target in targets}
+    ir = build_ir(nodes)
+    outputs = {}
+    for target, file_name in files.items():
+        output = os.path.join(folder, file_name)
+        os.makedirs(os.path.dirname(output) or os.curdir, exist_ok=True)
+        _write_if_changed(output, [lower(ir, target, parallel)])
+        outputs[target] = output
+    return outputs
+
+
+@register_backend(TARGET_GITHUB, os.path.join(".github", "workflows", "pipeline.yml"))
+def _lower_github(ir: PipelineIR, parallel: bool) -> str:
+    """Lower a pipeline to a github action workflow.
+
+    Parallel workflows have one job per chain of nodes. Jobs list the jobs
+    producing their input ports in "needs", and ports crossing jobs are
+    handed over as artifacts.
+
+    Args:
+        ir (PipelineIR): The pipeline.
+        parallel (bool): One job per chain instead of one for every step.
+
+    Returns:
+        str: Content of the workflow file.
+    """
+
+    if not parallel:
+        head, tail = _document_frame()
+        fragments = _fragment_cache.render(
+            [(step.label, step.action, step.inputs, step.outputs) for step in ir.steps]
+        )
+        return head + "".join(fragments) + tail
+
+    jobs = {}
+    for chain in ir.chains:
+        steps = [{'uses': 'actions/checkout@v4'}]
+        for position in chain.steps:
+            step = ir.steps[position]
+            for producer, port in step.imports:
+                steps.append({
+                    'uses': 'actions/download-artifact@v4',
+                    'with': {
+                        'name': _artifact_name(ir.chains[producer].name, port),
+                        'path': f'ports/{port}',
+                    },
+                })
+            steps.append(_step(step.label, step.action))
+
+        for port in chain.exports:
+            steps.append({
+                'uses': 'actions/upload-artifact@v4',
+                'with': {
+                    'name': _artifact_name(chain.name, port),
+                    'path': f'ports/{port}',
+                },
+            })
+
+        job = {'runs-on': 'ubuntu-latest', 'steps': steps}
+        if chain.needs:
+            job['needs'] = [ir.chains[need].name for need in chain.needs]
+        jobs[chain.name] = job
+
+    return yaml.dump(_workflow_with_jobs(jobs), default_flow_style=False)
+
+
+def _artifact_name(job_id: str, port: str) -> str:
+    """Get the name of the artifact handing a port over to other jobs.
+
+    Args:
+        job_id (str): Id of the producing job.
+        port (str): Port name.
+
+    Returns:
+        str: The artifact name.
+    """
+    return re.sub(r'[":<>|*?\\/\r\n]', "_", f"{job_id}-{port}")
+
+
+def _iter_fragments(nodes):
+    """Yield the step fragments of nodes, rendering a batch at a time.
+
+    Args:
+        nodes (Iterable[Node]): Nodes in step order.
+
+    Yields:
+        str: Yaml text of every step, as in the compiled file.
+    """
+
+    for batch in _batches(nodes, _STREAM_BATCH_SIZE):
+        yield from _fragment_cache.render([_fragment_key(node) for node in batch])
+
+
+def _batches(items, size: int):
+    """Yield lists of up to size items."""
+
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_if_changed(output: str, chunks) -> bool:
+    """Stream text to a file, keeping the file when the text is the same.
+
+    Chunks are written to a temporary file next to the output while they are
+    compared with the current content, then moved over the output when they
+    differ.
+
+    Args:
+        output (str): Path of the file.
+        chunks (Iterable[str]): Text of the file.
+
+    Returns:
+        bool: Was the file replaced.
+    """
+
+    temporary = f"{output}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        existing = open(output, "r")
+    except OSError:
+        existing = None
+    same = existing is not None
+    try:
+        with open(temporary, "w") as file:
+            for chunk in chunks:
+                file.write(chunk)
+                if same:
+                    try:
+                        same = existing.read(len(chunk)) == chunk
+                    except (OSError, UnicodeDecodeError):
+                        same = False
+            if same:
+                same = existing.read(1) == ""
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    finally:
+        if existing is not None:
+            existing.close()
+
+    # Leave the file untouched when nothing changed.
+    if same:
+        os.remove(temporary)
+        return False
+    os.replace(temporary, output)
+    return True
+
+
+# Steps are emitted under jobs.build.steps, so each fragment is rendered at
+# that nesting level and spliced between the fixed head and tail of the file.
+_STEP_PREFIX = "jobs:\n  build:\n    steps:\n"
+
+
+def _workflow(steps: list) -> dict:
+    """Build the github action workflow around a list of steps.
+
+    Args:
+        steps (list): Steps of the build job.
+
+    Returns:
+        dict: The github action workflow.
+    """
+
+    return _workflow_with_jobs({
+        'build': {
+            'runs-on': 'ubuntu-latest',
+            'steps': [
+                {'uses': 'actions/checkout@v4'},
+                *steps
+            ]
+        }
+    })
+
+
+def _workflow_with_jobs(jobs: dict) -> dict:
+    """Build the github action workflow around its jobs.
+
+    Args:
+        jobs (dict): Jobs of the workflow.
+
+    Returns:
+        dict: The github action workflow.
+    """
+
     github_action = {
         'name': 'Python application',
         'on': {
@@ -61,24 +596,168 @@ def compile(output: str, nodes):
     }
 
     job_part = {
-        'jobs': {
-            'build': {
-                'runs-on': 'ubuntu-latest',
-                'steps': [
-                    {'uses': 'actions/checkout@v4'},
-
-                    *[{
-                        'name': node.label,
-                        'run': f'echo "{node.action}"'
-                    } for node in nodes]
-                ]
-            }
-        }
+        'jobs': jobs
     }
 
     github_action.update(job_part)
+    return github_action
 
-    with open(output, "w") as file:
-        yaml.dump(github_action, file, default_flow_style=False)
 
-    return output
+def _step(label: str, action: str) -> dict:
+    """Build the github action step of a node.
+
+    Args:
+        label (str): Label of the node.
+        action (str): Action of the node.
+
+    Returns:
+        dict: The step.
+    """
+    return {
+        'name': label,
+        'run': f'echo "{action}"'
+    }
+
+
+def _freeze(port):
+    """Make a port value hashable.
+
+    Args:
+        port (str | list[str]): A port name or a list of port names.
+
+    Returns:
+        str | tuple[str]: The hashable port value.
+    """
+    return tuple(port) if isinstance(port, list) else port
+
+
+def _fragment_key(node) -> tuple:
+    """Get the content key of a node's step fragment.
+
+    Args:
+        node (Node): A pipeline node.
+
+    Returns:
+        tuple: (label, action, input port, output port).
+    """
+    return (
+        node.label,
+        node.action,
+        _freeze(node.input_port),
+        _freeze(node.output_port),
+    )
+
+
+# Every step starts a line at the indentation of the steps list. Values
+# inside a step are indented further.
+_STEP_START = re.compile(r"^    - ", re.MULTILINE)
+
+
+def _render_steps(keys: list[tuple]) -> list[str]:
+    """Render the yaml text of steps with one yaml.dump call.
+
+    Args:
+        keys (list[tuple]): Content keys from _fragment_key.
+
+    Returns:
+        list[str]: Yaml text of every step, indented as in the compiled file.
+    """
+
+    steps = [_step(label, action) for label, action, _, _ in keys]
+    text = yaml.dump(
+        {'jobs': {'build': {'steps': steps}}}, default_flow_style=False
+    )[len(_STEP_PREFIX):]
+
+    starts = [match.start() for match in _STEP_START.finditer(text)]
+    if len(starts) != len(steps):
+        # Never expected, but a wrong split would corrupt the output.
+        if len(keys) == 1:
+            return [text]
+        return [_render_steps([key])[0] for key in keys]
+    starts.append(len(text))
+    return [text[start:end] for start, end in zip(starts, starts[1:])]
+
+
+class _FragmentCache:
+    """LRU cache of rendered step fragments keyed by node content."""
+
+    def __init__(self, max_size: int) -> None:
+        """Create a _FragmentCache.
+
+        Args:
+            max_size (int): Fragments to keep.
+        """
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._fragments: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, keys: list[tuple]) -> list[str]:
+        """Get the fragments of nodes, rendering missing ones in one batch.
+
+        Args:
+            keys (list[tuple]): Content keys from _fragment_key.
+
+        Returns:
+            list[str]: Fragments in the order of the keys.
+        """
+
+        fragments = [None] * len(keys)
+        missing: dict[tuple, list[int]] = {}
+        with self._lock:
+            for index, key in enumerate(keys):
+                fragment = self._fragments.get(key)
+                if fragment is None:
+                    missing.setdefault(key, []).append(index)
+                    continue
+                self._fragments.move_to_end(key)
+                fragments[index] = fragment
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if not missing:
+            return fragments
+
+        rendered = _render_steps(list(missing))
+        with self._lock:
+            for (key, indices), fragment in zip(missing.items(), rendered):
+                for index in indices:
+                    fragments[index] = fragment
+                self._fragments[key] = fragment
+            while len(self._fragments) > self.max_size:
+                self._fragments.popitem(last=False)
+        return fragments
+
+    def info(self) -> dict[str, int]:
+        """Get cache usage.
+
+        Returns:
+            dict[str, int]: {"hits", "misses", "size", "max_size"}.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._fragments),
+                "max_size": self.max_size,
+            }
+
+
+_fragment_cache = _FragmentCache(65536)
+register_stats("fragment_cache", _fragment_cache.info)
+
+
+@functools.lru_cache(maxsize=None)
+def _document_frame() -> tuple[str, str]:
+    """Render the part of the compiled file before and after the node steps.
+
+    Returns:
+        tuple[str, str]: (head, tail) of the compiled file.
+    """
+
+    text = yaml.dump(_workflow([]), default_flow_style=False)
+    checkout = "    - uses: actions/checkout@v4\n"
+    end = text.index(checkout) + len(checkout)
+    return text[:end], text[end:]
@@ -1,13 +1,20 @@
 """including define node structure"""
 
+import sys
+from array import array
+
 
 class Position:
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
 
 
 class Node:
+    __slots__ = ("id", "label", "position", "action", "input_port", "output_port")
+
     def __init__(self, nodeId: str, position: Position, action):
         self.id = nodeId
         self.label = ""
@@ -17,7 +24,9 @@ class Node:
         self.output_port = ""
 
     def execute(self):
-        self.action()
+        # Deserialized nodes name their action instead of holding it.
+        action = get_action(self.action) if isinstance(self.action, str) else self.action
+        action()
 
     # serialize created node into yaml format(for frontend)
     def toDict(self):
@@ -38,6 +47,162 @@ class Node:
         return f"[id={self.id}, position=({self.position.x}, {self.position.y}), action={self.action}, input_ports={self.input_port}, output_ports={self.output_port}]"
 
 
+def intern_strings(value):
+    """Intern a string or every string of a list, e.g. a port list.
+
+    Args:
+        value (Any): A string, a list of strings or any other value.
+
+    Returns:
+        Any: The interned value. Other values are returned unchanged.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [intern_strings(item) for item in value]
+    return value
+
+
+def _append_coordinate(column, value):
+    """Append a coordinate to a column of a NodeTable.
+
+    Args:
+        column (array | list): The column.
+        value (Any): The coordinate.
+
+    Returns:
+        array | list: The column, a new list when the value doesn't fit the
+            array, so mixed ints and floats keep their types.
+    """
+    if isinstance(column, array):
+        if not column and type(value) is float:
+            column = array("d")
+        if (type(value) is int and column.typecode == "q") or (
+            type(value) is float and column.typecode == "d"
+        ):
+            try:
+                column.append(value)
+                return column
+            except OverflowError:
+                pass
+        column = column.tolist()
+    column.append(value)
+    return column
+
+
+class NodeTable:
+    """Columnar storage of pipeline nodes.
+
+    Every column is a list indexed by the row number, and ids, actions and
+    port names are interned so repeated strings are stored once. Coordinates
+    are stored in an int or a float array while every value has that type,
+    so they read back as they were written. Nodes are only materialized
+    when a row is read.
+    """
+
+    __slots__ = (
+        "ids",
+        "labels",
+        "actions",
+        "input_ports",
+        "output_ports",
+        "xs",
+        "ys",
+    )
+
+    def __init__(self) -> None:
+        """Create an empty table."""
+
+        self.ids: list[str] = []
+        self.labels: list[str] = []
+        self.actions: list[str] = []
+        self.input_ports: list = []
+        self.output_ports: list = []
+        self.xs = array("q")
+        self.ys = array("q")
+
+    @classmethod
+    def from_nodes(cls, nodes) -> "NodeTable":
+        """Create a table from nodes.
+
+        Args:
+            nodes (Iterable[Node]): Nodes to store.
+
+        Returns:
+            NodeTable: The table.
+        """
+
+        table = cls()
+        for node in nodes:
+            table.append_node(node)
+        return table
+
+    def append(
+        self,
+        nodeId: str,
+        x: float,
+        y: float,
+        action: str,
+        label: str = "",
+        input_port="",
+        output_port="",
+    ) -> None:
+        """Append a row.
+
+        Args:
+            nodeId (str): Id of the node.
+            x (float): X coordinate.
+            y (float): Y coordinate.
+            action (str): Action of the node.
+            label (str): Label of the node.
+            input_port (str | list[str]): Input port.
+            output_port (str | list[str]): Output port.
+        """
+
+        self.ids.append(intern_strings(nodeId))
+        self.labels.append(label)
+        self.actions.append(intern_strings(action))
+        self.input_ports.append(intern_strings(input_port))
+        self.output_ports.append(intern_strings(output_port))
+        self.xs = _append_coordinate(self.xs, x)
+        self.ys = _append_coordinate(self.ys, y)
+
+    def append_node(self, node: Node) -> None:
+        """Append a row from a node.
+
+        Args:
+            node (Node): The node.
+        """
+
+        self.append(
+            node.id,
+            node.position.x,
+            node.position.y,
+            node.action,
+            node.label,
+            node.input_port,
+            node.output_port,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Node:
+        node = Node(
+            self.ids[index],
+            Position(self.xs[index], self.ys[index]),
+            self.actions[index],
+        )
+        node.label = self.labels[index]
+        node.input_port = self.input_ports[index]
+        node.output_port = self.output_ports[index]
+        return node
+
+    def __iter__(self):
+        for index in range(len(self.ids)):
+            yield self[index]
+
+
 def setup_environment():
     print("setup environment")
 
@@ -48,3 +213,28 @@ def install_dependencies():
 
 def pyTest():
     print("run pyTest")
+
+
+# Actions that nodes can name in a pipeline file.
+ACTIONS = {
+    "setup_environment": setup_environment,
+    "install_dependencies": install_dependencies,
+    "pyTest": pyTest,
+}
+
+
+def get_action(name: str):
+    """Get the action function of an action name.
+
+    Args:
+        name (str): Name of the action.
+
+    Raises:
+        ValueError: When the action doesn't exist.
+
+    Returns:
+        Callable[[], Any]: The action.
+    """
+    if name not in ACTIONS:
+        raise ValueError(f'Action "{name}" is not supported.')
+    return ACTIONS[name]
@@ -0,0 +1,263 @@
+"""Run pipeline nodes locally on a thread or process pool."""
+
+__all__ = ["PipelineExecutor", "ExecutionReport", "NodeResult"]
+
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from app.services.pipeline_graph import PipelineGraph
+
+
+class NodeResult:
+    """Result of running one node."""
+
+    __slots__ = ("node_id", "status", "start", "duration", "error")
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+
+    def __init__(
+        self,
+        node_id: str,
+        status: str,
+        start: float = None,
+        duration: float = None,
+        error: str = None,
+    ) -> None:
+        """Create a NodeResult.
+
+        Args:
+            node_id (str): Id of the node.
+            status (str): succeeded, failed, skipped or cancelled.
+            start (float): Seconds from the start of the run to the start of
+                the action, None when it never ran.
+            duration (float): Seconds the action took, None when it never ran.
+            error (str): Error of a failed node.
+        """
+
+        self.node_id = node_id
+        self.status = status
+        self.start = start
+        self.duration = duration
+        self.error = error
+
+    def to_dict(self) -> dict[str, any]:
+        """Get the result as json.
+
+        Returns:
+            dict[str, any]: The result.
+        """
+        return {
+            "id": self.node_id,
+            "status": self.status,
+            "start": self.start,
+            "duration": self.duration,
+            "error": self.error,
+        }
+
+
+class ExecutionReport:
+    """Results of a pipeline run."""
+
+    def __init__(self, results: list[NodeResult], duration: float) -> None:
+        """Create an ExecutionReport.
+
+        Args:
+            results (list[NodeResult]): Results in the order nodes finished
+                or were skipped, followed by nodes that never ran.
+            duration (float): Seconds the whole run took.
+        """
+
+        self.results = results
+        self.duration = duration
+
+    @property
+    def succeeded(self) -> bool:
+        """Did every node succeed."""
+        return all(
+            result.status == NodeResult.SUCCEEDED for result in self.results
+        )
+
+    def to_dict(self) -> dict[str, any]:
+        """Get the report as json.
+
+        Returns:
+            dict[str, any]: The report.
+        """
+        return {
+            "succeeded": self.succeeded,
+            "duration": self.duration,
+            "nodes": [result.to_dict() for result in self.results],
+        }
+
+
+def _execute(node) -> tuple[float, float, Exception | None]:
+    """Run a node and time it. Runs in the pool workers.
+
+    Timing in the worker leaves out the time the node waited in the pool
+    queue, perf_counter is shared by the processes of a machine.
+
+    Args:
+        node (Node): The node.
+
+    Returns:
+        tuple[float, float, Exception | None]: perf_counter when the action
+            started, seconds it took and the error it raised.
+    """
+
+    start = time.perf_counter()
+    try:
+        node.execute()
+    except Exception as ex:
+        return start, time.perf_counter() - start, ex
+    return start, time.perf_counter() - start, None
+
+
+class PipelineExecutor:
+    """Run pipeline nodes as soon as the producers of their inputs are done.
+
+    Input ports that no node produces are treated as satisfied.
+    """
+
+    FAIL_FAST = "fail-fast"
+    CONTINUE = "continue"
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        use_processes: bool = False,
+        policy: str = FAIL_FAST,
+    ) -> None:
+        """Create a PipelineExecutor.
+
+        Args:
+            max_workers (int): Size of the pool, defaults to the pool's own
+                default which scales with the CPU count.
+            use_processes (bool): Run nodes in processes instead of threads.
+                Actions have to be picklable.
+            policy (str): On a failure, "fail-fast" cancels every node that
+                hasn't started, "continue" only skips nodes depending on the
+                failed node.
+
+        Raises:
+            ValueError: When the policy or max_workers isn't valid.
+        """
+
+        if policy not in (self.FAIL_FAST, self.CONTINUE):
+            raise ValueError(f'Policy "{policy}" is not supported.')
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers has to be at least 1.")
+
+        self._max_workers = max_workers
+        self._use_processes = use_processes
+        self._policy = policy
+
+    def run(self, nodes) -> ExecutionReport:
+        """Run the nodes.
+
+        Args:
+            nodes (Iterable[Node]): Pipeline nodes.
+
+        Raises:
+            CycleError: When the nodes depend on each other in a cycle.
+
+        Returns:
+            ExecutionReport: Status and timing of every node.
+        """
+
+        graph = PipelineGraph(nodes)
+        graph.topological_indices()
+
+        run_start = time.perf_counter()
+        in_degrees = [len(predecessors) for predecessors in graph.predecessors]
+        ready = deque(
+            index for index, degree in enumerate(in_degrees) if degree == 0
+        )
+        results = {}
+        stopped = False
+
+        pool_class = (
+            ProcessPoolExecutor if self._use_processes else ThreadPoolExecutor
+        )
+        with pool_class(max_workers=self._max_workers) as pool:
+            running = {}
+            while ready or running:
+                while ready:
+                    index = ready.popleft()
+                    future = pool.submit(_execute, graph.nodes[index])
+                    running[future] = index
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    if future.cancelled():
+                        continue
+                    node_id = graph.nodes[index].id
+                    if future.exception() is None:
+                        start, duration, error = future.result()
+                        start -= run_start
+                    else:
+                        # The worker itself broke, e.g. a process pool that
+                        # couldn't pickle the node.
+                        start, duration, error = None, None, future.exception()
+                    if error is None:
+                        results[index] = NodeResult(
+                            node_id, NodeResult.SUCCEEDED, start, duration
+                        )
+                        for successor in graph.successors[index]:
+                            in_degrees[successor] -= 1
+                            if in_degrees[successor] == 0 and not stopped:
+                                ready.append(successor)
+                        continue
+
+                    results[index] = NodeResult(
+                        node_id,
+                        NodeResult.FAILED,
+                        start,
+                        duration,
+                        f"{type(error).__name__}: {error}",
+                    )
+                    self._skip_descendants(graph, index, results)
+                    if self._policy == self.FAIL_FAST:
+                        # Let started nodes finish, drop everything else.
+                        stopped = True
+                        ready.clear()
+                        for pending in running:
+                            pending.cancel()
+
+        # Nodes that never ran were cancelled by a fail-fast failure.
+        report = list(results.values())
+        for index, node in enumerate(graph.nodes):
+            if index not in results:
+                report.append(NodeResult(node.id, NodeResult.CANCELLED))
+        return ExecutionReport(report, time.perf_counter() - run_start)
+
+    @staticmethod
+    def _skip_descendants(
+        graph: PipelineGraph, index: int, results: dict[int, NodeResult]
+    ) -> None:
+        """Mark every node depending on a failed node as skipped.
+
+        Args:
+            graph (PipelineGraph): Graph of the pipeline nodes.
+            index (int): Index of the failed node.
+            results (dict[int, NodeResult]): Results to add to.
+        """
+
+        pending = deque(graph.successors[index])
+        while pending:
+            successor = pending.popleft()
+            if successor in results:
+                continue
+            results[successor] = NodeResult(
+                graph.nodes[successor].id, NodeResult.SKIPPED
+            )
+            pending.extend(graph.successors[successor])
@@ -0,0 +1,191 @@
+"""Connect pipeline nodes through their ports."""
+
+__all__ = ["PipelineGraph", "CycleError", "get_ports"]
+
+from collections import deque
+
+
+class CycleError(ValueError):
+    """Raised when the pipeline nodes depend on each other in a cycle."""
+
+    def __init__(self, cycle: list[str]) -> None:
+        """Create a CycleError.
+
+        Args:
+            cycle (list[str]): Ids of the nodes in the cycle, the first node
+                is repeated at the end.
+        """
+
+        super().__init__(f'Pipeline has a cycle: {" -> ".join(cycle)}.')
+        self.cycle = cycle
+
+    def __reduce__(self):
+        # Rebuild from the cycle when crossing process boundaries.
+        return (type(self), (self.cycle,))
+
+
+def get_ports(port) -> tuple[str]:
+    """Get the port names of a port field.
+
+    Args:
+        port (str | list[str]): A port name, a list of port names or "".
+
+    Returns:
+        tuple[str]: Port names.
+    """
+
+    if not port:
+        return ()
+    if isinstance(port, str):
+        return (port,)
+    return tuple(name for name in port if name)
+
+
+class PipelineGraph:
+    """A DAG of pipeline nodes.
+
+    A node depends on every node that produces one of its input ports on an
+    output port. Producers are found through a hash index of output ports, so
+    building the graph is O(V+E).
+    """
+
+    def __init__(self, nodes) -> None:
+        """Build the graph.
+
+        Args:
+            nodes (Iterable[Node]): Pipeline nodes.
+        """
+
+        self.nodes = list(nodes)
+        self.producers: dict[str, list[int]] = {}
+        for index, node in enumerate(self.nodes):
+            for port in get_ports(node.output_port):
+                self.producers.setdefault(port, []).append(index)
+
+        self.predecessors: list[list[int]] = []
+        self.successors: list[list[int]] = [[] for _ in self.nodes]
+        self.__dangling: list[tuple[str, str]] = []
+        for index, node in enumerate(self.nodes):
+            predecessors = {}
+            for port in get_ports(node.input_port):
+                if port not in self.producers:
+                    self.__dangling.append((node.id, port))
+                    continue
+                for producer in self.producers[port]:
+                    predecessors[producer] = None
+            self.predecessors.append(list(predecessors))
+            for producer in predecessors:
+                self.successors[producer].append(index)
+
+    def topological_indices(self) -> list[int]:
+        """Get node indices ordered so producers come before consumers.
+
+        Independent nodes keep their relative order from the node list.
+
+        Raises:
+            CycleError: When the nodes depend on each other in a cycle.
+
+        Returns:
+            list[int]: Node indices.
+        """
+
+        in_degrees = [len(predecessors) for predecessors in self.predecessors]
+        ready = deque(
+            index for index, degree in enumerate(in_degrees) if degree == 0
+        )
+        order = []
+        while ready:
+            index = ready.popleft()
+            order.append(index)
+            for successor in self.successors[index]:
+                in_degrees[successor] -= 1
+                if in_degrees[successor] == 0:
+                    ready.append(successor)
+
+        if len(order) != len(self.nodes):
+            raise CycleError(self.find_cycle())
+        return order
+
+    def topological_order(self) -> list:
+        """Get nodes ordered so producers come before consumers.
+
+        Raises:
+            CycleError: When the nodes depend on each other in a cycle.
+
+        Returns:
+            list[Node]: Nodes.
+        """
+        return [self.nodes[index] for index in self.topological_indices()]
+
+    def chains(self) -> list[list[int]]:
+        """Split the nodes into chains that can run one after another.
+
+        A node joins the chain of its predecessor when it is the only
+        successor of its only predecessor. Chains only connect from the last
+        node of one chain to the first node of another, so independent
+        chains can run in parallel.
+
+        Raises:
+            CycleError: When the nodes depend on each other in a cycle.
+
+        Returns:
+            list[list[int]]: Node indices of each chain, in topological order.
+        """
+
+        chain_of = [0] * len(self.nodes)
+        chains = []
+        for index in self.topological_indices():
+            predecessors = self.predecessors[index]
+            if (
+                len(predecessors) == 1
+                and len(self.successors[predecessors[0]]) == 1
+            ):
+                chain = chain_of[predecessors[0]]
+                chains[chain].append(index)
+            else:
+                chain = len(chains)
+                chains.append([index])
+            chain_of[index] = chain
+        return chains
+
+    def find_cycle(self):
+        """Find a cycle of dependent nodes.
+
+        Returns:
+            list[str] | None: Ids of the nodes in the cycle with the first
+                node repeated at the end, None when the graph is a DAG.
+        """
+
+        unvisited, visiting, visited = 0, 1, 2
+        states = [unvisited] * len(self.nodes)
+        for root in range(len(self.nodes)):
+            if states[root] != unvisited:
+                continue
+            # Iterative DFS, the stack holds (node, next successor position).
+            stack = [(root, 0)]
+            states[root] = visiting
+            while stack:
+                index, position = stack[-1]
+                successors = self.successors[index]
+                if position == len(successors):
+                    states[index] = visited
+                    stack.pop()
+                    continue
+                stack[-1] = (index, position + 1)
+                successor = successors[position]
+                if states[successor] == unvisited:
+                    states[successor] = visiting
+                    stack.append((successor, 0))
+                elif states[successor] == visiting:
+                    path = [entry[0] for entry in stack]
+                    cycle = path[path.index(successor):] + [successor]
+                    return [self.nodes[entry].id for entry in cycle]
+        return None
+
+    def dangling_ports(self) -> list[tuple[str, str]]:
+        """Get input ports that no node produces.
+
+        Returns:
+            list[tuple[str, str]]: (node id, port name) pairs.
+        """
+        return list(self.__dangling)
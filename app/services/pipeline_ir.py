@@ -0,0 +1,400 @@
+"""Backend-neutral representation of a compiled pipeline.
+
+The graph of a pipeline is analyzed once into a PipelineIR: steps in run
+order and chains of steps that can run in parallel, with the ports handed
+over between chains. Backends lower the IR to the file of a CI system:
+
+    @register_backend("github", ".github/workflows/pipeline.yml")
+    def lower_github(ir: PipelineIR, parallel: bool) -> str:
+        ...
+
+Lowered files are cached by IR hash and target, so emitting several
+targets of a pipeline, or the same pipeline again, analyzes it only once.
+"""
+
+__all__ = [
+    "Chain",
+    "PipelineIR",
+    "Step",
+    "build_ir",
+    "chain_name",
+    "get_backend_file",
+    "get_targets",
+    "lower",
+    "register_backend",
+]
+
+import hashlib
+import importlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+
+from app.services.metrics import register_stats
+from app.services.pipeline_graph import PipelineGraph, get_ports
+
+# Modules defining the built-in backends, imported by the first lookup.
+_BUILTIN_MODULES = ("app.services.nodeData", "app.services.ci_backends")
+
+
+class Step:
+    """A node of the pipeline, in run order."""
+
+    __slots__ = ("id", "label", "action", "inputs", "outputs", "imports")
+
+    def __init__(
+        self,
+        node_id: str,
+        label: str,
+        action: str,
+        inputs: tuple[str],
+        outputs: tuple[str],
+        imports: tuple[tuple[int, str]],
+    ) -> None:
+        """Create a Step.
+
+        Args:
+            node_id (str): Id of the node.
+            label (str): Label of the node.
+            action (str): Action of the node.
+            inputs (tuple[str]): Input port names.
+            outputs (tuple[str]): Output port names.
+            imports (tuple[tuple[int, str]]): (chain, port) of the input ports
+                produced by other chains, to fetch before the step.
+        """
+
+        self.id = node_id
+        self.label = label
+        self.action = action
+        self.inputs = inputs
+        self.outputs = outputs
+        self.imports = imports
+
+    def to_dict(self) -> dict[str, any]:
+        """Get the step as json."""
+        return {
+            "id": self.id,
+            "label": self.label,
+            "action": self.action,
+            "inputs": list(self.inputs),
+            "outputs": list(self.outputs),
+            "imports": [list(item) for item in self.imports],
+        }
+
+
+class Chain:
+    """Steps that run one after another, in parallel with other chains."""
+
+    __slots__ = ("name", "steps", "needs", "exports")
+
+    def __init__(
+        self,
+        name: str,
+        steps: tuple[int],
+        needs: tuple[int],
+        exports: tuple[str],
+    ) -> None:
+        """Create a Chain.
+
+        Args:
+            name (str): Unique identifier of letters, digits, "_" and "-",
+                from the id of its first node.
+            steps (tuple[int]): Indices of its steps, in run order.
+            needs (tuple[int]): Chains producing its imported ports.
+            exports (tuple[str]): Ports it hands over to other chains.
+        """
+
+        self.name = name
+        self.steps = steps
+        self.needs = needs
+        self.exports = exports
+
+    def to_dict(self) -> dict[str, any]:
+        """Get the chain as json."""
+        return {
+            "name": self.name,
+            "steps": list(self.steps),
+            "needs": list(self.needs),
+            "exports": list(self.exports),
+        }
+
+
+class PipelineIR:
+    """Steps and chains of a pipeline, identified by a hash of both."""
+
+    __slots__ = ("steps", "chains", "hash")
+
+    def __init__(self, steps: tuple[Step], chains: tuple[Chain]) -> None:
+        """Create a PipelineIR.
+
+        Args:
+            steps (tuple[Step]): Steps in run order, producers first.
+            chains (tuple[Chain]): Chains in run order.
+        """
+
+        self.steps = steps
+        self.chains = chains
+        content = json.dumps(
+            {
+                "steps": [step.to_dict() for step in steps],
+                "chains": [chain.to_dict() for chain in chains],
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        self.hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def chain_name(node_id: str, taken: set[str]) -> str:
+    """Get a unique identifier usable as a job or target name.
+
+    Args:
+        node_id (str): Id of the first node of the chain.
+        taken (set[str]): Names already in use.
+
+    Returns:
+        str: node_id with other characters than letters, digits, "_" and "-"
+            replaced, numbered when the name is taken.
+    """
+
+    name = re.sub(r"[^A-Za-z0-9_-]", "_", str(node_id))
+    if not re.match(r"[A-Za-z_]", name):
+        name = "_" + name
+    unique = name
+    suffix = 1
+    while unique in taken:
+        suffix += 1
+        unique = f"{name}_{suffix}"
+    return unique
+
+
+def build_ir(nodes) -> PipelineIR:
+    """Analyze the graph of pipeline nodes.
+
+    Args:
+        nodes (Iterable[Node]): Nodes of the pipeline.
+
+    Raises:
+        CycleError: When the nodes depend on each other in a cycle.
+
+    Returns:
+        PipelineIR: The pipeline.
+    """
+
+    graph = PipelineGraph(nodes)
+    chains = graph.chains()
+    # Steps are numbered in run order, the order of the chains.
+    position = {}
+    chain_of = {}
+    names = []
+    for chain_index, chain in enumerate(chains):
+        names.append(chain_name(graph.nodes[chain[0]].id, set(names)))
+        for index in chain:
+            chain_of[index] = chain_index
+    for index in graph.topological_indices():
+        position[index] = len(position)
+
+    steps = [None] * len(graph.nodes)
+    ir_chains = []
+    for chain_index, chain in enumerate(chains):
+        needs = {}
+        exports = []
+        for index in chain:
+            node = graph.nodes[index]
+            imports = []
+            for port in get_ports(node.input_port):
+                for producer in graph.producers.get(port, ()):
+                    if chain_of[producer] == chain_index:
+                        continue
+                    needs[chain_of[producer]] = None
+                    imports.append((chain_of[producer], port))
+            steps[position[index]] = Step(
+                node.id,
+                node.label,
+                node.action,
+                get_ports(node.input_port),
+                get_ports(node.output_port),
+                tuple(imports),
+            )
+        for index in chain:
+            for port in get_ports(graph.nodes[index].output_port):
+                if any(
+                    chain_of[consumer] != chain_index
+                    and port in get_ports(graph.nodes[consumer].input_port)
+                    for consumer in graph.successors[index]
+                ):
+                    exports.append(port)
+        ir_chains.append(
+            Chain(
+                names[chain_index],
+                tuple(position[index] for index in chain),
+                tuple(needs),
+                tuple(exports),
+            )
+        )
+    return PipelineIR(tuple(steps), tuple(ir_chains))
+
+
+class _Backends:
+    """Lowering functions by target, built-in ones imported on first use."""
+
+    def __init__(self, modules: tuple[str]) -> None:
+        self._modules = modules
+        self._loaded = False
+        self._backends: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def register(self, target: str, function, file_name: str) -> None:
+        with self._lock:
+            self._backends[target] = (function, file_name)
+
+    def get(self, target: str):
+        with self._lock:
+            modules = () if self._loaded else self._modules
+        # Imported without the lock, the modules register their backends
+        # and may be imported by another thread already.
+        for module in modules:
+            importlib.import_module(module)
+        with self._lock:
+            self._loaded = True
+            return self._backends.get(target)
+
+    def targets(self) -> tuple[str]:
+        self.get(None)
+        with self._lock:
+            return tuple(sorted(self._backends))
+
+
+_backends = _Backends(_BUILTIN_MODULES)
+
+
+def register_backend(target: str, file_name: str):
+    """Register a function lowering a PipelineIR to a file of a CI system.
+
+    Args:
+        target (str): Name of the target, e.g. "github".
+        file_name (str): Usual path of the file in a project.
+
+    Returns:
+        Callable: Decorator of a function (PipelineIR, parallel: bool) -> str.
+    """
+
+    def decorator(function):
+        _backends.register(target, function, file_name)
+        return function
+
+    return decorator
+
+
+def get_targets() -> tuple[str]:
+    """Get the names of the registered targets.
+
+    Returns:
+        tuple[str]: Targets, sorted.
+    """
+    return _backends.targets()
+
+
+def _get_backend(target: str) -> tuple:
+    """Get (function, file name) of a target, raise when it's unknown."""
+
+    backend = _backends.get(target)
+    if backend is None:
+        error = f'Target "{target}" is not supported.'
+        logging.error(error)
+        raise ValueError(error)
+    return backend
+
+
+def get_backend_file(target: str) -> str:
+    """Get the usual path of the file of a target in a project.
+
+    Args:
+        target (str): Name of the target.
+
+    Raises:
+        ValueError: When the target is unknown.
+
+    Returns:
+        str: Relative path, e.g. ".gitlab-ci.yml".
+    """
+    return _get_backend(target)[1]
+
+
+class _LoweringCache:
+    """LRU cache of lowered files keyed by IR hash, target and parallel."""
+
+    def __init__(self, max_size: int) -> None:
+        """Create a _LoweringCache.
+
+        Args:
+            max_size (int): Files to keep.
+        """
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._files: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        with self._lock:
+            text = self._files.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._files.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: tuple, text: str) -> None:
+        with self._lock:
+            self._files[key] = text
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_size:
+                self._files.popitem(last=False)
+
+    def info(self) -> dict[str, int]:
+        """Get cache usage.
+
+        Returns:
+            dict[str, int]: {"hits", "misses", "size", "max_size"}.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._files),
+                "max_size": self.max_size,
+            }
+
+
+_lowering_cache = _LoweringCache(256)
+register_stats("lowering_cache", _lowering_cache.info)
+
+
+def lower(ir: PipelineIR, target: str, parallel: bool = False) -> str:
+    """Get the file of a target for a pipeline.
+
+    Args:
+        ir (PipelineIR): The pipeline.
+        target (str): Name of the target, see get_targets.
+        parallel (bool): Run independent chains in parallel, when the
+            target can. Otherwise every step runs in one job.
+
+    Raises:
+        ValueError: When the target is unknown.
+
+    Returns:
+        str: Content of the file.
+    """
+
+    function, _ = _get_backend(target)
+    key = (ir.hash, target, bool(parallel))
+    text = _lowering_cache.get(key)
+    if text is None:
+        text = function(ir, bool(parallel))
+        _lowering_cache.put(key, text)
+    return text
@@ -0,0 +1,271 @@
+"""Validate pipeline file entries against declarative schemas.
+
+Two versions of pipeline files exist:
+
+    # Version 1, e.g. data/pipeline.yaml.
+    - {id: setup_node, action: setup_environment, x: 0, y: 0,
+       inputPort: [], outputPort: [python_env]}
+
+    # Version 2, written by Node.toDict.
+    - {id: setup_node, label: Setup, position: {x: 0, y: 0},
+       __class: setup_environmentNodeData, inputPort: "", outputPort: python_env}
+
+Schemas are compiled into checks once, when the module is imported. Entries
+are checked in one pass, every error is collected with the index of its
+node, and version 1 entries are migrated to version 2.
+"""
+
+__all__ = [
+    "CURRENT_VERSION",
+    "MAX_ERRORS",
+    "SCHEMAS",
+    "PipelineValidationError",
+    "compile_schema",
+    "get_version",
+    "iter_validate",
+    "migrate_entry",
+    "validate",
+]
+
+import logging
+
+CURRENT_VERSION = 2
+
+# Errors kept in a PipelineValidationError, the others are only counted.
+MAX_ERRORS = 1000
+
+# Field name: {"type", "required"?, "fields"? of "object" fields}.
+SCHEMAS = {
+    1: {
+        "id": {"type": "string", "required": True},
+        "label": {"type": "string"},
+        "action": {"type": "string", "required": True},
+        "x": {"type": "number", "required": True},
+        "y": {"type": "number", "required": True},
+        "inputPort": {"type": "port list"},
+        "outputPort": {"type": "port list"},
+    },
+    2: {
+        "id": {"type": "string", "required": True},
+        "label": {"type": "string"},
+        "__class": {"type": "string", "required": True},
+        "position": {
+            "type": "object",
+            "required": True,
+            "fields": {
+                "x": {"type": "number", "required": True},
+                "y": {"type": "number", "required": True},
+            },
+        },
+        "inputPort": {"type": "ports"},
+        "outputPort": {"type": "ports"},
+    },
+}
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_port_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+# Type name: (check, description in errors).
+_TYPES = {
+    "string": (lambda value: isinstance(value, str), "a string"),
+    "number": (_is_number, "a number"),
+    "object": (lambda value: isinstance(value, dict), "a mapping"),
+    "port list": (_is_port_list, "a list of port names"),
+    "ports": (
+        lambda value: isinstance(value, str) or _is_port_list(value),
+        "a port name or a list of port names",
+    ),
+}
+
+
+class PipelineValidationError(ValueError):
+    """Raised when entries of a pipeline file don't match their schema."""
+
+    def __init__(self, errors: list[dict[str, any]], count: int) -> None:
+        """Create a PipelineValidationError.
+
+        Args:
+            errors (list[dict[str, any]]): {"index", "field", "message"} of
+                the first MAX_ERRORS errors, in file order.
+            count (int): Number of errors, reported or not.
+        """
+
+        lines = [f"node {error['index']}: {error['message']}" for error in errors]
+        if count > len(errors):
+            lines.append(f"{count - len(errors)} more errors.")
+        super().__init__(f"Pipeline has {count} error(s): " + " ".join(lines))
+        self.errors = errors
+        self.count = count
+
+    def __reduce__(self):
+        # Rebuild from the errors when crossing process boundaries.
+        return (type(self), (self.errors, self.count))
+
+
+def compile_schema(schema: dict[str, dict[str, any]], prefix: str = ""):
+    """Compile a schema into a function checking an entry.
+
+    Args:
+        schema (dict[str, dict[str, any]]): Fields of the entry.
+        prefix (str): Path of the entry in its node, e.g. "position.".
+
+    Raises:
+        ValueError: When a field has an unknown type.
+
+    Returns:
+        Callable[[dict], list[tuple[str, str]]]: Gets the (field, message) of
+            every error of a mapping.
+    """
+
+    checks = []
+    for name, field in schema.items():
+        if field["type"] not in _TYPES:
+            error = f'Field "{prefix}{name}" has unknown type "{field["type"]}".'
+            logging.error(error)
+            raise ValueError(error)
+        is_type, description = _TYPES[field["type"]]
+        nested = None
+        if "fields" in field:
+            nested = compile_schema(field["fields"], f"{prefix}{name}.")
+        checks.append(
+            (
+                name,
+                prefix + name,
+                field.get("required", False),
+                is_type,
+                f"has to be {description}",
+                nested,
+            )
+        )
+
+    def check(entry: dict) -> list[tuple[str, str]]:
+        errors = []
+        for name, path, required, is_type, expected, nested in checks:
+            if name not in entry:
+                if required:
+                    errors.append((path, f'Missing field "{path}".'))
+                continue
+            value = entry[name]
+            if not is_type(value):
+                errors.append(
+                    (path, f'Field "{path}" {expected}, got {value!r}.')
+                )
+            elif nested is not None:
+                errors.extend(nested(value))
+        return errors
+
+    return check
+
+
+_CHECKS = {version: compile_schema(schema) for version, schema in SCHEMAS.items()}
+
+
+def get_version(entry: dict) -> int:
+    """Get the schema version of an entry.
+
+    Args:
+        entry (dict): An entry of a pipeline file.
+
+    Returns:
+        int: 1 for entries with "action" and no "__class", CURRENT_VERSION
+            otherwise.
+    """
+
+    if "action" in entry and "__class" not in entry and "position" not in entry:
+        return 1
+    return CURRENT_VERSION
+
+
+def migrate_entry(entry: dict, version: int) -> dict:
+    """Convert a valid entry to the current schema version.
+
+    Args:
+        entry (dict): A valid entry.
+        version (int): Schema version of the entry.
+
+    Returns:
+        dict: The entry in CURRENT_VERSION, the same one when it already is.
+    """
+
+    if version == CURRENT_VERSION:
+        return entry
+    return {
+        "id": entry["id"],
+        "label": entry.get("label", entry["id"]),
+        "position": {"x": entry["x"], "y": entry["y"]},
+        "__class": entry["action"] + "NodeData",
+        "inputPort": entry.get("inputPort", []),
+        "outputPort": entry.get("outputPort", []),
+    }
+
+
+def iter_validate(entries):
+    """Check entries in one pass and yield them in the current version.
+
+    Entries are yielded until the first invalid one, then the rest are only
+    checked so that every error is reported at once.
+
+    Args:
+        entries (Iterable[any]): Entries of a pipeline file.
+
+    Raises:
+        PipelineValidationError: After the last entry, when any is invalid.
+
+    Yields:
+        dict: Valid entries in CURRENT_VERSION.
+    """
+
+    errors = []
+    count = 0
+    ids = {}
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            found = [(None, f"Node has to be a mapping, got {entry!r}.")]
+        else:
+            version = get_version(entry)
+            found = _CHECKS[version](entry)
+            node_id = entry.get("id")
+            if isinstance(node_id, str):
+                if node_id in ids:
+                    found.append(
+                        ("id", f'Id "{node_id}" is also used by node {ids[node_id]}.')
+                    )
+                else:
+                    ids[node_id] = index
+
+        if found:
+            count += len(found)
+            for field, message in found[: MAX_ERRORS - len(errors)]:
+                errors.append({"index": index, "field": field, "message": message})
+        elif not count:
+            yield migrate_entry(entry, version)
+
+    if count:
+        error = PipelineValidationError(errors, count)
+        logging.error(error.args[0])
+        raise error
+
+
+def validate(entries) -> list[dict[str, any]]:
+    """Check every entry of a pipeline file.
+
+    Args:
+        entries (Iterable[any]): Entries of a pipeline file.
+
+    Returns:
+        list[dict[str, any]]: {"index", "field", "message"} of the first
+            MAX_ERRORS errors, empty when every entry is valid.
+    """
+
+    try:
+        for _ in iter_validate(entries):
+            pass
+    except PipelineValidationError as ex:
+        return ex.errors
+    return []
@@ -5,11 +5,37 @@ Serialize and deserialize project information.
 __all__ = ["ProjectSerializor"]
 
 import os
+import stat
 import logging
+import threading
+import weakref
 
 import yaml
 
+from app.services import sidecar
+from app.services.attribute_cache import AttributeCache
 from app.services.configurators.factory import ConfiguratorFactory
+from app.services.metrics import register_stats
+from app.services.project_watcher import ProjectWatcher
+from app.services.workspace_index import WorkspaceIndexer
+
+# Locks of the project folders being created, dropped when unused.
+_path_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+_path_locks_lock = threading.Lock()
+
+
+def _get_path_lock(path: str) -> threading.Lock:
+    """Get the lock of a project folder, the same for every path to it."""
+
+    key = os.path.realpath(path)
+    with _path_locks_lock:
+        lock = _path_locks.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _path_locks[key] = lock
+        return lock
 
 
 class ProjectSerializor:
@@ -17,6 +43,36 @@ class ProjectSerializor:
 
     __CONFIGURATION_FOLDER_NAME = ".hlzcs"
     __PROJECT_ATTRIBUTE_FILE_NAME = "project_attributes.yaml"
+    # Canonical json copy of the attribute file, see app.services.sidecar.
+    __PROJECT_ATTRIBUTE_SIDECAR_NAME = "project_attributes.json"
+    __watcher: ProjectWatcher = None
+    __watcher_lock = threading.Lock()
+    # Validated attributes of the projects deserialized last.
+    __attribute_cache = AttributeCache(1024)
+    register_stats("attribute_cache", __attribute_cache.info)
+
+    @classmethod
+    def set_attribute_cache_size(cls, max_size: int) -> None:
+        """Change the number of projects whose attributes are kept in memory.
+
+        Args:
+            max_size (int): Projects to keep, 0 to always read the files.
+        """
+        cls.__attribute_cache.resize(max_size)
+
+    @classmethod
+    def get_watcher(cls) -> ProjectWatcher:
+        """Get the watcher keeping opened projects in memory.
+
+        Returns:
+            ProjectWatcher: The watcher, created on first use.
+        """
+
+        with cls.__watcher_lock:
+            if cls.__watcher is None:
+                cls.__watcher = ProjectWatcher(cls.__CONFIGURATION_FOLDER_NAME)
+                register_stats("project_watcher", cls.__watcher.stats)
+            return cls.__watcher
 
     @classmethod
     def is_initialized(cls, path: str) -> bool:
@@ -29,9 +85,8 @@ class ProjectSerializor:
             bool: Is the project initialized.
         """
 
-        return os.path.isdir(
-            os.path.join(path, cls.__CONFIGURATION_FOLDER_NAME)
-        )
+        state = cls.get_watcher().get(path)
+        return state is not None and state.initialized
 
     @classmethod
     def create_configuration_folder(cls, path: str) -> None:
@@ -56,6 +111,7 @@ class ProjectSerializor:
 
         # Create an empty folder.
         os.mkdir(configuration_folder_path)
+        cls.get_watcher().refresh(path)
 
     @classmethod
     def get_supported_langauges(cls) -> tuple[str]:
@@ -78,6 +134,15 @@ class ProjectSerializor:
         """
         return ConfiguratorFactory.get_supported_frameworks(language)
 
+    @classmethod
+    def get_metadata_fingerprint(cls) -> str:
+        """Get a hash of the supported languages, frameworks and configurations.
+
+        Returns:
+            str: Hex digest, changes when any of them changes.
+        """
+        return ConfiguratorFactory.get_fingerprint()
+
     @classmethod
     def get_configurations(
         cls, language: str, framework: str = None
@@ -109,8 +174,11 @@ class ProjectSerializor:
         Returns:
             list[str]: A list of configuration files which this project has initialized.
         """
-        return ConfiguratorFactory.get_initialized_configurations(
-            path, language, framework
+        state = cls.get_watcher().get(path)
+        if state is None:
+            raise_not_a_directory(path)
+        return ConfiguratorFactory.detect_configurations(
+            state.snapshot, language, framework
         )
 
     @classmethod
@@ -132,12 +200,17 @@ class ProjectSerializor:
             raise_not_a_directory(folder_path)
 
         # Dump to yaml.
+        content = yaml.dump(attributes).encode("utf-8")
         with open(
-            os.path.join(folder_path, cls.__PROJECT_ATTRIBUTE_FILE_NAME),
-            "w",
-            encoding="utf-8",
+            os.path.join(folder_path, cls.__PROJECT_ATTRIBUTE_FILE_NAME), "wb"
         ) as file:
-            yaml.dump(attributes, file)
+            file.write(content)
+        sidecar.write_sidecar(
+            os.path.join(folder_path, cls.__PROJECT_ATTRIBUTE_SIDECAR_NAME),
+            sidecar.fingerprint(content),
+            attributes,
+        )
+        cls.get_watcher().refresh(path)
 
     @classmethod
     def deserialize(cls, path: str) -> dict[str, str]:
@@ -147,11 +220,13 @@ class ProjectSerializor:
             path (str): Path of the project.
 
         Returns:
-            dict[str, str]: Project attributes.
+            dict[str, str]: Project attributes, read again only when the file
+                changed.
         Raises:
             FileNotFoundError: When the attribute file doesn't exist.
             KeyError: When missing any field.
-            ValueError: When language isn't supported.
+            ValueError: When language isn't supported or the file doesn't
+                hold a mapping.
         """
 
         # Check path.
@@ -160,21 +235,78 @@ class ProjectSerializor:
             cls.__CONFIGURATION_FOLDER_NAME,
             cls.__PROJECT_ATTRIBUTE_FILE_NAME,
         )
-        if not os.path.isfile(file_path):
+        try:
+            status = os.stat(file_path)
+        except OSError:
+            status = None
+        if status is None or not stat.S_ISREG(status.st_mode):
             error = f"File {file_path} does not exist."
             logging.error(error)
             raise FileNotFoundError(error)
 
-        # Read from path.
-        with open(file_path, "r", encoding="utf=8") as file:
-            attributes = yaml.safe_load(file)
+        # Attributes validated by other configurators have to be read again.
+        version = (
+            status.st_ino,
+            status.st_size,
+            status.st_mtime_ns,
+            status.st_ctime_ns,
+            ConfiguratorFactory.get_fingerprint(),
+        )
+        key = os.path.abspath(file_path)
+        attributes = cls.__attribute_cache.get(key, version)
+        if attributes is not None:
+            attributes["path"] = path
+            return attributes
+
+        # Read from path, the sidecar is used while it has the same content.
+        with open(file_path, "rb") as file:
+            content = file.read()
+        source = sidecar.fingerprint(content)
+        sidecar_path = os.path.join(
+            os.path.dirname(file_path), cls.__PROJECT_ATTRIBUTE_SIDECAR_NAME
+        )
+        attributes = sidecar.read_sidecar(sidecar_path, source)
+        if attributes is None:
+            attributes = yaml.safe_load(content)
+            if not isinstance(attributes, dict):
+                error = f"File {file_path} doesn't hold project attributes."
+                logging.error(error)
+                raise ValueError(error)
+            sidecar.write_sidecar(sidecar_path, source, attributes)
 
         # Validate attributes.
         attributes["path"] = path
         ConfiguratorFactory.get_configurator(attributes)
 
+        changed = max(status.st_mtime_ns, status.st_ctime_ns)
+        cls.__attribute_cache.put(key, version, attributes, changed)
         return attributes
 
+    @classmethod
+    def index_workspace(cls, root: str, index_path: str = None) -> dict[str, any]:
+        """Find and deserialize every project under a workspace folder.
+
+        Args:
+            root (str): Path of the workspace folder.
+            index_path (str): Json file of the index kept between scans,
+                ~/.cache/hlzcs/workspace_index.json when None.
+
+        Raises:
+            NotADirectoryError: When root does not exist.
+
+        Returns:
+            dict[str, any]: {"root", "projects": [{"path", "attributes" |
+                "error"}], "folders", "read", "parsed", "duration"}.
+        """
+
+        indexer = WorkspaceIndexer(
+            cls.__CONFIGURATION_FOLDER_NAME,
+            cls.__PROJECT_ATTRIBUTE_FILE_NAME,
+            cls.deserialize,
+            index_path,
+        )
+        return indexer.scan(root)
+
     @classmethod
     def create_project(cls, data: dict[str, str]) -> None:
         """Create a configuration and serialize project attributes.
@@ -195,10 +327,12 @@ class ProjectSerializor:
             raise KeyError(error)
 
         path = data["path"]
-        cls.create_configuration_folder(path)
-        configurator = ConfiguratorFactory.get_configurator(data)
-        configurator.build_configurations()
-        cls.serialize(path, configurator.get_serialize_data())
+        # Requests creating the same project run one after another.
+        with _get_path_lock(path):
+            cls.create_configuration_folder(path)
+            configurator = ConfiguratorFactory.get_configurator(data)
+            configurator.build_configurations()
+            cls.serialize(path, configurator.get_serialize_data())
 
 
 def raise_not_a_directory(path: str) -> None:
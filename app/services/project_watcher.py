@@ -0,0 +1,430 @@
+"""Keep the state of opened projects in memory and follow their changes.
+
+A project is watched from its first lookup on. Changes of the entries of its
+folder are picked up from inotify on Linux and by polling elsewhere, so
+lookups are answered from memory. Every lookup still stats the project folder, which catches a
+folder that was replaced or changed before its events were handled.
+"""
+
+__all__ = ["ProjectState", "ProjectWatcher"]
+
+import ctypes
+import ctypes.util
+import itertools
+import logging
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+from collections import OrderedDict
+
+from app.services.fs_snapshot import DirectorySnapshot, scan_directory
+
+
+class ProjectState:
+    """What is known about a project folder at one point in time."""
+
+    __slots__ = ("path", "snapshot", "initialized")
+
+    def __init__(
+        self, path: str, snapshot: DirectorySnapshot, initialized: bool
+    ) -> None:
+        """Create a ProjectState.
+
+        Project attributes aren't part of the state, ProjectSerializor
+        caches them with the file they were read from.
+
+        Args:
+            path (str): Absolute path of the project.
+            snapshot (DirectorySnapshot): Entries of the project folder.
+            initialized (bool): Has the project a configuration folder.
+        """
+
+        self.path = path
+        self.snapshot = snapshot
+        self.initialized = initialized
+
+
+def _stat_version(path: str):
+    """Get inode, mtime, ctime and size of a path, None when it's missing."""
+
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+    return (
+        status.st_ino,
+        status.st_mtime_ns,
+        status.st_ctime_ns,
+        status.st_size,
+        stat.S_ISDIR(status.st_mode),
+    )
+
+
+class ProjectWatcher:
+    """In-memory state of watched project folders."""
+
+    def __init__(
+        self,
+        folder_name: str,
+        max_projects: int = 256,
+        backend: str = None,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """Create a ProjectWatcher. Watching starts with the first lookup.
+
+        Args:
+            folder_name (str): Name of the configuration folder, e.g. ".hlzcs".
+            max_projects (int): Projects watched at the same time, the least
+                recently looked up one is dropped first.
+            backend (str): "inotify" or "polling", None picks inotify when
+                available.
+            poll_interval (float): Seconds between checks of the polling
+                backend.
+        """
+
+        self._folder_name = folder_name
+        self._max_projects = max_projects
+        self._states: OrderedDict[str, ProjectState] = OrderedDict()
+        # Sequence of the refresh that produced a state, older ones lose.
+        self._sequences: dict[str, int] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+        if backend is None:
+            backend = "inotify" if _InotifyBackend.available() else "polling"
+        if backend == "inotify":
+            self._backend = _InotifyBackend(self)
+        elif backend == "polling":
+            self._backend = _PollingBackend(self, poll_interval)
+        else:
+            error = f'Watcher backend "{backend}" is not supported.'
+            logging.error(error)
+            raise ValueError(error)
+
+    @property
+    def backend(self) -> str:
+        """Name of the backend, "inotify" or "polling"."""
+        return self._backend.name
+
+    def get(self, path: str):
+        """Get the state of a project, watching it from now on.
+
+        Args:
+            path (str): Path of the project.
+
+        Returns:
+            ProjectState | None: The state, None when path isn't a folder.
+        """
+
+        key = os.path.abspath(path)
+        version = _stat_version(key)
+        if version is None or not version[4]:
+            self.unwatch(key)
+            return None
+
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+
+        if state is None or state.snapshot.version[0] != version[0]:
+            # New, or replaced by another folder at the same path.
+            self._backend.add(key)
+            return self.refresh(key, force=True)
+        # Entries of the folder changed and the event wasn't handled yet.
+        if state.snapshot.version != version[:3]:
+            return self.refresh(key)
+        return state
+
+    def refresh(self, path: str, force: bool = False):
+        """Read a project from disk again, e.g. after changing it.
+
+        Args:
+            path (str): Path of the project.
+            force (bool): Also read projects that aren't watched yet.
+
+        Returns:
+            ProjectState | None: The new state, None when the project isn't
+                watched or isn't a folder.
+        """
+
+        key = os.path.abspath(path)
+        with self._lock:
+            if not force and key not in self._states:
+                return None
+            sequence = next(self._counter)
+
+        try:
+            snapshot = scan_directory(key)
+        except NotADirectoryError:
+            self.unwatch(key)
+            return None
+
+        state = ProjectState(
+            key, snapshot, self._folder_name in snapshot.directories
+        )
+
+        evicted = []
+        with self._lock:
+            if sequence >= self._sequences.get(key, -1):
+                self._states[key] = state
+                self._states.move_to_end(key)
+                self._sequences[key] = sequence
+            else:
+                state = self._states.get(key, state)
+            while len(self._states) > self._max_projects:
+                evicted.append(self._states.popitem(last=False)[0])
+                self._sequences.pop(evicted[-1], None)
+        for evicted_path in evicted:
+            self._backend.remove(evicted_path)
+        return state
+
+    def unwatch(self, path: str) -> None:
+        """Stop watching a project.
+
+        Args:
+            path (str): Path of the project.
+        """
+
+        key = os.path.abspath(path)
+        with self._lock:
+            watched = self._states.pop(key, None) is not None
+            self._sequences.pop(key, None)
+        if watched:
+            self._backend.remove(key)
+
+    def watched(self) -> list[str]:
+        """Get the watched projects.
+
+        Returns:
+            list[str]: Absolute paths, the least recently looked up first.
+        """
+        with self._lock:
+            return list(self._states)
+
+    def close(self) -> None:
+        """Stop watching every project."""
+
+        with self._lock:
+            self._states.clear()
+            self._sequences.clear()
+        self._backend.close()
+
+    def stats(self) -> dict[str, int]:
+        """Get the number of watched projects.
+
+        Returns:
+            dict[str, int]: {"projects", "max_projects"}.
+        """
+        with self._lock:
+            return {
+                "projects": len(self._states),
+                "max_projects": self._max_projects,
+            }
+
+
+class _PollingBackend:
+    """Check watched projects for changes in a background thread."""
+
+    name = "polling"
+
+    def __init__(self, watcher: ProjectWatcher, interval: float) -> None:
+        self._watcher = watcher
+        self._interval = interval
+        self._versions: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: threading.Thread = None
+
+    def add(self, path: str) -> None:
+        version = _stat_version(path)
+        with self._lock:
+            self._versions[path] = version
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._poll, name="project-watcher", daemon=True
+                )
+                self._thread.start()
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            self._versions.pop(path, None)
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            self._versions.clear()
+
+    def _poll(self) -> None:
+        while not self._closed.wait(self._interval):
+            with self._lock:
+                paths = list(self._versions)
+            for path in paths:
+                version = _stat_version(path)
+                with self._lock:
+                    if self._versions.get(path, version) == version:
+                        continue
+                    self._versions[path] = version
+                self._watcher.refresh(path)
+
+
+class _InotifyBackend:
+    """Follow changes of watched projects with Linux inotify."""
+
+    name = "inotify"
+
+    _IN_MOVED_FROM = 0x40
+    _IN_MOVED_TO = 0x80
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_DELETE_SELF = 0x400
+    _IN_MOVE_SELF = 0x800
+    _IN_Q_OVERFLOW = 0x4000
+    _IN_IGNORED = 0x8000
+    _IN_ONLYDIR = 0x01000000
+    # Entries of the project folder. Writes to files in it don't matter.
+    _MASK = (
+        _IN_CREATE
+        | _IN_DELETE
+        | _IN_MOVED_FROM
+        | _IN_MOVED_TO
+        | _IN_DELETE_SELF
+        | _IN_MOVE_SELF
+        | _IN_ONLYDIR
+    )
+    _EVENT = struct.Struct("iIII")
+
+    _libc = None
+
+    @classmethod
+    def available(cls) -> bool:
+        """Check whether inotify can be used on this platform."""
+
+        if not sys.platform.startswith("linux"):
+            return False
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(
+                    ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+                )
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [
+                    ctypes.c_int,
+                    ctypes.c_char_p,
+                    ctypes.c_uint32,
+                ]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            except (OSError, AttributeError):
+                return False
+            cls._libc = libc
+        return True
+
+    def __init__(self, watcher: ProjectWatcher) -> None:
+        if not self.available():
+            error = "inotify is not available."
+            logging.error(error)
+            raise OSError(error)
+        self._watcher = watcher
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        # Watch descriptor to project, and back.
+        self._watches: dict[int, str] = {}
+        self._projects: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._read_events, name="project-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def add(self, path: str) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            # The folder may have been replaced, watch the new one.
+            self._remove_watch(path)
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(path), self._MASK
+            )
+            if wd < 0:
+                # Gone already, or out of watches. Lookups still stat it.
+                error = os.strerror(ctypes.get_errno())
+                logging.debug("Failed to watch %s: %s", path, error)
+                return
+            self._watches[wd] = path
+            self._projects[path] = wd
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            self._remove_watch(path)
+
+    def _remove_watch(self, path: str) -> None:
+        """Stop watching the folder of a project. Needs the lock."""
+
+        wd = self._projects.pop(path, None)
+        if self._watches.pop(wd, None) is not None and not self._closed:
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._watches.clear()
+            self._projects.clear()
+        # The reader thread closes the descriptor.
+
+    def _read_events(self) -> None:
+        """Handle events until closed."""
+
+        try:
+            while True:
+                with self._lock:
+                    if self._closed:
+                        return
+                readable, _, _ = select.select([self._fd], [], [], 0.5)
+                if not readable:
+                    continue
+                try:
+                    data = os.read(self._fd, 65536)
+                except BlockingIOError:
+                    continue
+                for project in self._handle(data):
+                    self._watcher.refresh(project)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logging.exception("Project watcher stopped.")
+        finally:
+            os.close(self._fd)
+
+    def _handle(self, data: bytes) -> list[str]:
+        """Parse events and update the watches.
+
+        Returns:
+            list[str]: Projects that changed, once each.
+        """
+
+        changed = {}
+        offset = 0
+        with self._lock:
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size + length
+
+                if mask & self._IN_Q_OVERFLOW:
+                    # Events were dropped, read every project again.
+                    changed.update(dict.fromkeys(self._projects))
+                    continue
+                project = self._watches.get(wd)
+                if project is None:
+                    continue
+                if mask & self._IN_IGNORED:
+                    del self._watches[wd]
+                    if self._projects.get(project) == wd:
+                        del self._projects[project]
+                changed[project] = None
+        return list(changed)
@@ -0,0 +1,274 @@
+"""Canonical json copies of yaml files, loaded instead of parsing yaml.
+
+A sidecar has two lines: a header with the format version and the size and
+sha256 of the yaml content it was made from, then the data. Sidecars of
+yaml sequences have a line per item instead, so they are read as a stream
+like the yaml. A sidecar is only used while the yaml file still has that
+content, so the yaml stays the file to edit and export. Hashing the yaml
+costs a read, parsing it costs far more.
+"""
+
+__all__ = [
+    "SIDECAR_VERSION",
+    "dumps",
+    "fingerprint",
+    "fingerprint_file",
+    "read_sidecar",
+    "write_sidecar",
+    "iter_sequence",
+    "tee_sequence",
+]
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+# Sidecars of another version are ignored and written again.
+SIDECAR_VERSION = 2
+
+_FORMAT = "resiliflow-sidecar"
+
+
+def dumps(value) -> str:
+    """Serialize a value to canonical json: sorted keys, no spaces.
+
+    Raises:
+        TypeError: When the value has types json doesn't have, e.g. dates.
+        ValueError: When the value has NaN or infinite floats.
+    """
+
+    return json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        allow_nan=False,
+    )
+
+
+def _dumps_exactly(value) -> str:
+    """Serialize a value that json loads back unchanged.
+
+    Raises:
+        TypeError: When it can't, e.g. for dates or keys that aren't strings.
+    """
+
+    text = dumps(value)
+    if json.loads(text) != value:
+        raise TypeError("Value changes through json.")
+    return text
+
+
+def fingerprint(content: bytes) -> dict[str, any]:
+    """Identify the content of a yaml file.
+
+    Args:
+        content (bytes): Content of the file.
+
+    Returns:
+        dict[str, any]: {"size", "sha256"}.
+    """
+    return {"size": len(content), "sha256": hashlib.sha256(content).hexdigest()}
+
+
+def fingerprint_file(path: str):
+    """Identify the content of a yaml file, reading it in chunks.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        dict[str, any] | None: {"size", "sha256"}, None when it can't be read.
+    """
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "rb") as file:
+            while chunk := file.read(1 << 20):
+                digest.update(chunk)
+                size += len(chunk)
+    except OSError:
+        return None
+    return {"size": size, "sha256": digest.hexdigest()}
+
+
+def _header(source: dict[str, any]) -> str:
+    return dumps({"format": _FORMAT, "version": SIDECAR_VERSION, "source": source})
+
+
+def read_sidecar(path: str, source: dict[str, any]):
+    """Read a sidecar made from the current content of its yaml file.
+
+    Args:
+        path (str): Path of the sidecar.
+        source (dict[str, any]): Fingerprint of the yaml content now.
+
+    Returns:
+        any | None: The data, None when the sidecar is missing, of another
+            version, made from other content or broken.
+    """
+
+    if source is None:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            if file.readline().rstrip("\n") != _header(source):
+                return None
+            return json.loads(file.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as ex:
+        logging.error('Ignoring sidecar "%s": %s', path, ex)
+        return None
+
+
+def _temporary(path: str) -> str:
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_sidecar(path: str, source: dict[str, any], data) -> bool:
+    """Write the sidecar of a yaml file, never half written.
+
+    A data json can't load back unchanged removes the sidecar instead, so an
+    old one isn't used either.
+
+    Args:
+        path (str): Path of the sidecar, its folder is created.
+        source (dict[str, any]): Fingerprint of the yaml content.
+        data (any): Data of the yaml content.
+
+    Returns:
+        bool: Was the sidecar written.
+    """
+
+    try:
+        text = _dumps_exactly(data)
+    except (TypeError, ValueError):
+        _remove(path)
+        return False
+
+    temporary = _temporary(path)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(_header(source) + "\n" + text + "\n")
+        os.replace(temporary, path)
+    except OSError as ex:
+        logging.error('Failed to write sidecar "%s": %s', path, ex)
+        _remove(temporary)
+        return False
+    return True
+
+
+def iter_sequence(path: str, source: dict[str, any]):
+    """Read the sidecar of a yaml sequence made from its current content.
+
+    The header is checked right away, the items are read one line at a time.
+
+    Args:
+        path (str): Path of the sidecar.
+        source (dict[str, any]): Fingerprint of the yaml content now.
+
+    Returns:
+        Iterator[any] | None: The items, None when the sidecar is missing, of
+            another version or made from other content. A broken line
+            removes the sidecar and raises ValueError from the iterator,
+            the items left have to come from the yaml.
+    """
+
+    if source is None:
+        return None
+    try:
+        file = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    except OSError as ex:
+        logging.error('Ignoring sidecar "%s": %s', path, ex)
+        return None
+    try:
+        header = file.readline().rstrip("\n")
+    except (OSError, ValueError) as ex:
+        logging.error('Ignoring sidecar "%s": %s', path, ex)
+        header = None
+    if header != _header(source):
+        file.close()
+        return None
+    return _iter_lines(path, file)
+
+
+def _iter_lines(path: str, file):
+    """Yield the json item of every line left in an open sidecar."""
+
+    with file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Sidecars are replaced whole, this one was edited.
+                logging.error('Removing broken sidecar "%s".', path)
+                _remove(path)
+                raise
+
+
+def tee_sequence(path: str, source: dict[str, any], items):
+    """Yield the items of a yaml sequence while writing them as its sidecar.
+
+    Items are written a line each. The sidecar replaces the old one once
+    every item is yielded. It's dropped when the caller stops early or an
+    item can't be written.
+
+    Args:
+        path (str): Path of the sidecar, its folder is created.
+        source (dict[str, any]): Fingerprint of the yaml content.
+        items (Iterator[any]): Items parsed from the yaml file.
+
+    Yields:
+        any: The items.
+    """
+
+    temporary = _temporary(path)
+    file = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file = open(temporary, "w", encoding="utf-8")
+        file.write(_header(source) + "\n")
+    except OSError as ex:
+        logging.error('Failed to write sidecar "%s": %s', path, ex)
+        if file is not None:
+            file.close()
+            _remove(temporary)
+        file = None
+
+    complete = False
+    try:
+        for item in items:
+            if file is not None:
+                try:
+                    file.write(_dumps_exactly(item) + "\n")
+                except (OSError, TypeError, ValueError):
+                    file.close()
+                    _remove(temporary)
+                    file = None
+            yield item
+        complete = True
+    finally:
+        if file is not None:
+            try:
+                file.close()
+                if complete:
+                    os.replace(temporary, path)
+                    temporary = None
+            except OSError as ex:
+                logging.error('Failed to write sidecar "%s": %s', path, ex)
+            if temporary is not None:
+                _remove(temporary)
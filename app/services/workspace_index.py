@@ -0,0 +1,321 @@
+"""Find every project under a workspace folder.
+
+Folders are read on a thread pool. The result is stored in a json index,
+so the next scan of the same root only reads the folders that changed and
+the attribute files that were written since.
+"""
+
+__all__ = ["DEFAULT_INDEX_PATH", "PRUNED_FOLDERS", "WorkspaceIndexer"]
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import yaml
+
+from app.services.fs_snapshot import RACY_WINDOW_NS
+
+# Kept out of ~/.hlzcs, which would mark the home folder as a project.
+DEFAULT_INDEX_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME")
+    or os.path.join(os.path.expanduser("~"), ".cache"),
+    "hlzcs",
+    "workspace_index.json",
+)
+
+# Folders that never hold projects but can hold many files.
+PRUNED_FOLDERS = frozenset(
+    [
+        ".git",
+        ".hg",
+        ".svn",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".idea",
+    ]
+)
+
+_INDEX_VERSION = 1
+
+# Index files are shared by every indexer of the process.
+_index_lock = threading.Lock()
+
+
+def _version(path: str):
+    """Get inode, mtime and ctime of a path, None when it's missing."""
+
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+    return [status.st_ino, status.st_mtime_ns, status.st_ctime_ns]
+
+
+def _settled(version: list[int], scanned: int) -> bool:
+    """Check that nothing could change a folder unnoticed since its scan."""
+    return scanned - max(version[1], version[2]) > RACY_WINDOW_NS
+
+
+class WorkspaceIndexer:
+    """Scan workspace folders for projects and keep an index of them."""
+
+    def __init__(
+        self,
+        folder_name: str,
+        attribute_file_name: str,
+        deserialize,
+        index_path: str = None,
+        workers: int = None,
+    ) -> None:
+        """Create a WorkspaceIndexer.
+
+        Args:
+            folder_name (str): Name of the configuration folder, e.g. ".hlzcs".
+            attribute_file_name (str): Name of the attribute file in it.
+            deserialize (Callable[[str], dict[str, any]]): Reads the
+                attributes of a project path.
+            index_path (str): Json file of the index, DEFAULT_INDEX_PATH when
+                None.
+            workers (int): Threads reading folders, defaults to 4 per CPU
+                since the work is waiting for the disk.
+        """
+
+        self._folder_name = folder_name
+        self._attribute_file_name = attribute_file_name
+        self._deserialize = deserialize
+        self._index_path = index_path or DEFAULT_INDEX_PATH
+        self._workers = workers or min(32, 4 * (os.cpu_count() or 1))
+
+    def scan(self, root: str) -> dict[str, any]:
+        """Find every project under a folder.
+
+        Args:
+            root (str): Path of the workspace folder.
+
+        Raises:
+            NotADirectoryError: When root does not exist.
+
+        Returns:
+            dict[str, any]: {"root", "projects": [{"path", "attributes" |
+                "error"}], "folders" (visited), "read" (folders listed
+                again), "parsed" (attribute files read again), "duration"}.
+        """
+
+        if not os.path.isdir(root):
+            error = f'Path "{root}" does not exist.'
+            logging.error(error)
+            raise NotADirectoryError(error)
+
+        start = time.perf_counter()
+        root = os.path.abspath(root)
+        previous = self._load().get(root, {"folders": {}, "projects": {}})
+        folders, read = self._walk(root, previous["folders"])
+        projects, parsed = self._read_projects(
+            [path for path, folder in folders.items() if folder["project"]],
+            previous["projects"],
+        )
+        self._store(root, {"folders": folders, "projects": projects})
+
+        listing = []
+        for path in sorted(projects):
+            project = {"path": path}
+            if "error" in projects[path]:
+                project["error"] = projects[path]["error"]
+            else:
+                project["attributes"] = projects[path]["attributes"]
+            listing.append(project)
+        return {
+            "root": root,
+            "projects": listing,
+            "folders": len(folders),
+            "read": read,
+            "parsed": parsed,
+            "duration": time.perf_counter() - start,
+        }
+
+    def _read_folder(self, path: str, previous: dict[str, any]):
+        """List the sub folders of a folder, reusing an unchanged listing.
+
+        Returns:
+            tuple[dict[str, any] | None, bool]: {"version", "scanned",
+                "folders", "project"} or None when the folder is gone, and
+                whether it was listed.
+        """
+
+        version = _version(path)
+        if version is None:
+            return None, False
+        if (
+            previous is not None
+            and previous["version"] == version
+            and _settled(version, previous["scanned"])
+        ):
+            return previous, False
+
+        scanned = time.time_ns()
+        subfolders = []
+        project = False
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # Links could lead out of the workspace or in a loop.
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                    except OSError:
+                        continue
+                    if entry.name == self._folder_name:
+                        project = True
+                    elif entry.name not in PRUNED_FOLDERS:
+                        subfolders.append(entry.name)
+        except OSError as ex:
+            logging.error('Failed to read "%s": %s', path, ex)
+            return None, False
+        return {
+            "version": version,
+            "scanned": scanned,
+            "folders": sorted(subfolders),
+            "project": project,
+        }, True
+
+    def _walk(self, root: str, previous: dict[str, dict[str, any]]):
+        """Visit every folder under root in parallel.
+
+        Returns:
+            tuple[dict[str, dict[str, any]], int]: Folders by path and the
+                number of folders listed again.
+        """
+
+        folders = {}
+        read = 0
+        with ThreadPoolExecutor(self._workers) as pool:
+            pending = {
+                pool.submit(self._read_folder, root, previous.get(root)): root
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    folder, listed = future.result()
+                    if folder is None:
+                        continue
+                    folders[path] = folder
+                    read += listed
+                    for name in folder["folders"]:
+                        child = os.path.join(path, name)
+                        future = pool.submit(
+                            self._read_folder, child, previous.get(child)
+                        )
+                        pending[future] = child
+        return folders, read
+
+    def _read_project(self, path: str, previous: dict[str, any]):
+        """Deserialize a project unless its attribute file is unchanged.
+
+        Returns:
+            tuple[dict[str, any], bool]: {"version", "scanned", "attributes"
+                | "error"}, and whether the file was read.
+        """
+
+        folder_path = os.path.join(path, self._folder_name)
+        # A missing attribute file is also remembered, creating it changes
+        # the configuration folder.
+        version = [
+            _version(os.path.join(folder_path, self._attribute_file_name)),
+            _version(folder_path),
+        ]
+        if (
+            previous is not None
+            and previous["version"] == version
+            and all(
+                _settled(part, previous["scanned"]) for part in version if part
+            )
+        ):
+            return previous, False
+
+        project = {"version": version, "scanned": time.time_ns()}
+        try:
+            project["attributes"] = self._deserialize(path)
+        except (OSError, KeyError, ValueError, yaml.YAMLError) as ex:
+            project["error"] = str(ex.args[0]) if len(ex.args) == 1 else str(ex)
+        return project, True
+
+    def _read_projects(
+        self, paths: list[str], previous: dict[str, dict[str, any]]
+    ):
+        """Deserialize projects in parallel.
+
+        Returns:
+            tuple[dict[str, dict[str, any]], int]: Projects by path and the
+                number of attribute files read again.
+        """
+
+        with ThreadPoolExecutor(self._workers) as pool:
+            results = pool.map(
+                lambda path: self._read_project(path, previous.get(path)), paths
+            )
+            projects = {}
+            parsed = 0
+            for path, (project, read) in zip(paths, results):
+                projects[path] = project
+                parsed += read
+        return projects, parsed
+
+    def _load(self) -> dict[str, dict[str, any]]:
+        """Read the index of every root, empty when missing or outdated."""
+
+        with _index_lock:
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as file:
+                    index = json.load(file)
+            except FileNotFoundError:
+                return {}
+            except (OSError, ValueError) as ex:
+                logging.error('Ignoring index "%s": %s', self._index_path, ex)
+                return {}
+        if not isinstance(index, dict) or index.get("version") != _INDEX_VERSION:
+            return {}
+        return index.get("roots", {})
+
+    def _store(self, root: str, entry: dict[str, any]) -> None:
+        """Write the index of a root, keeping the other roots.
+
+        Errors are logged and the index is left as it was.
+        """
+
+        with _index_lock:
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as file:
+                    index = json.load(file)
+                if index.get("version") != _INDEX_VERSION:
+                    raise ValueError("Outdated index.")
+            except (OSError, ValueError, AttributeError):
+                index = {"version": _INDEX_VERSION, "roots": {}}
+            index.setdefault("roots", {})[root] = entry
+
+            # Readers never see a half written index.
+            temporary = f"{self._index_path}.{os.getpid()}.tmp"
+            try:
+                folder = os.path.dirname(self._index_path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                with open(temporary, "w", encoding="utf-8") as file:
+                    json.dump(index, file, separators=(",", ":"), default=str)
+                os.replace(temporary, self._index_path)
+            except OSError as ex:
+                # The scan is still valid, the next one reads everything again.
+                logging.error('Not writing index "%s": %s', self._index_path, ex)
+                try:
+                    os.remove(temporary)
+                except OSError:
+                    pass
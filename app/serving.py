@@ -0,0 +1,306 @@
+"""Serve the app with a pre-forked, multi-threaded WSGI server.
+
+The master process binds the socket and forks workers sharing it. Every
+worker serves requests on a bounded thread pool with HTTP/1.1 keep-alive.
+
+Signals (POSIX):
+    SIGTERM, SIGINT: stop accepting connections, finish in-flight requests
+        and exit.
+    SIGHUP: gracefully replace every worker with a new one.
+
+Without fork (Windows), or with one worker, the app is served by a single
+multi-threaded process. That is the default: background jobs, request
+metrics and project watchers live in the memory of a process, so with more
+workers a job id or a counter is only known to the worker that made it.
+"""
+
+__all__ = ["serve"]
+
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+
+class _KeepAliveRequestHandler(WSGIRequestHandler):
+    """Request handler keeping HTTP/1.1 connections open between requests."""
+
+    protocol_version = "HTTP/1.1"
+
+
+class _PooledWSGIServer(BaseWSGIServer):
+    """A WSGI server handling connections on a bounded thread pool."""
+
+    multithread = True
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        app,
+        threads: int,
+        keep_alive: float,
+        fd: int = None,
+    ) -> None:
+        """Create a _PooledWSGIServer.
+
+        Args:
+            host (str): Host to bind.
+            port (int): Port to bind.
+            app (WSGIApplication): The app.
+            threads (int): Connections served at the same time.
+            keep_alive (float): Seconds an idle connection is kept open.
+            fd (int): Already bound socket to serve on.
+        """
+
+        handler = type(
+            "RequestHandler", (_KeepAliveRequestHandler,), {"timeout": keep_alive}
+        )
+        # BaseWSGIServer closes its own socket before serving on fd.
+        self._pool = None
+        super().__init__(host, port, app, handler=handler, fd=fd)
+        self._pool = ThreadPoolExecutor(threads, thread_name_prefix="http")
+
+    def process_request(self, request, client_address) -> None:
+        self._pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        """Stop accepting connections and wait for in-flight requests."""
+
+        super().server_close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def shutdown_gracefully(self, *_) -> None:
+        """Stop serve_forever. Safe to call from a signal handler."""
+
+        # shutdown() blocks until serve_forever returns, which can't happen
+        # while this thread is stuck in it.
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def serve(
+    app,
+    host: str = "127.0.0.1",
+    port: int = 5000,
+    workers: int = None,
+    threads: int = 8,
+    keep_alive: float = 5,
+    graceful_timeout: float = 30,
+) -> None:
+    """Serve an app until it's told to stop.
+
+    Args:
+        app (WSGIApplication): The app.
+        host (str): Host to bind.
+        port (int): Port to bind, 0 picks a free port.
+        workers (int): Worker processes, defaults to 1. Every worker has its
+            own jobs, metrics and watchers, so polling /api/jobs or reading
+            /metrics needs a single worker.
+        threads (int): Threads of every worker.
+        keep_alive (float): Seconds an idle connection is kept open.
+        graceful_timeout (float): Seconds workers get to finish in-flight
+            requests before they are killed.
+
+    Raises:
+        ValueError: When workers or threads is less than 1.
+    """
+
+    if workers is None:
+        workers = 1
+    if workers < 1 or threads < 1:
+        raise ValueError("workers and threads have to be at least 1.")
+    if not hasattr(os, "fork"):
+        workers = 1
+    if workers > 1:
+        logging.warning(
+            "Every worker has its own jobs and metrics, a job id is unknown "
+            "to the other %d worker(s).",
+            workers - 1,
+        )
+
+    if workers == 1:
+        server = _PooledWSGIServer(host, port, app, threads, keep_alive)
+        _announce(host, server.port, workers, threads)
+        _serve_worker(server)
+        return
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    listener = socket.create_server((host, port), family=family, backlog=1024)
+    _announce(host, listener.getsockname()[1], workers, threads)
+    try:
+        _Master(
+            app, host, listener.getsockname()[1], workers, threads,
+            keep_alive, graceful_timeout, listener,
+        ).run()
+    finally:
+        listener.close()
+
+
+def _announce(host: str, port: int, workers: int, threads: int) -> None:
+    """Print where the app is served."""
+
+    print(
+        f"Serving on http://{host}:{port} with {workers} worker(s) "
+        f"x {threads} thread(s).",
+        flush=True,
+    )
+
+
+def _serve_worker(server: _PooledWSGIServer) -> None:
+    """Serve requests in this process until SIGTERM or SIGINT.
+
+    Args:
+        server (_PooledWSGIServer): Server bound to the socket.
+    """
+
+    signal.signal(signal.SIGTERM, server.shutdown_gracefully)
+    signal.signal(signal.SIGINT, server.shutdown_gracefully)
+    # serve_forever closes the server, which waits for in-flight requests.
+    server.serve_forever()
+
+
+class _Master:
+    """Fork workers, replace the ones that die and relay signals."""
+
+    def __init__(
+        self,
+        app,
+        host: str,
+        port: int,
+        workers: int,
+        threads: int,
+        keep_alive: float,
+        graceful_timeout: float,
+        listener,
+    ) -> None:
+        self._app = app
+        self._host = host
+        self._port = port
+        self._workers = workers
+        self._threads = threads
+        self._keep_alive = keep_alive
+        self._graceful_timeout = graceful_timeout
+        self._listener = listener
+        self._children: set[int] = set()
+        self._retiring: dict[int, float] = {}
+        self._stopping = False
+        self._reloading = False
+
+    def run(self) -> None:
+        """Run until SIGTERM or SIGINT, then stop the workers gracefully."""
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGHUP, self._reload)
+
+        for _ in range(self._workers):
+            self._spawn()
+
+        while not self._stopping:
+            if self._reloading:
+                self._reloading = False
+                logging.info("Reloading workers.")
+                old = set(self._children)
+                for _ in range(self._workers):
+                    self._spawn()
+                for pid in old:
+                    self._retire(pid)
+            self._reap()
+            self._kill_overdue()
+            while len(self._children) < self._workers and not self._stopping:
+                self._spawn()
+            time.sleep(0.1)
+
+        for pid in set(self._children):
+            self._retire(pid)
+        while self._children or self._retiring:
+            self._reap()
+            self._kill_overdue()
+            time.sleep(0.05)
+
+    def _stop(self, *_) -> None:
+        self._stopping = True
+
+    def _reload(self, *_) -> None:
+        self._reloading = True
+
+    def _spawn(self) -> None:
+        """Fork a worker."""
+
+        pid = os.fork()
+        if pid:
+            self._children.add(pid)
+            return
+
+        code = 0
+        try:
+            signal.signal(signal.SIGHUP, signal.SIG_DFL)
+            _serve_worker(
+                _PooledWSGIServer(
+                    self._host,
+                    self._port,
+                    self._app,
+                    self._threads,
+                    self._keep_alive,
+                    fd=self._listener.fileno(),
+                )
+            )
+        except BaseException:  # pylint: disable=broad-exception-caught
+            logging.exception("Worker %d crashed.", os.getpid())
+            code = 1
+        finally:
+            # Skip the master's atexit hooks and buffered output.
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def _retire(self, pid: int) -> None:
+        """Ask a worker to finish its requests and exit."""
+
+        self._children.discard(pid)
+        self._retiring[pid] = time.monotonic() + self._graceful_timeout
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> None:
+        """Collect exited workers."""
+
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            self._retiring.pop(pid, None)
+            if pid in self._children:
+                logging.error("Worker %d exited unexpectedly.", pid)
+                self._children.discard(pid)
+
+    def _kill_overdue(self) -> None:
+        """Kill retiring workers that ran out of graceful time."""
+
+        now = time.monotonic()
+        for pid, deadline in list(self._retiring.items()):
+            if now > deadline:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
@@ -0,0 +1,130 @@
+"""Generate synthetic pipeline files for benchmarks.
+
+Files use version 1 of the pipeline schema by default, the layout of
+data/pipeline.yaml, which deserialize migrates while reading. Version 2 is
+the layout Node.toDict writes.
+"""
+
+__all__ = ["SHAPES", "VERSIONS", "generate_pipeline"]
+
+import argparse
+import random
+
+SHAPES = ("chain", "fanout", "random")
+
+VERSIONS = (1, 2)
+
+_ACTIONS = ("setup_environment", "install_dependencies", "pyTest")
+
+
+def _input_ports(shape: str, index: int, rng: random.Random) -> list[str]:
+    """Get the input ports of a node.
+
+    Args:
+        shape (str): chain, fanout or random.
+        index (int): Index of the node.
+        rng (random.Random): Random source of random graphs.
+
+    Returns:
+        list[str]: Port names.
+    """
+
+    if index == 0:
+        return []
+    if shape == "chain":
+        return [f"port_{index - 1}"]
+    if shape == "fanout":
+        return ["port_0"]
+    # Random DAG: every node consumes up to 3 ports of earlier nodes.
+    count = min(index, rng.randint(1, 3))
+    return [f"port_{producer}" for producer in rng.sample(range(index), count)]
+
+
+def _entry(index: int, input_ports: list[str], version: int) -> str:
+    """Render one pipeline entry as yaml.
+
+    Args:
+        index (int): Index of the node.
+        input_ports (list[str]): Input port names.
+        version (int): Version of the pipeline schema.
+
+    Returns:
+        str: Yaml text of the entry.
+    """
+
+    if version == 1:
+        input_port = "".join(f"\n  - {port}" for port in input_ports) or " []"
+        return (
+            f"- action: {_ACTIONS[index % len(_ACTIONS)]}\n"
+            f"  id: node_{index}\n"
+            f"  inputPort:{input_port}\n"
+            f"  outputPort:\n"
+            f"  - port_{index}\n"
+            f"  x: {index % 1000}\n"
+            f"  y: {index // 1000}\n"
+        )
+
+    if not input_ports:
+        input_port = " ''"
+    elif len(input_ports) == 1:
+        input_port = f" {input_ports[0]}"
+    else:
+        input_port = "".join(f"\n  - {port}" for port in input_ports)
+    return (
+        f"- __class: {_ACTIONS[index % len(_ACTIONS)]}NodeData\n"
+        f"  id: node_{index}\n"
+        f"  inputPort:{input_port}\n"
+        f"  label: node_{index}\n"
+        f"  outputPort: port_{index}\n"
+        f"  position:\n"
+        f"    x: {index % 1000}\n"
+        f"    y: {index // 1000}\n"
+    )
+
+
+def generate_pipeline(
+    path: str, shape: str, size: int, seed: int = 0, version: int = 1
+) -> None:
+    """Write a synthetic pipeline file.
+
+    Entries are written one by one, so files with millions of nodes don't
+    need to fit in memory.
+
+    Args:
+        path (str): Path of the pipeline file.
+        shape (str): chain, fanout or random.
+        size (int): Number of nodes.
+        seed (int): Seed of random graphs.
+        version (int): Version of the pipeline schema.
+
+    Raises:
+        ValueError: When the shape or the version isn't supported.
+    """
+
+    if shape not in SHAPES:
+        raise ValueError(f'Shape "{shape}" is not supported.')
+    if version not in VERSIONS:
+        raise ValueError(f'Version "{version}" is not supported.')
+
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as file:
+        if size == 0:
+            file.write("[]\n")
+        for index in range(size):
+            file.write(_entry(index, _input_ports(shape, index, rng), version))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="Path of the pipeline file")
+    parser.add_argument("--shape", choices=SHAPES, default="chain")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--schema-version", type=int, choices=VERSIONS, default=1,
+        help="Version of the pipeline schema",
+    )
+    args = parser.parse_args()
+    generate_pipeline(
+        args.path, args.shape, args.size, args.seed, args.schema_version
+    )
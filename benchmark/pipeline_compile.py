@@ -0,0 +1,227 @@
+"""Benchmark deserialize and compile on synthetic pipelines.
+
+Every case runs in a fresh process so its peak RSS isn't shared with other
+cases. Results can be saved as a baseline and later runs are compared
+against it.
+
+    python -m benchmark.pipeline_compile --sizes 100 10000 --save-baseline
+    python -m benchmark.pipeline_compile --sizes 100 10000
+"""
+
+__all__ = ["run_case", "compare", "main"]
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark.generate import SHAPES, VERSIONS, generate_pipeline
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def _peak_rss() -> int:
+    """Get the peak resident set size of this process.
+
+    Returns:
+        int | None: Bytes, None when the platform can't tell.
+    """
+
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_case(
+    shape: str, size: int, seed: int = 0, version: int = 1
+) -> dict[str, any]:
+    """Generate a pipeline, then time deserialize and compile on it.
+
+    Args:
+        shape (str): chain, fanout or random.
+        size (int): Number of nodes.
+        seed (int): Seed of random graphs.
+        version (int): Version of the pipeline schema.
+
+    Returns:
+        dict[str, any]: {"shape", "size", "version", "deserialize_seconds",
+            "compile_seconds", "nodes_per_second", "peak_rss", "output_size"}.
+    """
+
+    # Imported here so spawned workers load the app after their start.
+    from app.services.nodeData import (  # pylint: disable=import-outside-toplevel
+        compile,
+        deserialize,
+    )
+
+    with tempfile.TemporaryDirectory() as folder:
+        pipeline = os.path.join(folder, "pipeline.yaml")
+        output = os.path.join(folder, "workflow.yaml")
+        generate_pipeline(pipeline, shape, size, seed, version)
+
+        start = time.perf_counter()
+        nodes = deserialize(pipeline)
+        deserialized = time.perf_counter()
+        compile(output, nodes)
+        compiled = time.perf_counter()
+
+        total = compiled - start
+        return {
+            "shape": shape,
+            "size": size,
+            "version": version,
+            "deserialize_seconds": deserialized - start,
+            "compile_seconds": compiled - deserialized,
+            "nodes_per_second": size / total if total else None,
+            "peak_rss": _peak_rss(),
+            "output_size": os.path.getsize(output),
+        }
+
+
+def _key(result: dict[str, any]) -> str:
+    return f'{result["shape"]}-{result["size"]}-v{result["version"]}'
+
+
+def compare(
+    results: list[dict[str, any]],
+    baseline: dict[str, dict[str, any]],
+    tolerance: float,
+) -> list[str]:
+    """Compare results against a baseline.
+
+    Args:
+        results (list[dict[str, any]]): Results of run_case.
+        baseline (dict[str, dict[str, any]]): Baseline results by case.
+        tolerance (float): Allowed relative slowdown or memory growth.
+
+    Returns:
+        list[str]: Regressions, empty when there are none.
+    """
+
+    regressions = []
+    for result in results:
+        key = _key(result)
+        if key not in baseline:
+            continue
+        expected = baseline[key]
+        if (
+            result["nodes_per_second"]
+            and expected.get("nodes_per_second")
+            and result["nodes_per_second"]
+            < expected["nodes_per_second"] * (1 - tolerance)
+        ):
+            regressions.append(
+                f'{key}: {result["nodes_per_second"]:.0f} nodes/s, '
+                f'baseline {expected["nodes_per_second"]:.0f} nodes/s.'
+            )
+        if (
+            result["peak_rss"]
+            and expected.get("peak_rss")
+            and result["peak_rss"] > expected["peak_rss"] * (1 + tolerance)
+        ):
+            regressions.append(
+                f'{key}: peak RSS {result["peak_rss"]} bytes, '
+                f'baseline {expected["peak_rss"]} bytes.'
+            )
+        if result["output_size"] != expected.get("output_size"):
+            regressions.append(
+                f'{key}: output {result["output_size"]} bytes, '
+                f'baseline {expected.get("output_size")} bytes.'
+            )
+    return regressions
+
+
+def _format(result: dict[str, any]) -> str:
+    peak_rss = result["peak_rss"]
+    peak_rss = "n/a" if peak_rss is None else f"{peak_rss / 2**20:.1f} MiB"
+    return (
+        f'{_key(result):<20}'
+        f'{result["deserialize_seconds"]:>12.3f}s'
+        f'{result["compile_seconds"]:>12.3f}s'
+        f'{result["nodes_per_second"] or 0:>14.0f}'
+        f"{peak_rss:>14}"
+        f'{result["output_size"]:>14}'
+    )
+
+
+def main(argv: list[str] = None) -> int:
+    """Run the benchmark.
+
+    Args:
+        argv (list[str]): Command line arguments.
+
+    Returns:
+        int: 0, or 1 when a result regressed from the baseline.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=SHAPES)
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[100, 1000, 10000],
+        help="Node counts, up to 1000000",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--schema-version", type=int, choices=VERSIONS, default=1,
+        help="Version of the pipeline schema",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="Store the results as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Allowed relative regression",
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    print(
+        f'{"case":<20}{"deserialize":>13}{"compile":>13}'
+        f'{"nodes/s":>14}{"peak RSS":>14}{"output B":>14}'
+    )
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for shape in args.shapes:
+        for size in args.sizes:
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(
+                    run_case, shape, size, args.seed, args.schema_version
+                ).result()
+            results.append(result)
+            print(_format(result), flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(
+                {_key(result): result for result in results}, file, indent=2
+            )
+        print(f"Saved baseline to {args.baseline}.")
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save-baseline.")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Measure the cold start of the app.
+
+Imports the app and calls create_app in a fresh interpreter with
+-X importtime, then reports the slowest imports.
+
+    python -m benchmark.startup --top 20 --budget 1.0
+
+Slower machines, e.g. shared CI runners, can raise the budget with the
+HLZCS_COLD_START_BUDGET environment variable.
+"""
+
+__all__ = [
+    "COLD_START_BUDGET",
+    "COLD_START_BUDGET_VARIABLE",
+    "get_budget",
+    "measure",
+    "main",
+]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Seconds the frontend may wait for the app to be created.
+COLD_START_BUDGET = 1.0
+
+# Environment variable overriding COLD_START_BUDGET.
+COLD_START_BUDGET_VARIABLE = "HLZCS_COLD_START_BUDGET"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+
+
+def get_budget() -> float:
+    """Get the cold start budget of this machine.
+
+    Raises:
+        ValueError: When the environment variable isn't a positive number.
+
+    Returns:
+        float: Seconds, COLD_START_BUDGET unless the environment overrides it.
+    """
+
+    value = os.environ.get(COLD_START_BUDGET_VARIABLE)
+    if not value:
+        return COLD_START_BUDGET
+    try:
+        budget = float(value)
+    except ValueError:
+        budget = 0
+    if not budget > 0:
+        raise ValueError(
+            f'{COLD_START_BUDGET_VARIABLE} "{value}" is not a positive number.'
+        )
+    return budget
+
+
+def _parse_importtime(stderr: str) -> list[dict[str, any]]:
+    """Parse the -X importtime report.
+
+    Args:
+        stderr (str): Standard error of the interpreter.
+
+    Returns:
+        list[dict[str, any]]: {"module", "self", "cumulative", "depth"} of
+            every import, times in seconds.
+    """
+
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append(
+            {
+                "module": name.strip(),
+                "self": int(self_us) / 1e6,
+                "cumulative": int(cumulative_us) / 1e6,
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            }
+        )
+    return imports
+
+
+def measure() -> dict[str, any]:
+    """Create the app in a fresh interpreter.
+
+    Returns:
+        dict[str, any]: {"seconds" (create_app including imports),
+            "modules" (imported after create_app), "imports"
+            (see _parse_importtime)}.
+    """
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _SNIPPET],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(process.stdout.splitlines()[-1])
+    result["imports"] = _parse_importtime(process.stderr)
+    return result
+
+
+def main(argv: list[str] = None) -> int:
+    """Report the cold start.
+
+    Args:
+        argv (list[str]): Command line arguments.
+
+    Returns:
+        int: 0, or 1 when the cold start is over the budget.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--top", type=int, default=20, help="Number of imports to show"
+    )
+    parser.add_argument(
+        "--budget", type=float, default=get_budget(),
+        help="Allowed seconds until the app is created",
+    )
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    result = measure()
+    print(f'{"module":<48}{"self":>10}{"cumulative":>12}')
+    slowest = sorted(result["imports"], key=lambda item: -item["cumulative"])
+    for item in slowest[: args.top]:
+        module = "  " * item["depth"] + item["module"]
+        print(
+            f"{module:<48}{item['self'] * 1000:>8.1f}ms"
+            f"{item['cumulative'] * 1000:>10.1f}ms"
+        )
+    print(
+        f'create_app: {result["seconds"] * 1000:.1f}ms, '
+        f'budget {args.budget * 1000:.0f}ms, {len(result["modules"])} modules.'
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+    if result["seconds"] > args.budget:
+        print("REGRESSION create_app is over the cold start budget.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
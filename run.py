@@ -2,8 +2,10 @@
 """
 
 import argparse
+import multiprocessing
 
 from app import create_app
+from app.serving import serve
 from flask_cors import CORS
 
 app = create_app()
@@ -13,7 +15,49 @@ CORS(app, resources={r"/*": {"origins": "http://localhost:5173"}})
 # Use debug mode or not.
 parser = argparse.ArgumentParser()
 parser.add_argument("--debug", action="store_true", help="Use debug mode")
+parser.add_argument(
+    "--server",
+    choices=("development", "production"),
+    default="development",
+    help="Development server, or pre-forked workers with thread pools",
+)
+parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+parser.add_argument("--port", type=int, default=5000, help="Port to bind")
+parser.add_argument(
+    "--workers",
+    type=int,
+    help="Worker processes, defaults to 1. Every worker has its own background "
+    "jobs and metrics, so async requests and /metrics need a single worker",
+)
+parser.add_argument(
+    "--threads", type=int, default=8, help="Threads of every worker"
+)
+parser.add_argument(
+    "--keep-alive",
+    type=float,
+    default=5,
+    help="Seconds an idle connection is kept open",
+)
+parser.add_argument(
+    "--graceful-timeout",
+    type=float,
+    default=30,
+    help="Seconds workers get to finish requests on shutdown and reload",
+)
 
 if __name__ == "__main__":
+    # Process pools need this in a PyInstaller bundle.
+    multiprocessing.freeze_support()
     args = parser.parse_args()
-    app.run(debug=args.debug)
+    if args.server == "production":
+        serve(
+            app,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            threads=args.threads,
+            keep_alive=args.keep_alive,
+            graceful_timeout=args.graceful_timeout,
+        )
+    else:
+        app.run(debug=args.debug, host=args.host, port=args.port)
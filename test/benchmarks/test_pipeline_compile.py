@@ -0,0 +1,82 @@
+"""Test /benchmark"""
+
+import itertools
+import os
+import shutil
+import unittest
+
+import yaml
+
+from app.services.nodeData import deserialize
+from app.services.pipeline_graph import PipelineGraph
+from app.services.pipeline_schema import get_version
+from benchmark.generate import SHAPES, VERSIONS, generate_pipeline
+from benchmark.pipeline_compile import compare, run_case
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test the pipeline generator and the benchmark."""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+        self.__pipeline = os.path.join(self.__folder, "pipeline.yaml")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def test_generate_pipeline(self) -> None:
+        """Test generated pipelines are connected DAGs."""
+
+        for shape, version in itertools.product(SHAPES, VERSIONS):
+            generate_pipeline(self.__pipeline, shape, 50, version=version)
+            graph = PipelineGraph(deserialize(self.__pipeline))
+            self.assertEqual(50, len(graph.nodes))
+            self.assertIsNone(graph.find_cycle())
+            self.assertEqual([], graph.dangling_ports())
+            self.assertEqual(
+                49, sum(1 for node in graph.nodes[1:] if node.input_port)
+            )
+
+        generate_pipeline(self.__pipeline, "chain", 0)
+        self.assertEqual([], deserialize(self.__pipeline))
+
+        with self.assertRaises(ValueError):
+            generate_pipeline(self.__pipeline, "star", 10)
+        with self.assertRaises(ValueError):
+            generate_pipeline(self.__pipeline, "chain", 10, version=3)
+
+    def test_generate_version_1(self) -> None:
+        """Test the default layout is the one of data/pipeline.yaml."""
+
+        generate_pipeline(self.__pipeline, "chain", 3)
+        with open(self.__pipeline, "r", encoding="utf-8") as file:
+            entries = yaml.safe_load(file)
+        with open("data/pipeline.yaml", "r", encoding="utf-8") as file:
+            expected = yaml.safe_load(file)
+        self.assertEqual(1, get_version(entries[0]))
+        self.assertEqual(
+            [sorted(entry) for entry in expected],
+            [sorted(entry) for entry in entries],
+        )
+
+    def test_run_case_and_compare(self) -> None:
+        """Test a case reports its metrics and regressions are detected."""
+
+        result = run_case("random", 20)
+        self.assertEqual(20, result["size"])
+        self.assertGreater(result["nodes_per_second"], 0)
+        self.assertGreater(result["output_size"], 0)
+
+        baseline = {"random-20-v1": dict(result)}
+        self.assertEqual([], compare([result], baseline, 0.2))
+
+        baseline["random-20-v1"]["nodes_per_second"] = (
+            result["nodes_per_second"] * 2
+        )
+        baseline["random-20-v1"]["output_size"] = 0
+        self.assertEqual(2, len(compare([result], baseline, 0.2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
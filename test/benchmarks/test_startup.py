@@ -0,0 +1,49 @@
+"""Test the cold start of the app."""
+
+import os
+import unittest
+from unittest import mock
+
+from benchmark.startup import (
+    COLD_START_BUDGET,
+    COLD_START_BUDGET_VARIABLE,
+    get_budget,
+    measure,
+)
+
+
+class TestStartup(unittest.TestCase):
+    """Test create_app stays cheap."""
+
+    def test_cold_start(self) -> None:
+        """Test create_app is within budget and defers the services."""
+
+        result = measure()
+        self.assertLess(result["seconds"], get_budget())
+        self.assertTrue(result["imports"])
+
+        modules = set(result["modules"])
+        self.assertIn("app.routes.pipeline_design", modules)
+        for deferred in (
+            "yaml",
+            "app.services.nodeData",
+            "app.services.project_serialization",
+            "app.services.configurators.factory",
+        ):
+            self.assertNotIn(deferred, modules)
+
+    def test_budget(self) -> None:
+        """Test the environment overrides the budget."""
+
+        with mock.patch.dict(os.environ, {COLD_START_BUDGET_VARIABLE: ""}):
+            self.assertEqual(COLD_START_BUDGET, get_budget())
+        with mock.patch.dict(os.environ, {COLD_START_BUDGET_VARIABLE: "2.5"}):
+            self.assertEqual(2.5, get_budget())
+        for value in ("fast", "0", "nan"):
+            with mock.patch.dict(os.environ, {COLD_START_BUDGET_VARIABLE: value}):
+                with self.assertRaises(ValueError):
+                    get_budget()
+
+
+if __name__ == "__main__":
+    unittest.main()
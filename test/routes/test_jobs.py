@@ -0,0 +1,84 @@
+"""Test /api/jobs APIs.
+"""
+
+import os
+import shutil
+import time
+import unittest
+
+from app import create_app
+
+
+class MyTestCase(unittest.TestCase):
+    """A test case."""
+
+    def setUp(self) -> None:
+        app = create_app()
+        app.config["TESTING"] = True
+        self.client = app.test_client()
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def __wait(self, job_id: str) -> dict:
+        for _ in range(500):
+            response = self.client.get(f"/api/jobs/{job_id}")
+            self.assertEqual(200, response.status_code)
+            job = response.get_json()
+            if job["status"] not in ("queued", "running"):
+                return job
+            time.sleep(0.01)
+        self.fail("Job didn't finish.")
+
+    def test_async_create_project(self) -> None:
+        """Test POST /api/project/create?async=true and GET /api/jobs/<id>"""
+
+        payload = {"path": self.__folder, "language": "Python"}
+        response = self.client.post("/api/project/create?async=true", json=payload)
+        self.assertEqual(202, response.status_code)
+        job = self.__wait(response.get_json()["job"])
+        self.assertEqual("succeeded", job["status"])
+        self.assertTrue(
+            os.path.isfile(
+                os.path.join(self.__folder, ".hlzcs/project_attributes.yaml")
+            )
+        )
+
+        payload["language"] = "JavaScript"
+        response = self.client.post("/api/project/create?async=1", json=payload)
+        job = self.__wait(response.get_json()["job"])
+        self.assertEqual("failed", job["status"])
+        self.assertEqual(
+            'Language and framework "JavaScript" are not supported.', job["error"]
+        )
+
+        # A finished job can't be cancelled.
+        response = self.client.delete(f"/api/jobs/{job['id']}")
+        self.assertEqual(409, response.status_code)
+
+    def test_async_compile(self) -> None:
+        """Test GET /api/pipeline/compile?async=true"""
+
+        pipeline = os.path.join(self.__folder, "pipeline.yaml")
+        output = os.path.join(self.__folder, "workflow.yaml")
+        with open(pipeline, "w", encoding="utf-8") as file:
+            file.write("[]")
+
+        api = f"/api/pipeline/compile?input={pipeline}&output={output}&async=true"
+        response = self.client.get(api)
+        self.assertEqual(202, response.status_code)
+        job = self.__wait(response.get_json()["job"])
+        self.assertEqual("succeeded", job["status"])
+        self.assertEqual(output, job["result"])
+
+    def test_unknown_job(self) -> None:
+        """Test unknown job ids."""
+
+        self.assertEqual(404, self.client.get("/api/jobs/unknown").status_code)
+        self.assertEqual(404, self.client.delete("/api/jobs/unknown").status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Test /metrics and /api/stats.
+"""
+
+import unittest
+
+from app import create_app
+
+# Routes import their services on first use, the fragment cache registers
+# its stats on import.
+import app.services.nodeData  # pylint: disable=unused-import
+
+
+class MyTestCase(unittest.TestCase):
+    """A test case."""
+
+    def setUp(self) -> None:
+        app = create_app()
+        app.config["TESTING"] = True
+        # Answer unhandled exceptions with 500 like in production.
+        app.config["PROPAGATE_EXCEPTIONS"] = False
+
+        @app.route("/broken")
+        def broken():
+            raise RuntimeError("broken")
+
+        self.client = app.test_client()
+
+    def test_metrics(self) -> None:
+        """Test GET /metrics"""
+
+        self.client.get("/api/project/languages")
+        self.client.get("/api/project/languages")
+        self.client.get("/api/project/frameworks")
+        self.client.get("/unknown/path")
+        self.assertEqual(500, self.client.get("/broken").status_code)
+
+        response = self.client.get("/metrics")
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        text = response.get_data(as_text=True)
+
+        labels = 'endpoint="/api/project/languages",method="GET"'
+        self.assertIn(
+            f"resiliflow_http_request_duration_seconds_count{{{labels}}} 2", text
+        )
+        self.assertIn(
+            f'resiliflow_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+            text,
+        )
+        self.assertIn(
+            f'resiliflow_http_requests_total{{{labels},status="200"}} 2', text
+        )
+        self.assertIn(
+            'resiliflow_http_requests_total{endpoint="/api/project/frameworks",'
+            'method="GET",status="400"} 1',
+            text,
+        )
+        self.assertIn(
+            'resiliflow_http_requests_total{endpoint="unmatched",'
+            'method="GET",status="404"} 1',
+            text,
+        )
+        self.assertIn(
+            'resiliflow_http_request_errors_total{endpoint="/broken",'
+            'method="GET"} 1',
+            text,
+        )
+        self.assertIn(f"resiliflow_http_requests_in_flight{{{labels}}} 0", text)
+        # The /metrics request itself is still being served.
+        self.assertIn(
+            'resiliflow_http_requests_in_flight{endpoint="/metrics",'
+            'method="GET"} 1',
+            text,
+        )
+        self.assertIn('resiliflow_stat{source="fragment_cache",name="hits"}', text)
+
+    def test_stats(self) -> None:
+        """Test GET /api/stats"""
+
+        self.client.get("/api/project/languages")
+        response = self.client.get("/api/stats")
+        self.assertEqual(200, response.status_code)
+        data = response.get_json()
+
+        route = data["routes"]["GET /api/project/languages"]
+        self.assertEqual(1, route["requests"])
+        self.assertEqual(0, route["errors"])
+        self.assertEqual({"200": 1}, route["statuses"])
+        self.assertIsNotNone(route["p50"])
+        self.assertIn("hit_ratio", data["stats"]["fragment_cache"])
+        self.assertIn("job_queue", data["stats"])
+
+
+if __name__ == "__main__":
+    unittest.main()
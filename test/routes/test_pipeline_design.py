@@ -0,0 +1,258 @@
+"""Test /api/pipeline APIs.
+"""
+
+import os
+import shutil
+import unittest
+
+import yaml
+
+from app import create_app
+from app.services import batch_compile
+
+
+class MyTestCase(unittest.TestCase):
+    """A test case."""
+
+    def setUp(self) -> None:
+        app = create_app()
+        app.config["TESTING"] = True
+        self.client = app.test_client()
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+        self.__input = os.path.join(self.__folder, "pipeline.yaml")
+        self.__output = os.path.join(self.__folder, "workflow.yaml")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def __write(self, entries: list[dict]) -> None:
+        with open(self.__input, "w", encoding="utf-8") as file:
+            yaml.dump(entries, file)
+
+    @staticmethod
+    def __entry(node_id: str, input_port: str, output_port: str) -> dict:
+        return {
+            "id": node_id,
+            "label": node_id,
+            "position": {"x": 0, "y": 0},
+            "__class": "pyTestNodeData",
+            "inputPort": input_port,
+            "outputPort": output_port,
+        }
+
+    def test_compile(self) -> None:
+        """Test GET /api/pipeline/compile"""
+
+        self.__write([
+            self.__entry("pytest_node", "python_env", ""),
+            self.__entry("setup_node", "", "python_env"),
+        ])
+        api = f"/api/pipeline/compile?input={self.__input}&output={self.__output}"
+        response = self.client.get(api)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.__output, response.get_json())
+        with open(self.__output, "r", encoding="utf-8") as file:
+            steps = yaml.safe_load(file)["jobs"]["build"]["steps"]
+        self.assertEqual(
+            ["setup_node", "pytest_node"], [step["name"] for step in steps[1:]]
+        )
+
+        # Cycle
+        self.__write([
+            self.__entry("node_a", "b", "a"),
+            self.__entry("node_b", "a", "b"),
+        ])
+        response = self.client.get(api)
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(
+            ["node_a", "node_b", "node_a"], response.get_json()["cycle"]
+        )
+
+    def test_compile_missing_fields(self) -> None:
+        """Test GET /api/pipeline/compile without input or output"""
+
+        for api in [
+            f"/api/pipeline/compile?output={self.__output}",
+            f"/api/pipeline/compile?input={self.__input}",
+        ]:
+            response = self.client.get(api)
+            self.assertEqual(400, response.status_code)
+            self.assertIn("Missing field", response.get_json()["error"])
+
+    def test_compile_target(self) -> None:
+        """Test GET /api/pipeline/compile with a target"""
+
+        self.__write([self.__entry("setup_node", "", "python_env")])
+        api = f"/api/pipeline/compile?input={self.__input}&output={self.__output}"
+        response = self.client.get(api + "&target=gitlab")
+        self.assertEqual(200, response.status_code)
+        with open(self.__output, "r", encoding="utf-8") as file:
+            self.assertIn("build", yaml.safe_load(file))
+
+        response = self.client.get(api + "&target=jenkins")
+        self.assertEqual(400, response.status_code)
+
+    def test_compile_targets(self) -> None:
+        """Test GET /api/pipeline/targets and POST /api/pipeline/compile/targets"""
+
+        response = self.client.get("/api/pipeline/targets")
+        self.assertEqual(200, response.status_code)
+        self.assertIn(
+            {"target": "makefile", "file": "Makefile"},
+            response.get_json()["targets"],
+        )
+
+        self.__write([self.__entry("setup_node", "", "python_env")])
+        api = "/api/pipeline/compile/targets"
+        payload = {
+            "input": self.__input,
+            "folder": self.__folder,
+            "targets": ["gitlab", "shell"],
+        }
+        response = self.client.post(api, json=payload)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {
+                "gitlab": os.path.join(self.__folder, ".gitlab-ci.yml"),
+                "shell": os.path.join(self.__folder, "pipeline.sh"),
+            },
+            response.get_json(),
+        )
+
+        payload["targets"] = ["jenkins"]
+        response = self.client.post(api, json=payload)
+        self.assertEqual(400, response.status_code)
+        response = self.client.post(api, json={"input": self.__input})
+        self.assertEqual(400, response.status_code)
+
+    def test_compile_batch(self) -> None:
+        """Test POST /api/pipeline/compile/batch"""
+
+        self.__write([self.__entry("setup_node", "", "python_env")])
+        api = "/api/pipeline/compile/batch"
+        items = [
+            {"input": self.__input, "output": self.__output},
+            {"input": self.__input + "a", "output": self.__output + "a"},
+        ]
+        response = self.client.post(api, json={"items": items})
+        self.assertEqual(200, response.status_code)
+        results = response.get_json()["results"]
+        self.assertEqual(self.__output, results[0]["file"])
+        self.assertIn("error", results[1])
+
+        response = self.client.post(api, json={})
+        self.assertEqual(400, response.status_code)
+
+        response = self.client.post(
+            api, json={"items": items * (batch_compile.MAX_ITEMS // 2 + 1)}
+        )
+        self.assertEqual(400, response.status_code)
+
+    def test_check(self) -> None:
+        """Test GET /api/pipeline/check"""
+
+        self.__write([
+            self.__entry("setup_node", "", "python_env"),
+            self.__entry("pytest_node", "dependencies_installed", ""),
+        ])
+        response = self.client.get(f"/api/pipeline/check?input={self.__input}")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {
+                "cycle": None,
+                "dangling": [
+                    {"node": "pytest_node", "port": "dependencies_installed"}
+                ],
+            },
+            response.get_json(),
+        )
+
+        response = self.client.get(f"/api/pipeline/check?input={self.__input}a")
+        self.assertEqual(404, response.status_code)
+
+        response = self.client.get("/api/pipeline/check")
+        self.assertEqual(400, response.status_code)
+
+        # Not a list of nodes, not yaml.
+        for content in ["id: setup_node\n", "- [unclosed\n"]:
+            with open(self.__input, "w", encoding="utf-8") as file:
+                file.write(content)
+            response = self.client.get(f"/api/pipeline/check?input={self.__input}")
+            self.assertEqual(400, response.status_code)
+            self.assertIn(self.__input, response.get_json()["error"])
+
+    def test_validate_migrate(self) -> None:
+        """Test /api/pipeline/validate and /api/pipeline/migrate"""
+
+        entry = self.__entry("a", "", "port")
+        entry.pop("position")
+        self.__write([entry, self.__entry("b", "port", ""), "c"])
+        response = self.client.get(f"/api/pipeline/validate?input={self.__input}")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [0, 2], [error["index"] for error in response.get_json()["errors"]]
+        )
+
+        response = self.client.get(f"/api/pipeline/check?input={self.__input}")
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(2, len(response.get_json()["errors"]))
+
+        response = self.client.post(
+            "/api/pipeline/migrate", json={"input": self.__input}
+        )
+        self.assertEqual(400, response.status_code)
+
+        self.__write(
+            [{"id": "a", "action": "pyTest", "x": 0, "y": 0, "outputPort": []}]
+        )
+        response = self.client.post(
+            "/api/pipeline/migrate", json={"input": self.__input}
+        )
+        self.assertEqual(200, response.status_code)
+        with open(self.__input, "r", encoding="utf-8") as file:
+            self.assertEqual("pyTestNodeData", yaml.safe_load(file)[0]["__class"])
+        response = self.client.get(f"/api/pipeline/validate?input={self.__input}")
+        self.assertEqual({"errors": []}, response.get_json())
+
+        response = self.client.get("/api/pipeline/validate?input=missing.yaml")
+        self.assertEqual(404, response.status_code)
+
+    def test_execute(self) -> None:
+        """Test POST /api/pipeline/execute"""
+
+        self.__write([
+            self.__entry("pytest_node", "python_env", ""),
+            self.__entry("setup_node", "", "python_env"),
+        ])
+        api = "/api/pipeline/execute"
+        response = self.client.post(api, json={"input": self.__input})
+        self.assertEqual(200, response.status_code)
+        report = response.get_json()
+        self.assertTrue(report["succeeded"])
+        self.assertEqual(
+            ["setup_node", "pytest_node"],
+            [node["id"] for node in report["nodes"]],
+        )
+
+        for field, value in [
+            ("policy", "retry"),
+            ("policy", 1),
+            ("workers", "4"),
+            ("workers", True),
+            ("workers", 0),
+        ]:
+            response = self.client.post(
+                api, json={"input": self.__input, field: value}
+            )
+            self.assertEqual(400, response.status_code)
+
+        response = self.client.post(api, json={"input": self.__input + "a"})
+        self.assertEqual(404, response.status_code)
+
+        response = self.client.post(api, json={})
+        self.assertEqual(400, response.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
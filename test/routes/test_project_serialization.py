@@ -65,6 +65,31 @@ class MyTestCase(unittest.TestCase):
         response = self.client.get(api)
         self.assertEqual(400, response.status_code)
 
+    def test_metadata_caching(self) -> None:
+        """Test ETag, Cache-Control and 304 of the metadata APIs"""
+
+        apis = [
+            "/api/project/languages",
+            "/api/project/frameworks?language=Python",
+            "/api/project/configurations/supported?language=Python&framework=Flask",
+        ]
+        etags = set()
+        for api in apis:
+            response = self.client.get(api)
+            self.assertEqual(200, response.status_code)
+            self.assertIn("no-cache", response.headers["Cache-Control"])
+            etag, weak = response.get_etag()
+            self.assertFalse(weak)
+            etags.add(etag)
+
+            response = self.client.get(api, headers={"If-None-Match": f'"{etag}"'})
+            self.assertEqual(304, response.status_code)
+            self.assertEqual(b"", response.get_data())
+
+            response = self.client.get(api, headers={"If-None-Match": '"stale"'})
+            self.assertEqual(200, response.status_code)
+        self.assertEqual(3, len(etags))
+
     def test_get_initialized_configuration(self) -> None:
         """Test GET /api/project/configurations/initialized"""
 
@@ -130,6 +155,29 @@ class MyTestCase(unittest.TestCase):
         response = self.client.get(api)
         self.assertEqual(400, response.status_code)
 
+    def test_index_workspace(self) -> None:
+        """Test GET /api/project/workspace"""
+
+        self.client.application.config["WORKSPACE_INDEX_PATH"] = os.path.join(
+            self.__folder, "index.json"
+        )
+        project = os.path.join(self.__folder, "workspace", "project")
+        os.makedirs(project)
+        payload = {"path": project, "language": "Python"}
+        self.client.post("/api/project/create", json=payload)
+
+        api = f"/api/project/workspace?root={self.__folder}/workspace"
+        response = self.client.get(api)
+        self.assertEqual(200, response.status_code)
+        projects = response.get_json()["projects"]
+        self.assertEqual([os.path.abspath(project)], [p["path"] for p in projects])
+        self.assertEqual("Python", projects[0]["attributes"]["language"])
+
+        response = self.client.get(f"/api/project/workspace?root={self.__folder}a")
+        self.assertEqual(400, response.status_code)
+        response = self.client.get("/api/project/workspace")
+        self.assertEqual(400, response.status_code)
+
     def test_create_project(self) -> None:
         """Test /api/project/create"""
 
@@ -179,6 +227,34 @@ class MyTestCase(unittest.TestCase):
         response = self.client.post(api, json=payload)
         self.assertEqual(400, response.status_code)
 
+    def test_create_projects(self) -> None:
+        """Test /api/project/create/bulk"""
+
+        api = "/api/project/create/bulk"
+        paths = [os.path.join(self.__folder, name) for name in ("a", "b")]
+        for path in paths:
+            os.mkdir(path)
+        payload = {
+            "projects": [
+                {"path": paths[0], "language": "Python"},
+                {"path": paths[1], "language": "JavaScript"},
+            ]
+        }
+        response = self.client.post(api, json=payload)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, response.get_json()["created"])
+        self.assertEqual(
+            ["created", "failed"],
+            [result["status"] for result in response.get_json()["results"]],
+        )
+        self.assertTrue(
+            os.path.isfile(
+                os.path.join(paths[0], ".hlzcs", "project_attributes.yaml")
+            )
+        )
+
+        response = self.client.post(api, json={"items": []})
+        self.assertEqual(400, response.status_code)
 
 if __name__ == "__main__":
     unittest.main()
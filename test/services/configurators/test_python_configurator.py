@@ -1,5 +1,6 @@
 """Test services.configurators.python_configurator"""
 
+import ast
 import os
 import shutil
 import unittest
@@ -138,6 +139,15 @@ class TestFlaskConfigurator(unittest.TestCase):
             FlaskConfigurator.get_initialized_configurations(self.__folder),
         )
 
+        # Reported once however many .py files there are.
+        for name in ("a.py", "b.py"):
+            with open(os.path.join(self.__folder, name), "w", encoding="utf-8"):
+                pass
+        self.assertEqual(
+            ["starter code"],
+            FlaskConfigurator.get_initialized_configurations(self.__folder),
+        )
+
     def test_get_serialize_data(self) -> None:
         """Test"""
 
@@ -177,6 +187,42 @@ class TestFlaskConfigurator(unittest.TestCase):
             os.path.isdir(os.path.join(self.__folder, "app", "services"))
         )
 
+    def test_build_starter_code_variables(self) -> None:
+        """Test"""
+
+        self.__attributes["starter code"] = {"package_name": "demo", "port": 8080}
+        FlaskConfigurator(self.__attributes).build_configurations()
+        with open(
+            os.path.join(self.__folder, "run.py"), "r", encoding="utf-8"
+        ) as file:
+            content = file.read()
+        self.assertIn("from demo import create_app", content)
+        self.assertIn("app.run(port=8080, debug=True)", content)
+        self.assertTrue(
+            os.path.isdir(os.path.join(self.__folder, "demo", "routes"))
+        )
+
+        # Any project name keeps run.py valid.
+        name = 'say """hi"""\\ \n\'bye\''
+        self.__attributes["starter code"] = {"project_name": name}
+        FlaskConfigurator(self.__attributes).build_configurations()
+        with open(
+            os.path.join(self.__folder, "run.py"), "r", encoding="utf-8"
+        ) as file:
+            module = ast.parse(file.read())
+        self.assertEqual(f"{name}, a Flask app.", ast.get_docstring(module))
+
+        for variables in [
+            "demo",
+            {"package_name": "class"},
+            {"port": 0},
+            {"port": "80"},
+            {"host": "localhost"},
+        ]:
+            self.__attributes["starter code"] = variables
+            with self.assertRaises(ValueError):
+                FlaskConfigurator(self.__attributes)
+
 
 if __name__ == "__main__":
     unittest.main()
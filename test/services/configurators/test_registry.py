@@ -0,0 +1,100 @@
+"""Test ConfiguratorRegistry"""
+
+import unittest
+from unittest import mock
+
+from app.services.configurators import configurator
+from app.services.configurators.factory import ConfiguratorFactory
+from app.services.configurators.python_configurator import (
+    PythonConfigurator,
+    FlaskConfigurator,
+)
+from app.services.configurators.registry import ConfiguratorRegistry, registry
+
+
+class MyTestCase(unittest.TestCase):
+    """Test"""
+
+    def test_builtin_configurators(self) -> None:
+        """Test built-in configurators register themselves."""
+
+        self.assertIs(PythonConfigurator, registry.get("Python"))
+        self.assertIs(FlaskConfigurator, registry.get("Python", "Flask"))
+        self.assertIsNone(registry.get("Python", "Django"))
+        self.assertEqual(("Python",), registry.languages())
+        self.assertEqual(("Flask",), registry.frameworks("Python"))
+        # Languages aren't matched by substring any more.
+        self.assertEqual((), registry.frameworks("Py"))
+        self.assertEqual((), ConfiguratorFactory.get_supported_frameworks("Py"))
+
+    def test_configurations_are_copied(self) -> None:
+        """Test the indexes can't be changed through results."""
+
+        with self.assertRaises(TypeError):
+            registry.configurations("Python")["new"] = None
+
+        configurations = ConfiguratorFactory.get_configurations("Python")
+        configurations["new"] = None
+        self.assertNotIn("new", ConfiguratorFactory.get_configurations("Python"))
+
+    def test_subclass_registration(self) -> None:
+        """Test subclasses with a language register and duplicates fail."""
+
+        test_registry = ConfiguratorRegistry()
+        with mock.patch.object(configurator, "registry", test_registry):
+
+            class RustConfigurator(configurator.Configurator, language="Rust"):
+                """A test configurator."""
+
+                def build_configurations(self) -> None:
+                    pass
+
+            class AxumConfigurator(
+                RustConfigurator, language="Rust", framework="Axum"
+            ):
+                """A test configurator."""
+
+            # Subclasses without a language aren't registered.
+            class _Helper(RustConfigurator):
+                pass
+
+            self.assertEqual(("Rust",), test_registry.languages())
+            self.assertEqual(("Axum",), test_registry.frameworks("Rust"))
+            fingerprint = test_registry.fingerprint()
+            self.assertIs(AxumConfigurator, test_registry.get("Rust", "Axum"))
+
+            # Registering after a query rebuilds the indexes.
+            class ActixConfigurator(
+                RustConfigurator, language="Rust", framework="Actix"
+            ):
+                """A test configurator."""
+
+            self.assertEqual(("Actix", "Axum"), test_registry.frameworks("Rust"))
+            self.assertNotEqual(fingerprint, test_registry.fingerprint())
+            with self.assertRaises(ValueError):
+                test_registry.register(ActixConfigurator, "Rust", "Axum")
+
+    def test_plugins(self) -> None:
+        """Test plugins load lazily and broken ones are skipped."""
+
+        good = mock.Mock()
+        good.load.side_effect = lambda: test_registry.register(
+            PythonConfigurator, "Plugin"
+        )
+        broken = mock.Mock()
+        broken.name = "broken"
+        broken.load.side_effect = ImportError("broken")
+
+        test_registry = ConfiguratorRegistry(group="test.configurators")
+        with mock.patch(
+            "importlib.metadata.entry_points", return_value=[broken, good]
+        ) as entry_points:
+            entry_points.assert_not_called()
+            with self.assertLogs(level="ERROR"):
+                self.assertEqual(("Plugin",), test_registry.languages())
+            self.assertEqual(("Plugin",), test_registry.languages())
+            entry_points.assert_called_once_with(group="test.configurators")
+
+
+if __name__ == "__main__":
+    unittest.main()
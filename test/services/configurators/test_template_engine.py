@@ -0,0 +1,137 @@
+"""Test template_engine"""
+
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from app.services.configurators import template_engine
+from app.services.configurators.template_engine import get_manifest, materialize
+
+
+class TestTemplateEngine(unittest.TestCase):
+    """Test get_manifest and materialize"""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        self.__template = os.path.abspath(os.path.join(self.__folder, "template"))
+        self.__project = os.path.join(self.__folder, "project")
+        os.makedirs(os.path.join(self.__template, "app", "__pycache__"))
+        os.makedirs(self.__project)
+        self.__write(os.path.join(self.__template, "run.py"), "run")
+        self.__write(os.path.join(self.__template, "app", "__init__.py"), "app")
+        self.__write(
+            os.path.join(self.__template, "app", "__pycache__", "x.pyc"), ""
+        )
+        get_manifest.cache_clear()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+        get_manifest.cache_clear()
+
+    @staticmethod
+    def __write(path: str, content: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def __read(self, path: str) -> str:
+        with open(os.path.join(self.__project, path), "r", encoding="utf-8") as file:
+            return file.read()
+
+    def test_get_manifest(self) -> None:
+        """Test files are listed once with their hashes."""
+
+        manifest = get_manifest(self.__template)
+        self.assertEqual(("app",), manifest.directories)
+        self.assertEqual(
+            ["run.py", os.path.join("app", "__init__.py")],
+            [file.path for file in manifest.files],
+        )
+        self.assertEqual(3, manifest.files[0].size)
+        self.assertIs(manifest, get_manifest(self.__template))
+
+        with self.assertRaises(NotADirectoryError):
+            get_manifest(self.__template + "a")
+
+    def test_materialize(self) -> None:
+        """Test copies are reported and identical files are skipped."""
+
+        init = os.path.join("app", "__init__.py")
+        report = materialize(self.__template, self.__project)
+        self.assertEqual(
+            {"created": ["run.py", init], "updated": [], "unchanged": []}, report
+        )
+        self.assertEqual("run", self.__read("run.py"))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.__project, "app", "__pycache__"))
+        )
+
+        self.__write(os.path.join(self.__project, "run.py"), "changed")
+        report = materialize(self.__template, self.__project)
+        self.assertEqual(
+            {"created": [], "updated": ["run.py"], "unchanged": [init]}, report
+        )
+        self.assertEqual("run", self.__read("run.py"))
+        self.assertEqual(
+            [], [name for name in os.listdir(self.__project) if name.endswith(".tmp")]
+        )
+
+        with self.assertRaises(NotADirectoryError):
+            materialize(self.__template, self.__project + "a")
+
+    def test_render(self) -> None:
+        """Test templates are compiled once and rendered per project."""
+
+        os.makedirs(os.path.join(self.__template, "{{package_name}}"))
+        self.__write(
+            os.path.join(self.__template, "{{package_name}}", "main.py.j2"),
+            "PORT = {{ port }}\n",
+        )
+        get_manifest.cache_clear()
+        main = os.path.join("pkg", "main.py")
+
+        report = materialize(
+            self.__template, self.__project, {"package_name": "pkg", "port": 80}
+        )
+        self.assertIn(main, report["created"])
+        self.assertEqual("PORT = 80\n", self.__read(main))
+
+        with mock.patch.object(
+            template_engine.jinja2.Environment, "compile"
+        ) as compile_template:
+            report = materialize(
+                self.__template, self.__project, {"package_name": "pkg", "port": 81}
+            )
+        compile_template.assert_not_called()
+        self.assertEqual([main], report["updated"])
+        self.assertEqual("PORT = 81\n", self.__read(main))
+
+        with self.assertRaises(ValueError):
+            materialize(self.__template, self.__project, {"port": 80})
+        with self.assertRaises(ValueError):
+            materialize(
+                self.__template, self.__project, {"package_name": "..", "port": 80}
+            )
+
+    def test_fallbacks(self) -> None:
+        """Test copies without kernel support and with hard links."""
+
+        with mock.patch.object(
+            template_engine, "_reflink", return_value=False
+        ), mock.patch.object(template_engine, "_copy_range", return_value=False):
+            materialize(self.__template, self.__project)
+        self.assertEqual("run", self.__read("run.py"))
+
+        shutil.rmtree(self.__project)
+        os.mkdir(self.__project)
+        materialize(self.__template, self.__project, link=True)
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.__template, "run.py"),
+                os.path.join(self.__project, "run.py"),
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""Test /app/services/attribute_cache.py"""
+
+import time
+import unittest
+
+from app.services.attribute_cache import AttributeCache
+
+
+class TestAttributeCache(unittest.TestCase):
+    """Test AttributeCache."""
+
+    def setUp(self) -> None:
+        self.__old = time.time_ns() - 10_000_000_000
+
+    def test_get_put(self) -> None:
+        """Test entries are copies checked against the version."""
+
+        cache = AttributeCache(2)
+        attributes = {"language": "Python", "list": [1]}
+        cache.put("a", (1, 2), attributes, self.__old)
+        attributes["list"].append(2)
+
+        cached = cache.get("a", (1, 2))
+        self.assertEqual({"language": "Python", "list": [1]}, cached)
+        cached["list"].append(3)
+        self.assertEqual([1], cache.get("a", (1, 2))["list"])
+        self.assertIsNone(cache.get("a", (1, 3)))
+
+        # Files changed just now may change again unnoticed.
+        cache.put("b", (1, 2), attributes, time.time_ns())
+        self.assertIsNone(cache.get("b", (1, 2)))
+
+        cache.discard("a")
+        self.assertIsNone(cache.get("a", (1, 2)))
+        self.assertEqual(
+            {"hits": 2, "misses": 3, "size": 0, "max_size": 2}, cache.info()
+        )
+
+    def test_eviction(self) -> None:
+        """Test the least recently used entries are evicted."""
+
+        cache = AttributeCache(2)
+        for path in ("a", "b", "c"):
+            cache.put(path, (), {}, self.__old)
+        self.assertIsNone(cache.get("a", ()))
+        self.assertEqual({}, cache.get("b", ()))
+
+        cache.resize(1)
+        self.assertIsNone(cache.get("c", ()))
+        self.assertEqual({}, cache.get("b", ()))
+
+        cache.resize(0)
+        cache.put("a", (), {}, self.__old)
+        self.assertEqual(0, cache.info()["size"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Test /app/services/batch_compile.py"""
+
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import yaml
+
+from app.services import batch_compile
+from app.services.batch_compile import compile_batch, shutdown_pool
+from app.services.pipelineDesign import Node, Position
+
+
+class TestCompileBatch(unittest.TestCase):
+    """Test compile_batch."""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutdown_pool()
+
+    def __pipeline(self, name: str, ports: list[tuple[str, str]]) -> str:
+        entries = []
+        for index, (input_port, output_port) in enumerate(ports):
+            node = Node(f"node_{index}", Position(index, 0), "pyTest")
+            node.label = node.id
+            node.input_port = input_port
+            node.output_port = output_port
+            entries.append(node.toDict())
+        path = os.path.join(self.__folder, name)
+        with open(path, "w", encoding="utf-8") as file:
+            yaml.dump(entries, file)
+        return path
+
+    def test_compile_batch(self) -> None:
+        """Test every item gets a result in order."""
+
+        valid = self.__pipeline("valid.yaml", [("a", ""), ("", "a")])
+        cycle = self.__pipeline("cycle.yaml", [("a", "b"), ("b", "a")])
+        items = [
+            {"input": valid, "output": os.path.join(self.__folder, "1.yaml")},
+            {"input": cycle, "output": os.path.join(self.__folder, "2.yaml")},
+            {"input": valid + "a", "output": os.path.join(self.__folder, "3.yaml")},
+            {"input": valid},
+            {"input": valid, "output": os.path.join(self.__folder, "1.yaml")},
+            "valid.yaml",
+        ]
+        results = compile_batch(items)
+
+        self.assertEqual(len(items), len(results))
+        self.assertEqual(items[0]["output"], results[0]["file"])
+        with open(items[0]["output"], "r", encoding="utf-8") as file:
+            steps = yaml.safe_load(file)["jobs"]["build"]["steps"]
+        self.assertEqual(["node_1", "node_0"], [step["name"] for step in steps[1:]])
+
+        self.assertEqual(
+            "Pipeline has a cycle: node_0 -> node_1 -> node_0.", results[1]["error"]
+        )
+        self.assertEqual(f"{valid}a do not exist", results[2]["error"])
+        self.assertEqual('Missing field "output".', results[3]["error"])
+        self.assertIn("duplicated", results[4]["error"])
+        self.assertIn("error", results[5])
+        for result in results[1:]:
+            self.assertNotIn("file", result)
+
+    def test_compile_batch_invalid_pipeline(self) -> None:
+        """Test an invalid pipeline doesn't break the other items."""
+
+        valid = self.__pipeline("valid.yaml", [("", "a"), ("a", "")])
+        invalid = os.path.join(self.__folder, "invalid.yaml")
+        with open(invalid, "w", encoding="utf-8") as file:
+            yaml.dump([{"id": "node_0", "__class": "pyTestNodeData"}], file)
+        items = [
+            {"input": valid, "output": os.path.join(self.__folder, "1.yaml")},
+            {"input": invalid, "output": os.path.join(self.__folder, "2.yaml")},
+            {"input": valid, "output": os.path.join(self.__folder, "3.yaml")},
+        ]
+        results = compile_batch(items)
+
+        self.assertEqual(items[0]["output"], results[0]["file"])
+        self.assertIn("Pipeline has 1 error(s)", results[1]["error"])
+        self.assertEqual(items[2]["output"], results[2]["file"])
+
+    def test_compile_batch_max_items(self) -> None:
+        """Test batches over MAX_ITEMS are refused."""
+
+        with mock.patch.object(batch_compile, "MAX_ITEMS", 1):
+            with self.assertRaises(ValueError):
+                compile_batch([{}, {}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Test /app/services/bulk_create.py"""
+
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from app.services import bulk_create
+from app.services.bulk_create import create_projects, shutdown_pool
+
+
+class TestCreateProjects(unittest.TestCase):
+    """Test create_projects."""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutdown_pool()
+
+    def test_create_projects(self) -> None:
+        """Test every project gets a status, in order."""
+
+        paths = []
+        for index in range(8):
+            paths.append(os.path.join(self.__folder, f"project_{index}"))
+            os.mkdir(paths[-1])
+        items = [
+            {
+                "path": path,
+                "language": "Python",
+                "framework": "Flask",
+                "starter code": {"port": 8000 + index},
+            }
+            for index, path in enumerate(paths)
+        ]
+        items += [
+            {"path": paths[0] + os.sep, "language": "Python"},
+            {"path": paths[0] + "a", "language": "Python"},
+            {"language": "Python"},
+            "project",
+        ]
+
+        report = create_projects(items)
+        self.assertEqual(8, report["created"])
+        self.assertEqual(4, report["failed"])
+        for path, result in zip(paths, report["results"]):
+            self.assertEqual({"path": path, "status": "created"}, result)
+            self.assertTrue(os.path.isfile(os.path.join(path, "run.py")))
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(path, ".hlzcs", "project_attributes.yaml")
+                )
+            )
+
+        duplicated, missing, no_path, not_object = report["results"][8:]
+        self.assertIn("is duplicated", duplicated["error"])
+        self.assertEqual(
+            f'Path "{paths[0]}a" does not exist.', missing["error"]
+        )
+        self.assertEqual(
+            {"path": None, "status": "failed", "error": 'Missing field "path".'},
+            no_path,
+        )
+        self.assertEqual("failed", not_object["status"])
+
+    def test_max_projects(self) -> None:
+        """Test large requests are refused."""
+
+        with mock.patch.object(bulk_create, "MAX_PROJECTS", 1):
+            with self.assertRaises(ValueError):
+                create_projects([{}, {}])
+
+
+if __name__ == "__main__":
+    unittest.main()
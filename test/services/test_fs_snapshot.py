@@ -0,0 +1,68 @@
+"""Test fs_snapshot"""
+
+import os
+import shutil
+import time
+import unittest
+from unittest import mock
+
+from app.services import fs_snapshot
+from app.services.fs_snapshot import clear_snapshots, scan_directory
+
+
+class TestScanDirectory(unittest.TestCase):
+    """Test scan_directory"""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+        os.mkdir(os.path.join(self.__folder, "app"))
+        for name in ("run.py", ".env"):
+            with open(os.path.join(self.__folder, name), "w", encoding="utf-8"):
+                pass
+        clear_snapshots()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def test_scan_directory(self) -> None:
+        """Test files and directories are told apart."""
+
+        snapshot = scan_directory(self.__folder)
+        self.assertEqual(os.path.abspath(self.__folder), snapshot.path)
+        self.assertEqual(frozenset(["run.py", ".env"]), snapshot.files)
+        self.assertEqual(frozenset(["app"]), snapshot.directories)
+        self.assertTrue(snapshot.has_file(".env"))
+        self.assertFalse(snapshot.has_file("app"))
+        self.assertTrue(snapshot.has_suffix(".py"))
+
+        with self.assertRaises(NotADirectoryError):
+            scan_directory(self.__folder + "A")
+        with self.assertRaises(NotADirectoryError):
+            scan_directory(os.path.join(self.__folder, "run.py"))
+
+    def test_cache(self) -> None:
+        """Test snapshots are reused until the directory changes."""
+
+        # Recently changed directories aren't cached.
+        first = scan_directory(self.__folder)
+        self.assertIsNot(first, scan_directory(self.__folder))
+
+        with mock.patch.object(fs_snapshot, "RACY_WINDOW_NS", -1):
+            first = scan_directory(self.__folder)
+            self.assertIs(first, scan_directory(self.__folder))
+
+            with open(os.path.join(self.__folder, ".gitignore"), "w", encoding="utf-8"):
+                pass
+            second = scan_directory(self.__folder)
+            self.assertTrue(second.has_file(".gitignore"))
+
+            # Setting the mtime back still invalidates the snapshot.
+            os.remove(os.path.join(self.__folder, ".gitignore"))
+            time.sleep(0.01)
+            os.utime(self.__folder, ns=(second.version[1], second.version[1]))
+            self.assertFalse(scan_directory(self.__folder).has_file(".gitignore"))
+
+
+if __name__ == "__main__":
+    unittest.main()
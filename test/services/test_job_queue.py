@@ -0,0 +1,83 @@
+"""Test /app/services/job_queue.py"""
+
+import threading
+import time
+import unittest
+
+from app.services.job_queue import Job, JobQueue, QueueFullError
+
+
+def wait_until_done(job: Job, timeout: float = 5) -> None:
+    """Wait for a job to stop."""
+
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test JobQueue."""
+
+    def test_submit(self) -> None:
+        """Test results and errors are recorded."""
+
+        jobs = JobQueue(workers=2)
+        job = jobs.submit("add", lambda a, b: a + b, 1, b=2)
+        self.assertIs(job, jobs.get(job.id))
+        wait_until_done(job)
+        self.assertEqual(Job.SUCCEEDED, job.status)
+        self.assertEqual(3, job.result)
+        self.assertIsNotNone(job.started)
+        self.assertIsNotNone(job.finished)
+
+        def fail():
+            raise ValueError("Something went wrong.")
+
+        job = jobs.submit("fail", fail)
+        wait_until_done(job)
+        self.assertEqual(Job.FAILED, job.status)
+        self.assertEqual("Something went wrong.", job.error)
+        self.assertIsNone(jobs.get("unknown"))
+
+    def test_queue_full_and_cancel(self) -> None:
+        """Test the queue is bounded and waiting jobs can be cancelled."""
+
+        release = threading.Event()
+        jobs = JobQueue(max_size=1, workers=1)
+        running = jobs.submit("block", release.wait)
+        while running.status != Job.RUNNING:
+            time.sleep(0.01)
+
+        waiting = jobs.submit("wait", lambda: "done")
+        with self.assertRaises(QueueFullError):
+            jobs.submit("overflow", lambda: None)
+        self.assertEqual(1, jobs.stats()["queued"])
+        self.assertEqual(1, jobs.stats()["running"])
+
+        self.assertFalse(jobs.cancel(running.id))
+        self.assertTrue(jobs.cancel(waiting.id))
+        self.assertEqual(Job.CANCELLED, waiting.status)
+        with self.assertRaises(KeyError):
+            jobs.cancel("unknown")
+
+        release.set()
+        wait_until_done(running)
+        after = jobs.submit("after", lambda: "done")
+        wait_until_done(after)
+        self.assertEqual(Job.CANCELLED, waiting.status)
+        self.assertIsNone(waiting.result)
+        self.assertEqual("done", after.result)
+
+    def test_forget_finished(self) -> None:
+        """Test only max_finished finished jobs are kept."""
+
+        jobs = JobQueue(workers=1, max_finished=2)
+        submitted = [jobs.submit("job", lambda: None) for _ in range(3)]
+        for job in submitted:
+            wait_until_done(job)
+        self.assertIsNone(jobs.get(submitted[0].id))
+        self.assertIsNotNone(jobs.get(submitted[2].id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,326 @@
+"""Test /app/services/nodeData.py"""
+
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import yaml
+
+from app.services import nodeData, sidecar
+from app.services.nodeData import (
+    compile,
+    deserialize,
+    deserialize_table,
+    iter_deserialize,
+    migrate,
+    _workflow,
+    _step,
+)
+from app.services.pipelineDesign import Node, Position
+from app.services.pipeline_schema import PipelineValidationError
+
+
+def create_node(node_id: str, action: str, label: str = None) -> Node:
+    """Create a node for testing."""
+
+    node = Node(node_id, Position(0, 0), action)
+    node.label = node_id if label is None else label
+    return node
+
+
+class TestDeserialize(unittest.TestCase):
+    """Test deserialize and iter_deserialize."""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+        self.__input = os.path.join(self.__folder, "pipeline.yaml")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def __write(self, content: str) -> None:
+        with open(self.__input, "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def test_deserialize(self) -> None:
+        """Test nodes are read in file order."""
+
+        setup_node = create_node("setup_node", "setup_environment")
+        setup_node.output_port = "python_env"
+        pytest_node = create_node("pytest_node", "pyTest", "Run tests")
+        pytest_node.input_port = "python_env"
+        self.__write(yaml.dump([setup_node.toDict(), pytest_node.toDict()]))
+
+        nodes = deserialize(self.__input)
+        self.assertEqual(
+            [setup_node.toDict(), pytest_node.toDict()],
+            [node.toDict() for node in nodes],
+        )
+
+    def test_iter_deserialize(self) -> None:
+        """Test nodes are yielded lazily."""
+
+        entries = [create_node(f"node_{i}", "pyTest").toDict() for i in range(3)]
+        self.__write(yaml.dump(entries) + "- broken\n")
+
+        nodes = iter_deserialize(self.__input)
+        self.assertEqual("node_0", next(nodes).id)
+        self.assertEqual("node_1", next(nodes).id)
+        self.assertEqual("node_2", next(nodes).id)
+        with self.assertRaises(PipelineValidationError):
+            next(nodes)
+
+    def test_deserialize_table(self) -> None:
+        """Test the file is read into columnar storage."""
+
+        entries = [create_node(f"node_{i}", "pyTest").toDict() for i in range(3)]
+        self.__write(yaml.dump(entries))
+
+        table = deserialize_table(self.__input)
+        self.assertEqual(["node_0", "node_1", "node_2"], table.ids)
+        self.assertEqual(
+            [node.toDict() for node in deserialize(self.__input)],
+            [node.toDict() for node in table],
+        )
+
+    def test_schema_versions(self) -> None:
+        """Test version 1 files are read and migrated."""
+
+        nodes = deserialize(os.path.join("data", "pipeline.yaml"))
+        self.assertEqual(
+            ["setup_node", "install_node", "pytest_node"],
+            [node.id for node in nodes],
+        )
+        self.assertEqual(["python_env"], nodes[1].input_port)
+        self.assertEqual("setup_node", nodes[0].label)
+
+        output = os.path.join(self.__folder, "migrated.yaml")
+        migrate(os.path.join("data", "pipeline.yaml"), output)
+        with open(output, "r", encoding="utf-8") as file:
+            entries = yaml.safe_load(file)
+        self.assertEqual([node.toDict() for node in nodes], entries)
+
+        # Nothing is written when any node is invalid.
+        self.__write(yaml.dump(entries[:1] + [{"id": 1}]))
+        with self.assertRaises(PipelineValidationError):
+            migrate(self.__input, output)
+        self.assertEqual(3, len(deserialize(output)))
+
+    def test_sidecar(self) -> None:
+        """Test pipelines in a project are loaded from their sidecar."""
+
+        os.makedirs(os.path.join(self.__folder, ".hlzcs"))
+        with open(
+            os.path.join(self.__folder, ".hlzcs", "project_attributes.yaml"),
+            "w",
+            encoding="utf-8",
+        ) as file:
+            file.write("language: Python\n")
+        os.mkdir(os.path.join(self.__folder, "pipelines"))
+        self.__input = os.path.join(self.__folder, "pipelines", "pipeline.yaml")
+        nodes = [create_node(f"node_{index}", "pyTest") for index in range(3)]
+        self.__write(yaml.dump([node.toDict() for node in nodes]))
+        path = os.path.join(
+            self.__folder, ".hlzcs", "sidecars", "pipelines", "pipeline.yaml.json"
+        )
+
+        # Stopping early doesn't leave a partial sidecar.
+        next(iter_deserialize(self.__input))
+        self.assertFalse(os.path.exists(path))
+
+        expected = [node.toDict() for node in nodes]
+        self.assertEqual(
+            expected, [node.toDict() for node in deserialize(self.__input)]
+        )
+        self.assertTrue(os.path.isfile(path))
+        with mock.patch.object(
+            nodeData, "_iter_yaml_entries", side_effect=AssertionError
+        ):
+            self.assertEqual(
+                expected, [node.toDict() for node in deserialize(self.__input)]
+            )
+            self.assertEqual(3, len(deserialize_table(self.__input)))
+
+            # Nodes are read from the sidecar one at a time.
+            with mock.patch.object(
+                sidecar.json, "loads", wraps=sidecar.json.loads
+            ) as loads:
+                next(iter_deserialize(self.__input))
+            self.assertEqual(1, loads.call_count)
+
+        # A broken sidecar falls back to the yaml in the same read.
+        with open(path, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(lines[:2] + ["{broken\n"] + lines[3:])
+        self.assertEqual(
+            expected, [node.toDict() for node in deserialize(self.__input)]
+        )
+        with open(path, "r", encoding="utf-8") as file:
+            self.assertEqual(lines, file.readlines())
+
+        # Edited pipelines are parsed again.
+        self.__write(yaml.dump(expected[:1]))
+        self.assertEqual(1, len(deserialize(self.__input)))
+        self.assertEqual(
+            ["pipeline.yaml.json"], os.listdir(os.path.dirname(path))
+        )
+
+    def test_empty_and_invalid(self) -> None:
+        """Test empty files and files that aren't lists."""
+
+        for content in ["", "[]", "~"]:
+            self.__write(content)
+            self.assertEqual([], deserialize(self.__input))
+
+        self.__write("id: setup_node")
+        with self.assertRaises(ValueError):
+            deserialize(self.__input)
+
+        with self.assertRaises(FileNotFoundError):
+            iter_deserialize(self.__input + "a")
+
+
+class TestCompile(unittest.TestCase):
+    """Test compile."""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+        self.__output = os.path.join(self.__folder, "workflow.yaml")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def test_compile_matches_workflow_dump(self) -> None:
+        """Test the compiled file equals dumping the whole workflow."""
+
+        nodes = [
+            create_node("setup_node", "setup_environment"),
+            create_node("long", "pyTest", "a very long label " * 10),
+            create_node("quoted", 'say "hi": now'),
+            create_node("number", "install_dependencies", "123"),
+            create_node("unicode", "pyTest", "测试 ünïcode"),
+            create_node("empty", "pyTest", ""),
+            create_node("multiline", "pyTest", "first\n    - second\n\nthird"),
+            create_node("repeated", "setup_environment", "setup_node"),
+        ]
+        compile(self.__output, nodes)
+
+        expected = yaml.dump(
+            _workflow([_step(node.label, node.action) for node in nodes]),
+            default_flow_style=False,
+        )
+        with open(self.__output, "r") as file:
+            self.assertEqual(expected, file.read())
+
+    def test_compile_skips_unchanged_output(self) -> None:
+        """Test the output is only rewritten when its content changes."""
+
+        nodes = [create_node("setup_node", "setup_environment")]
+        compile(self.__output, nodes)
+        os.utime(self.__output, ns=(0, 0))
+
+        compile(self.__output, nodes)
+        self.assertEqual(0, os.stat(self.__output).st_mtime_ns)
+
+        nodes.append(create_node("pytest_node", "pyTest"))
+        compile(self.__output, nodes)
+        self.assertNotEqual(0, os.stat(self.__output).st_mtime_ns)
+        with open(self.__output, "r") as file:
+            steps = yaml.safe_load(file)["jobs"]["build"]["steps"]
+        self.assertEqual(["setup_node", "pytest_node"],
+                         [step["name"] for step in steps[1:]])
+
+    def test_compile_streams_steps(self) -> None:
+        """Test steps are streamed in batches, in either order."""
+
+        nodes = [create_node(f"node_{index}", "pyTest") for index in range(5)]
+        nodes[0].input_port = "port"
+        nodes[4].output_port = "port"
+        expected = nodes[1:] + nodes[:1]
+        with mock.patch.object(nodeData, "_STREAM_BATCH_SIZE", 2):
+            compile(self.__output, iter(nodes))
+        with open(self.__output, "r") as file:
+            self.assertEqual(
+                yaml.dump(
+                    _workflow([_step(node.label, node.action) for node in expected]),
+                    default_flow_style=False,
+                ),
+                file.read(),
+            )
+
+        compile(self.__output, iter(nodes), order="file")
+        with open(self.__output, "r") as file:
+            steps = yaml.safe_load(file)["jobs"]["build"]["steps"]
+        self.assertEqual(
+            [node.id for node in nodes], [step["name"] for step in steps[1:]]
+        )
+
+        def broken():
+            yield nodes[0]
+            raise ValueError("broken")
+
+        # A failed compile keeps the previous file.
+        with self.assertRaises(ValueError):
+            compile(self.__output, broken(), order="file")
+        self.assertEqual(["workflow.yaml"], os.listdir(self.__folder))
+        with open(self.__output, "r") as file:
+            self.assertEqual(6, len(yaml.safe_load(file)["jobs"]["build"]["steps"]))
+
+        with self.assertRaises(ValueError):
+            compile(self.__output, nodes, order="random")
+
+    def test_compile_parallel(self) -> None:
+        """Test independent branches are compiled into separate jobs."""
+
+        setup_node = create_node("setup_node", "setup_environment")
+        setup_node.output_port = "python_env"
+        install_node = create_node("install_node", "install_dependencies")
+        install_node.input_port = "python_env"
+        install_node.output_port = "dependencies_installed"
+        pytest_node = create_node("pytest_node", "pyTest")
+        pytest_node.input_port = "dependencies_installed"
+        lint_node = create_node("lint node", "lint")
+        lint_node.input_port = "python_env"
+
+        compile(
+            self.__output,
+            [pytest_node, lint_node, install_node, setup_node],
+            parallel=True,
+        )
+        with open(self.__output, "r") as file:
+            jobs = yaml.safe_load(file)["jobs"]
+
+        self.assertEqual({"setup_node", "install_node", "lint_node"}, set(jobs))
+        self.assertNotIn("needs", jobs["setup_node"])
+        self.assertEqual(["setup_node"], jobs["install_node"]["needs"])
+        self.assertEqual(["setup_node"], jobs["lint_node"]["needs"])
+
+        # install_node and pytest_node form one chain.
+        steps = jobs["install_node"]["steps"]
+        self.assertEqual(
+            ["actions/checkout@v4", "actions/download-artifact@v4"],
+            [step["uses"] for step in steps[:2]],
+        )
+        self.assertEqual("setup_node-python_env", steps[1]["with"]["name"])
+        self.assertEqual(
+            ["install_node", "pytest_node"],
+            [step["name"] for step in steps[2:]],
+        )
+        upload = jobs["setup_node"]["steps"][-1]
+        self.assertEqual("actions/upload-artifact@v4", upload["uses"])
+        self.assertEqual("setup_node-python_env", upload["with"]["name"])
+
+    def test_compile_creates_folder(self) -> None:
+        """Test the output folder is created."""
+
+        output = os.path.join(self.__folder, "a", "workflow.yaml")
+        self.assertEqual(output, compile(output, []))
+        self.assertTrue(os.path.isfile(output))
+
+
+if __name__ == "__main__":
+    unittest.main()
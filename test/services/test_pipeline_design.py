@@ -0,0 +1,82 @@
+"""Test /app/services/pipelineDesign.py"""
+
+import unittest
+
+import yaml
+
+from app.services.pipelineDesign import Node, NodeTable, Position
+
+
+class TestNode(unittest.TestCase):
+    """Test Node and Position."""
+
+    def test_slots(self) -> None:
+        """Test nodes don't carry an instance dict."""
+
+        node = Node("setup_node", Position(0, 0), "setup_environment")
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertFalse(hasattr(node.position, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.unknown = 1
+
+
+class TestNodeTable(unittest.TestCase):
+    """Test NodeTable."""
+
+    def test_from_nodes(self) -> None:
+        """Test rows read back as the stored nodes."""
+
+        setup_node = Node("setup_node", Position(0, 1), "setup_environment")
+        setup_node.label = "Setup"
+        setup_node.output_port = "python_env"
+        pytest_node = Node("pytest_node", Position(2.5, 0), "pyTest")
+        pytest_node.input_port = ["python_env"]
+
+        table = NodeTable.from_nodes([setup_node, pytest_node])
+        self.assertEqual(2, len(table))
+        self.assertEqual(
+            [setup_node.toDict(), pytest_node.toDict()],
+            [node.toDict() for node in table],
+        )
+        self.assertEqual("pytest_node", table[-1].id)
+
+    def test_coordinate_types(self) -> None:
+        """Test coordinates read back with the type they were written with."""
+
+        entries = [
+            Node(f"node_{index}", Position(x, y), "pyTest").toDict()
+            for index, (x, y) in enumerate([(0, 1), (2, 2**40), (-3, 4)])
+        ]
+        table = NodeTable.from_nodes(
+            Node(entry["id"], Position(**entry["position"]), "pyTest")
+            for entry in entries
+        )
+        self.assertEqual("q", table.xs.typecode)
+        self.assertEqual(
+            yaml.safe_dump(entries), yaml.safe_dump([node.toDict() for node in table])
+        )
+
+        table = NodeTable()
+        table.append("node_0", 0.5, 1.5, "pyTest")
+        self.assertEqual("d", table.xs.typecode)
+        table.append("node_1", 2, 2**70, "pyTest")
+        table.append("node_2", True, "3", "pyTest")
+        self.assertEqual([0.5, 2, True], [node.position.x for node in table])
+        self.assertEqual([1.5, 2**70, "3"], [node.position.y for node in table])
+        self.assertIs(int, type(table[1].position.x))
+
+    def test_interning(self) -> None:
+        """Test repeated strings are stored once."""
+
+        table = NodeTable()
+        for index in range(2):
+            table.append(
+                f"node_{index}", index, 0, "".join(["py", "Test"]),
+                input_port="".join(["python", "_env"]),
+            )
+        self.assertIs(table.actions[0], table.actions[1])
+        self.assertIs(table.input_ports[0], table.input_ports[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
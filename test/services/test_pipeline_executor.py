@@ -0,0 +1,166 @@
+"""Test /app/services/pipeline_executor.py"""
+
+import threading
+import time
+import unittest
+
+from app.services.pipelineDesign import Node, Position
+from app.services.pipeline_executor import NodeResult, PipelineExecutor
+
+
+class TestPipelineExecutor(unittest.TestCase):
+    """Test PipelineExecutor."""
+
+    def setUp(self) -> None:
+        self.__events = []
+        self.__lock = threading.Lock()
+
+    def __node(self, node_id: str, input_port="", output_port="",
+               delay: float = 0, fail: bool = False) -> Node:
+        def action():
+            with self.__lock:
+                self.__events.append(("start", node_id))
+            time.sleep(delay)
+            if fail:
+                raise RuntimeError(f"{node_id} failed")
+            with self.__lock:
+                self.__events.append(("end", node_id))
+
+        node = Node(node_id, Position(0, 0), action)
+        node.input_port = input_port
+        node.output_port = output_port
+        return node
+
+    def __statuses(self, report) -> dict[str, str]:
+        return {result.node_id: result.status for result in report.results}
+
+    def test_dependencies(self) -> None:
+        """Test nodes start after the producers of their inputs end."""
+
+        nodes = [
+            self.__node("pytest_node", "dependencies_installed"),
+            self.__node("install_node", "python_env", "dependencies_installed"),
+            self.__node("setup_node", "", "python_env"),
+        ]
+        report = PipelineExecutor(max_workers=4).run(nodes)
+
+        self.assertTrue(report.succeeded)
+        self.assertEqual(
+            [
+                ("start", "setup_node"),
+                ("end", "setup_node"),
+                ("start", "install_node"),
+                ("end", "install_node"),
+                ("start", "pytest_node"),
+                ("end", "pytest_node"),
+            ],
+            self.__events,
+        )
+        for result in report.results:
+            self.assertGreaterEqual(result.duration, 0)
+            self.assertGreaterEqual(result.start, 0)
+
+    def test_parallelism(self) -> None:
+        """Test independent nodes run at the same time."""
+
+        nodes = [self.__node(f"node_{i}", delay=0.2) for i in range(4)]
+        report = PipelineExecutor(max_workers=4).run(nodes)
+        self.assertTrue(report.succeeded)
+        self.assertLess(report.duration, 0.6)
+
+    def test_fail_fast(self) -> None:
+        """Test a failure cancels nodes that haven't started."""
+
+        nodes = [
+            self.__node("broken_node", "", "a", fail=True),
+            self.__node("after_broken", "a"),
+            self.__node("slow_node", "", "b", delay=0.2),
+            self.__node("after_slow", "b"),
+        ]
+        report = PipelineExecutor(max_workers=2).run(nodes)
+
+        self.assertFalse(report.succeeded)
+        self.assertEqual(
+            {
+                "broken_node": NodeResult.FAILED,
+                "after_broken": NodeResult.SKIPPED,
+                "slow_node": NodeResult.SUCCEEDED,
+                "after_slow": NodeResult.CANCELLED,
+            },
+            self.__statuses(report),
+        )
+        self.assertIn("broken_node failed", report.results[0].error)
+
+    def test_continue_on_error(self) -> None:
+        """Test a failure only skips nodes depending on it."""
+
+        nodes = [
+            self.__node("broken_node", "", "a", fail=True),
+            self.__node("after_broken", "a", "c"),
+            self.__node("after_after", "c"),
+            self.__node("slow_node", "", "b", delay=0.1),
+            self.__node("after_slow", "b"),
+        ]
+        report = PipelineExecutor(
+            max_workers=2, policy=PipelineExecutor.CONTINUE
+        ).run(nodes)
+
+        self.assertEqual(
+            {
+                "broken_node": NodeResult.FAILED,
+                "after_broken": NodeResult.SKIPPED,
+                "after_after": NodeResult.SKIPPED,
+                "slow_node": NodeResult.SUCCEEDED,
+                "after_slow": NodeResult.SUCCEEDED,
+            },
+            self.__statuses(report),
+        )
+
+    def test_failure_timing(self) -> None:
+        """Test failed nodes aren't timed while they wait for a worker."""
+
+        nodes = [
+            self.__node("slow_node", delay=0.3),
+            self.__node("broken_node", fail=True),
+        ]
+        report = PipelineExecutor(
+            max_workers=1, policy=PipelineExecutor.CONTINUE
+        ).run(nodes)
+
+        broken = report.results[1]
+        self.assertEqual(NodeResult.FAILED, broken.status)
+        self.assertGreaterEqual(broken.start, 0.3)
+        self.assertLess(broken.duration, 0.1)
+
+    def test_processes(self) -> None:
+        """Test nodes naming their actions run in processes."""
+
+        setup_node = Node("setup_node", Position(0, 0), "setup_environment")
+        setup_node.output_port = "python_env"
+        pytest_node = Node("pytest_node", Position(1, 0), "pyTest")
+        pytest_node.input_port = "python_env"
+        unknown_node = Node("unknown_node", Position(2, 0), "unknown")
+
+        report = PipelineExecutor(
+            max_workers=2, use_processes=True, policy=PipelineExecutor.CONTINUE
+        ).run([setup_node, pytest_node, unknown_node])
+        self.assertEqual(
+            {
+                "setup_node": NodeResult.SUCCEEDED,
+                "pytest_node": NodeResult.SUCCEEDED,
+                "unknown_node": NodeResult.FAILED,
+            },
+            self.__statuses(report),
+        )
+
+    def test_invalid_arguments(self) -> None:
+        """Test invalid policies and pool sizes."""
+
+        with self.assertRaises(ValueError):
+            PipelineExecutor(policy="retry")
+        with self.assertRaises(ValueError):
+            PipelineExecutor(max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
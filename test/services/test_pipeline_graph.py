@@ -0,0 +1,109 @@
+"""Test /app/services/pipeline_graph.py"""
+
+import unittest
+
+from app.services.pipelineDesign import Node, Position
+from app.services.pipeline_graph import CycleError, PipelineGraph, get_ports
+
+
+def create_node(node_id: str, input_port="", output_port="") -> Node:
+    """Create a node for testing."""
+
+    node = Node(node_id, Position(0, 0), "pyTest")
+    node.input_port = input_port
+    node.output_port = output_port
+    return node
+
+
+class TestPipelineGraph(unittest.TestCase):
+    """Test PipelineGraph."""
+
+    def test_get_ports(self) -> None:
+        """Test get_ports."""
+
+        self.assertEqual((), get_ports(""))
+        self.assertEqual((), get_ports([]))
+        self.assertEqual(("a",), get_ports("a"))
+        self.assertEqual(("a", "b"), get_ports(["a", "", "b"]))
+
+    def test_topological_order(self) -> None:
+        """Test producers are ordered before consumers."""
+
+        nodes = [
+            create_node("pytest_node", "dependencies_installed"),
+            create_node("lint_node", "python_env"),
+            create_node("install_node", "python_env", "dependencies_installed"),
+            create_node("setup_node", "", ["python_env"]),
+        ]
+        graph = PipelineGraph(nodes)
+        self.assertEqual(
+            ["setup_node", "lint_node", "install_node", "pytest_node"],
+            [node.id for node in graph.topological_order()],
+        )
+        self.assertIsNone(graph.find_cycle())
+        self.assertEqual([], graph.dangling_ports())
+
+    def test_independent_nodes_keep_order(self) -> None:
+        """Test nodes without ports keep their order."""
+
+        nodes = [create_node(f"node_{i}") for i in range(5)]
+        self.assertEqual(nodes, PipelineGraph(nodes).topological_order())
+
+    def test_cycle(self) -> None:
+        """Test cycles are detected."""
+
+        nodes = [
+            create_node("setup_node", "", "a"),
+            create_node("node_b", ["a", "c"], "b"),
+            create_node("node_c", "b", "c"),
+        ]
+        graph = PipelineGraph(nodes)
+        self.assertEqual(["node_b", "node_c", "node_b"], graph.find_cycle())
+        with self.assertRaises(CycleError) as context:
+            graph.topological_order()
+        self.assertEqual(["node_b", "node_c", "node_b"], context.exception.cycle)
+
+        graph = PipelineGraph([create_node("self", "a", "a")])
+        self.assertEqual(["self", "self"], graph.find_cycle())
+
+    def test_dangling_ports(self) -> None:
+        """Test input ports without producers are reported."""
+
+        nodes = [
+            create_node("setup_node", "", "python_env"),
+            create_node("install_node", ["python_env", "cache"]),
+        ]
+        graph = PipelineGraph(nodes)
+        self.assertEqual([("install_node", "cache")], graph.dangling_ports())
+        self.assertEqual(2, len(graph.topological_order()))
+
+    def test_chains(self) -> None:
+        """Test nodes are split into chains at forks and joins."""
+
+        nodes = [
+            create_node("setup_node", "", "python_env"),
+            create_node("install_node", "python_env", "dependencies"),
+            create_node("pytest_node", "dependencies", "report"),
+            create_node("lint_node", "python_env", "lint"),
+            create_node("publish_node", ["report", "lint"]),
+        ]
+        self.assertEqual(
+            [[0], [1, 2], [3], [4]], PipelineGraph(nodes).chains()
+        )
+
+    def test_long_chain(self) -> None:
+        """Test long chains don't hit the recursion limit."""
+
+        nodes = [create_node("node_0", "", "port_0")]
+        nodes += [
+            create_node(f"node_{i}", f"port_{i - 1}", f"port_{i}")
+            for i in range(1, 20000)
+        ]
+        nodes.reverse()
+        graph = PipelineGraph(nodes)
+        self.assertEqual("node_0", graph.topological_order()[0].id)
+        self.assertIsNone(graph.find_cycle())
+
+
+if __name__ == "__main__":
+    unittest.main()
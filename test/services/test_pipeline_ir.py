@@ -0,0 +1,243 @@
+"""Test /app/services/pipeline_ir.py and /app/services/ci_backends.py"""
+
+import os
+import shutil
+import subprocess
+import unittest
+from unittest import mock
+
+import yaml
+
+from app.services import pipeline_ir
+from app.services.nodeData import compile, compile_targets
+from app.services.pipelineDesign import Node, Position
+from app.services.pipeline_ir import (
+    build_ir,
+    chain_name,
+    get_backend_file,
+    get_targets,
+    lower,
+)
+
+
+def create_node(node_id: str, action: str, input_port="", output_port="") -> Node:
+    """Create a node for testing."""
+
+    node = Node(node_id, Position(0, 0), action)
+    node.label = node_id
+    node.input_port = input_port
+    node.output_port = output_port
+    return node
+
+
+def create_nodes() -> list[Node]:
+    """Create a pipeline with two branches after a setup node."""
+
+    return [
+        create_node("pytest_node", "pyTest", "dependencies_installed"),
+        create_node("lint node", "lint", "python_env"),
+        create_node(
+            "install_node", "install $deps", "python_env", "dependencies_installed"
+        ),
+        create_node("setup_node", "setup_environment", "", "python_env"),
+    ]
+
+
+class TestBuildIR(unittest.TestCase):
+    """Test build_ir."""
+
+    def test_build_ir(self) -> None:
+        """Test steps are in run order and chains hand ports over."""
+
+        ir = build_ir(create_nodes())
+        self.assertEqual(
+            ["setup_node", "lint node", "install_node", "pytest_node"],
+            [step.id for step in ir.steps],
+        )
+        self.assertEqual(
+            ["setup_node", "lint_node", "install_node"],
+            [chain.name for chain in ir.chains],
+        )
+        self.assertEqual(((0, "python_env"),), ir.steps[2].imports)
+        self.assertEqual((), ir.steps[3].imports)
+        self.assertEqual(("python_env",), ir.chains[0].exports)
+        self.assertEqual((0,), ir.chains[2].needs)
+        self.assertEqual((2, 3), ir.chains[2].steps)
+
+    def test_hash(self) -> None:
+        """Test the hash only depends on the content of the pipeline."""
+
+        nodes = create_nodes()
+        self.assertEqual(build_ir(create_nodes()).hash, build_ir(nodes).hash)
+
+        nodes[0].action = "lint"
+        self.assertNotEqual(build_ir(create_nodes()).hash, build_ir(nodes).hash)
+
+    def test_chain_name(self) -> None:
+        """Test names are identifiers and unique."""
+
+        self.assertEqual("lint_node", chain_name("lint node", set()))
+        self.assertEqual("_1st", chain_name("1st", set()))
+        self.assertEqual("a-b_3", chain_name("a-b", {"a-b", "a-b_2"}))
+
+
+class TestLower(unittest.TestCase):
+    """Test lower and the backends."""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+        self.__output = os.path.join(self.__folder, "workflow.yaml")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def test_targets(self) -> None:
+        """Test the built-in targets."""
+
+        self.assertEqual(("github", "gitlab", "makefile", "shell"), get_targets())
+        self.assertEqual(".gitlab-ci.yml", get_backend_file("gitlab"))
+        with self.assertRaises(ValueError):
+            get_backend_file("jenkins")
+        with self.assertRaises(ValueError):
+            lower(build_ir([]), "jenkins")
+
+    def test_backend_imports(self) -> None:
+        """Test built-in backends are imported once, without the lock."""
+
+        backends = pipeline_ir._Backends(("app.services.ci_backends",))
+        with mock.patch.object(
+            pipeline_ir.importlib, "import_module",
+            side_effect=lambda module: self.assertFalse(backends._lock.locked()),
+        ) as import_module:
+            self.assertIsNone(backends.get("gitlab"))
+            backends.get("gitlab")
+        import_module.assert_called_once_with("app.services.ci_backends")
+
+    def test_lower_github_matches_compile(self) -> None:
+        """Test the github target equals the streamed github action."""
+
+        ir = build_ir(create_nodes())
+        for parallel in (False, True):
+            compile(self.__output, create_nodes(), parallel)
+            with open(self.__output, "r", encoding="utf-8") as file:
+                self.assertEqual(file.read(), lower(ir, "github", parallel))
+
+    def test_lowering_cache(self) -> None:
+        """Test a lowered file is reused for the same pipeline and target."""
+
+        ir = build_ir(create_nodes())
+        lower(ir, "gitlab", True)
+        hits = pipeline_ir._lowering_cache.info()["hits"]
+        self.assertEqual(
+            lower(ir, "gitlab", True), lower(build_ir(create_nodes()), "gitlab", True)
+        )
+        self.assertEqual(hits + 2, pipeline_ir._lowering_cache.info()["hits"])
+
+    def test_lower_gitlab(self) -> None:
+        """Test parallel jobs need the jobs producing their ports."""
+
+        jobs = yaml.safe_load(lower(build_ir(create_nodes()), "gitlab", True))
+        self.assertEqual(["build"], jobs.pop("stages"))
+        self.assertEqual({"setup_node", "lint_node", "install_node"}, set(jobs))
+        self.assertEqual(
+            ["ports/python_env"], jobs["setup_node"]["artifacts"]["paths"]
+        )
+        self.assertEqual(
+            [{"job": "setup_node", "artifacts": True}],
+            jobs["install_node"]["needs"],
+        )
+        self.assertEqual(
+            ["echo 'install $deps'", "echo pyTest"], jobs["install_node"]["script"]
+        )
+
+        jobs = yaml.safe_load(lower(build_ir(create_nodes()), "gitlab"))
+        self.assertEqual(4, len(jobs["build"]["script"]))
+
+    def test_lower_makefile(self) -> None:
+        """Test targets depend on the targets producing their ports."""
+
+        makefile = lower(build_ir(create_nodes()), "makefile", True)
+        self.assertIn("all: setup_node lint_node install_node\n", makefile)
+        self.assertIn("install_node: setup_node\n", makefile)
+        self.assertIn("\t@echo 'install $$deps'\n", makefile)
+
+    def test_lower_shell(self) -> None:
+        """Test the script is valid and runs every action."""
+
+        script = lower(build_ir(create_nodes()), "shell", True)
+        path = os.path.join(self.__folder, "pipeline.sh")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(script)
+        subprocess.run(["sh", "-n", path], check=True)
+        output = subprocess.run(
+            ["sh", path], check=True, capture_output=True, text=True
+        ).stdout.splitlines()
+        self.assertEqual("setup_environment", output[0])
+        self.assertEqual(
+            ["install $deps", "lint", "pyTest", "setup_environment"], sorted(output)
+        )
+
+    def test_reserved_names(self) -> None:
+        """Test jobs are renamed when targets reserve their names."""
+
+        nodes = [
+            create_node("stages", "setup_environment", "", "env"),
+            create_node("all", "lint", "env"),
+            create_node("setup-env", "pyTest", "env"),
+            create_node("echo", "install", "env"),
+        ]
+        nodes[1].label = "costs $HOME"
+        ir = build_ir(nodes)
+
+        jobs = yaml.safe_load(lower(ir, "gitlab", True))
+        self.assertEqual(["build"], jobs["stages"])
+        self.assertEqual(
+            [{"job": "stages_2", "artifacts": True}], jobs["all"]["needs"]
+        )
+
+        makefile = lower(ir, "makefile", True)
+        self.assertIn("all: stages all_2 setup-env echo\n", makefile)
+        self.assertIn("all_2: stages\n", makefile)
+        self.assertIn("\t# costs $$HOME\n", makefile)
+
+        script = lower(ir, "shell", True)
+        self.assertIn("job_setup_env() {", script)
+        path = os.path.join(self.__folder, "pipeline.sh")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(script)
+        subprocess.run(["sh", "-n", path], check=True)
+        output = subprocess.run(
+            ["sh", path], check=True, capture_output=True, text=True
+        ).stdout.splitlines()
+        self.assertEqual(
+            ["install", "lint", "pyTest", "setup_environment"], sorted(output)
+        )
+
+    def test_compile_target(self) -> None:
+        """Test compile and compile_targets emit other CI systems."""
+
+        compile(self.__output, create_nodes(), target="gitlab")
+        with open(self.__output, "r", encoding="utf-8") as file:
+            self.assertIn("build", yaml.safe_load(file))
+        with self.assertRaises(ValueError):
+            compile(self.__output, create_nodes(), target="jenkins")
+
+        outputs = compile_targets(
+            self.__folder, create_nodes(), ["github", "makefile"], True
+        )
+        self.assertEqual(
+            {
+                "github": os.path.join(
+                    self.__folder, ".github", "workflows", "pipeline.yml"
+                ),
+                "makefile": os.path.join(self.__folder, "Makefile"),
+            },
+            outputs,
+        )
+        for path in outputs.values():
+            self.assertTrue(os.path.isfile(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
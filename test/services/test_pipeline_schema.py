@@ -0,0 +1,119 @@
+"""Test /app/services/pipeline_schema.py"""
+
+import unittest
+from unittest import mock
+
+from app.services import pipeline_schema
+from app.services.pipeline_schema import (
+    PipelineValidationError,
+    compile_schema,
+    get_version,
+    iter_validate,
+    validate,
+)
+
+
+def entry_v1(node_id: str) -> dict:
+    """Create a version 1 entry."""
+
+    return {
+        "id": node_id,
+        "action": "pyTest",
+        "x": 1,
+        "y": 2.5,
+        "inputPort": [],
+        "outputPort": ["port"],
+    }
+
+
+def entry_v2(node_id: str) -> dict:
+    """Create a version 2 entry."""
+
+    return {
+        "id": node_id,
+        "label": node_id,
+        "position": {"x": 0, "y": 0},
+        "__class": "pyTestNodeData",
+        "inputPort": "",
+        "outputPort": "port",
+    }
+
+
+class TestPipelineSchema(unittest.TestCase):
+    """Test validating and migrating entries."""
+
+    def test_migrate(self) -> None:
+        """Test both versions are yielded in the current version."""
+
+        self.assertEqual(1, get_version(entry_v1("a")))
+        self.assertEqual(2, get_version(entry_v2("b")))
+        self.assertEqual(
+            [
+                {
+                    "id": "a",
+                    "label": "a",
+                    "position": {"x": 1, "y": 2.5},
+                    "__class": "pyTestNodeData",
+                    "inputPort": [],
+                    "outputPort": ["port"],
+                },
+                entry_v2("b"),
+            ],
+            list(iter_validate([entry_v1("a"), entry_v2("b")])),
+        )
+
+    def test_errors(self) -> None:
+        """Test every error is reported with its node index."""
+
+        missing = entry_v2("b")
+        missing.pop("__class")
+        missing["position"] = {"x": "0"}
+        wrong_port = entry_v1("c")
+        wrong_port["inputPort"] = "port"
+        entries = [entry_v2("a"), missing, wrong_port, "d", entry_v2("a"), True]
+
+        iterator = iter_validate(entries)
+        self.assertEqual("a", next(iterator)["id"])
+        with self.assertRaises(PipelineValidationError) as context:
+            next(iterator)
+        self.assertIsInstance(context.exception, ValueError)
+        self.assertEqual(7, context.exception.count)
+        self.assertEqual(
+            [
+                (1, "__class"),
+                (1, "position.x"),
+                (1, "position.y"),
+                (2, "inputPort"),
+                (3, None),
+                (4, "id"),
+                (5, None),
+            ],
+            [(error["index"], error["field"]) for error in validate(entries)],
+        )
+        self.assertIn(
+            'node 4: Id "a" is also used by node 0.', str(context.exception)
+        )
+        self.assertEqual([], validate([entry_v1("a"), entry_v2("b")]))
+
+    def test_max_errors(self) -> None:
+        """Test errors past MAX_ERRORS are only counted."""
+
+        with mock.patch.object(pipeline_schema, "MAX_ERRORS", 2):
+            with self.assertRaises(PipelineValidationError) as context:
+                list(iter_validate([1, 2, 3]))
+        self.assertEqual(3, context.exception.count)
+        self.assertEqual(2, len(context.exception.errors))
+        self.assertTrue(str(context.exception).endswith("1 more errors."))
+
+    def test_compile_schema(self) -> None:
+        """Test schemas with unknown types are refused."""
+
+        check = compile_schema({"a": {"type": "string", "required": True}})
+        self.assertEqual([], check({"a": "b"}))
+        self.assertEqual([("a", 'Missing field "a".')], check({}))
+        with self.assertRaises(ValueError):
+            compile_schema({"a": {"type": "date"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,9 +5,11 @@ Test /app/services/project_serialization.py
 import os
 import shutil
 import unittest
+from unittest import mock
 
 import yaml
 
+from app.services import attribute_cache, sidecar
 from app.services.project_serialization import ProjectSerializor
 
 
@@ -82,6 +84,67 @@ class MyTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             ProjectSerializor.deserialize(self.__folder)
 
+    def test_deserialize_cache(self) -> None:
+        """Test deserialize reads a file again only after it changed"""
+
+        ProjectSerializor.create_configuration_folder(self.__folder)
+        ProjectSerializor.serialize(self.__folder, {"language": "Python"})
+
+        # Cache files written just now too.
+        with mock.patch.object(
+            attribute_cache, "RACY_WINDOW_NS", -1
+        ), mock.patch.object(
+            sidecar, "read_sidecar", wraps=sidecar.read_sidecar
+        ) as load:
+            deserialized = ProjectSerializor.deserialize(self.__folder)
+            deserialized["language"] = "JavaScript"
+            self.assertEqual(
+                {"path": self.__folder, "language": "Python"},
+                ProjectSerializor.deserialize(self.__folder),
+            )
+            self.assertEqual(1, load.call_count)
+
+            ProjectSerializor.serialize(
+                self.__folder, {"language": "Python", "framework": "Flask"}
+            )
+            self.assertEqual(
+                "Flask", ProjectSerializor.deserialize(self.__folder)["framework"]
+            )
+            self.assertEqual(2, load.call_count)
+
+            ProjectSerializor.set_attribute_cache_size(0)
+            ProjectSerializor.deserialize(self.__folder)
+            self.assertEqual(3, load.call_count)
+        ProjectSerializor.set_attribute_cache_size(1024)
+
+    def test_sidecar(self) -> None:
+        """Test the json sidecar is used while the yaml is unchanged"""
+
+        ProjectSerializor.create_configuration_folder(self.__folder)
+        ProjectSerializor.serialize(self.__folder, {"language": "Python"})
+        folder = os.path.join(self.__folder, ".hlzcs")
+        self.assertTrue(
+            os.path.isfile(os.path.join(folder, "project_attributes.json"))
+        )
+
+        with mock.patch.object(yaml, "safe_load", wraps=yaml.safe_load) as load:
+            self.assertEqual(
+                "Python", ProjectSerializor.deserialize(self.__folder)["language"]
+            )
+            load.assert_not_called()
+
+            # Edited by hand.
+            with open(
+                os.path.join(folder, "project_attributes.yaml"),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                yaml.dump({"language": "Python", "framework": "Flask"}, file)
+            self.assertEqual(
+                "Flask", ProjectSerializor.deserialize(self.__folder)["framework"]
+            )
+            self.assertEqual(1, load.call_count)
+
     def test_create_project(self) -> None:
         """Test create_project."""
 
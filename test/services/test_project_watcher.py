@@ -0,0 +1,90 @@
+"""Test ProjectWatcher"""
+
+import os
+import shutil
+import time
+import unittest
+from unittest import mock
+
+from app.services.project_watcher import ProjectWatcher, _InotifyBackend
+
+
+class TestProjectWatcher(unittest.TestCase):
+    """Test ProjectWatcher with every available backend."""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+        self.__backends = ["polling"]
+        if _InotifyBackend.available():
+            self.__backends.append("inotify")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def __wait(self, condition) -> None:
+        for _ in range(500):
+            if condition():
+                return
+            time.sleep(0.01)
+        self.fail("Change wasn't picked up.")
+
+    def test_state(self) -> None:
+        """Test changes are picked up from events or polls."""
+
+        for backend in self.__backends:
+            with self.subTest(backend=backend):
+                watcher = ProjectWatcher(
+                    ".hlzcs", backend=backend, poll_interval=0.05
+                )
+                self.assertEqual(backend, watcher.backend)
+                self.assertIsNone(watcher.get(self.__folder + "a"))
+
+                state = watcher.get(self.__folder)
+                self.assertFalse(state.initialized)
+                self.assertEqual([os.path.abspath(self.__folder)], watcher.watched())
+                # Answered from memory while nothing changes.
+                self.assertIs(state, watcher.get(self.__folder))
+
+                # Entries of the project folder are checked on every lookup.
+                os.mkdir(os.path.join(self.__folder, ".hlzcs"))
+                self.assertTrue(watcher.get(self.__folder).initialized)
+
+                # And followed in the background.
+                with mock.patch.object(
+                    watcher, "refresh", wraps=watcher.refresh
+                ) as refresh:
+                    os.rmdir(os.path.join(self.__folder, ".hlzcs"))
+                    self.__wait(lambda: refresh.called)
+                    refresh.assert_called_with(os.path.abspath(self.__folder))
+                self.assertFalse(watcher.get(self.__folder).initialized)
+
+                # A replaced folder is read again.
+                shutil.rmtree(self.__folder)
+                os.mkdir(self.__folder)
+                self.assertFalse(watcher.get(self.__folder).initialized)
+
+                shutil.rmtree(self.__folder)
+                self.assertIsNone(watcher.get(self.__folder))
+                self.assertEqual([], watcher.watched())
+                os.mkdir(self.__folder)
+                watcher.close()
+
+    def test_max_projects(self) -> None:
+        """Test the least recently looked up project is dropped."""
+
+        watcher = ProjectWatcher(".hlzcs", max_projects=1)
+        for name in ("a", "b"):
+            os.mkdir(os.path.join(self.__folder, name))
+            watcher.get(os.path.join(self.__folder, name))
+        self.assertEqual(
+            [os.path.abspath(os.path.join(self.__folder, "b"))], watcher.watched()
+        )
+        watcher.close()
+
+        with self.assertRaises(ValueError):
+            ProjectWatcher(".hlzcs", backend="fsevents")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Test /app/services/sidecar.py"""
+
+import datetime
+import os
+import shutil
+import unittest
+
+from app.services import sidecar
+
+
+class TestSidecar(unittest.TestCase):
+    """Test reading and writing sidecars."""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        os.mkdir(self.__folder)
+        self.__path = os.path.join(self.__folder, "sidecars", "a.json")
+        self.__source = sidecar.fingerprint(b"language: Python\n")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def test_read_write(self) -> None:
+        """Test sidecars are only read for the content they were made from."""
+
+        data = {"b": [1, 2.5, None], "a": "é"}
+        self.assertTrue(sidecar.write_sidecar(self.__path, self.__source, data))
+        self.assertEqual(data, sidecar.read_sidecar(self.__path, self.__source))
+        with open(self.__path, "r", encoding="utf-8") as file:
+            self.assertEqual('{"a":"é","b":[1,2.5,null]}\n', file.readlines()[1])
+
+        other = sidecar.fingerprint(b"language: Java\n")
+        self.assertIsNone(sidecar.read_sidecar(self.__path, other))
+        self.assertIsNone(sidecar.read_sidecar(self.__path, None))
+        self.assertIsNone(sidecar.read_sidecar(self.__path + "a", self.__source))
+
+        # Data json can't keep drops the sidecar.
+        for data in [{"date": datetime.date(2024, 1, 1)}, {1: "a"}]:
+            self.assertFalse(
+                sidecar.write_sidecar(self.__path, self.__source, data)
+            )
+            self.assertFalse(os.path.exists(self.__path))
+
+    def test_fingerprint_file(self) -> None:
+        """Test files are fingerprinted like their content."""
+
+        path = os.path.join(self.__folder, "a.yaml")
+        with open(path, "wb") as file:
+            file.write(b"language: Python\n")
+        self.assertEqual(self.__source, sidecar.fingerprint_file(path))
+        self.assertIsNone(sidecar.fingerprint_file(path + "a"))
+
+    def test_tee_sequence(self) -> None:
+        """Test sequences are written while they are read."""
+
+        items = [{"id": index} for index in range(3)]
+        self.assertEqual(
+            items, list(sidecar.tee_sequence(self.__path, self.__source, items))
+        )
+        self.assertEqual(
+            items, list(sidecar.iter_sequence(self.__path, self.__source))
+        )
+        with open(self.__path, "r", encoding="utf-8") as file:
+            self.assertEqual(
+                ['{"id":0}\n', '{"id":1}\n', '{"id":2}\n'], file.readlines()[1:]
+            )
+
+        # Stopping early keeps the previous sidecar.
+        iterator = sidecar.tee_sequence(self.__path, self.__source, [{"id": 5}])
+        next(iterator)
+        iterator.close()
+        self.assertEqual(
+            items, list(sidecar.iter_sequence(self.__path, self.__source))
+        )
+        self.assertEqual(["a.json"], os.listdir(os.path.dirname(self.__path)))
+
+        other = sidecar.fingerprint(b"language: Java\n")
+        self.assertIsNone(sidecar.iter_sequence(self.__path, other))
+        self.assertIsNone(sidecar.iter_sequence(self.__path + "a", self.__source))
+        self.assertEqual(
+            [], list(sidecar.tee_sequence(self.__path, self.__source, []))
+        )
+        self.assertEqual([], list(sidecar.iter_sequence(self.__path, self.__source)))
+
+    def test_iter_sequence_broken(self) -> None:
+        """Test a broken line removes the sidecar."""
+
+        items = [{"id": 0}, {"id": 1}]
+        list(sidecar.tee_sequence(self.__path, self.__source, items))
+        with open(self.__path, "a", encoding="utf-8") as file:
+            file.write("{broken\n")
+
+        iterator = sidecar.iter_sequence(self.__path, self.__source)
+        self.assertEqual(items, [next(iterator), next(iterator)])
+        with self.assertRaises(ValueError):
+            next(iterator)
+        self.assertFalse(os.path.exists(self.__path))
+
+
+if __name__ == "__main__":
+    unittest.main()
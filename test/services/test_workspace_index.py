@@ -0,0 +1,133 @@
+"""Test workspace_index"""
+
+import json
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from app.services import workspace_index
+from app.services.project_serialization import ProjectSerializor
+
+
+class TestWorkspaceIndexer(unittest.TestCase):
+    """Test scanning a workspace through ProjectSerializor.index_workspace"""
+
+    def setUp(self) -> None:
+        self.__folder = "test_folder"
+        self.__root = os.path.join(self.__folder, "workspace")
+        self.__index = os.path.join(self.__folder, "index.json")
+        os.makedirs(self.__root)
+        self.__create("a", {"language": "Python"})
+        self.__create("group/b", {"language": "Python", "framework": "Flask"})
+        self.__create("group/unsupported", {"language": "Cobol"})
+        self.__create("node_modules/hidden", {"language": "Python"})
+        os.makedirs(os.path.join(self.__root, "empty", ".hlzcs"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__folder)
+
+    def __create(self, name: str, attributes: dict[str, str]) -> None:
+        path = os.path.join(self.__root, name)
+        os.makedirs(path)
+        ProjectSerializor.create_configuration_folder(path)
+        ProjectSerializor.serialize(path, attributes)
+
+    def __scan(self) -> dict:
+        return ProjectSerializor.index_workspace(self.__root, self.__index)
+
+    def test_scan(self) -> None:
+        """Test projects are found, pruned folders skipped, errors reported."""
+
+        result = self.__scan()
+        root = os.path.abspath(self.__root)
+        self.assertEqual(root, result["root"])
+        projects = {project["path"]: project for project in result["projects"]}
+        self.assertEqual(
+            sorted(
+                os.path.join(root, name)
+                for name in ("a", "empty", "group/b", "group/unsupported")
+            ),
+            list(projects),
+        )
+        self.assertEqual(
+            {"language": "Python", "path": os.path.join(root, "a")},
+            projects[os.path.join(root, "a")]["attributes"],
+        )
+        self.assertEqual(
+            "Flask", projects[os.path.join(root, "group/b")]["attributes"]["framework"]
+        )
+        self.assertIn("error", projects[os.path.join(root, "empty")])
+        self.assertIn("error", projects[os.path.join(root, "group/unsupported")])
+        self.assertEqual(result["folders"], result["read"])
+        self.assertEqual(4, result["parsed"])
+
+        with open(self.__index, "r", encoding="utf-8") as file:
+            self.assertIn(root, json.load(file)["roots"])
+
+        with self.assertRaises(NotADirectoryError):
+            ProjectSerializor.index_workspace(self.__root + "a", self.__index)
+
+    def test_invalid_files(self) -> None:
+        """Test an empty attribute file and an index without roots."""
+
+        path = os.path.join(self.__root, "broken")
+        os.makedirs(path)
+        ProjectSerializor.create_configuration_folder(path)
+        for content in ("", "Python"):
+            with open(
+                os.path.join(path, ".hlzcs", "project_attributes.yaml"),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                file.write(content)
+            with open(self.__index, "w", encoding="utf-8") as file:
+                json.dump({"version": workspace_index._INDEX_VERSION}, file)
+
+            result = self.__scan()
+            projects = {project["path"]: project for project in result["projects"]}
+            self.assertIn(
+                "doesn't hold project attributes",
+                projects[os.path.abspath(path)]["error"],
+            )
+            self.assertIn(
+                "attributes", projects[os.path.abspath(os.path.join(self.__root, "a"))]
+            )
+
+    def test_unwritable_index(self) -> None:
+        """Test a scan still answers when the index can't be written."""
+
+        with open(os.path.join(self.__folder, "file"), "w", encoding="utf-8"):
+            pass
+        index = os.path.join(self.__folder, "file", "index.json")
+        with self.assertLogs(level="ERROR"):
+            result = ProjectSerializor.index_workspace(self.__root, index)
+        self.assertEqual(4, len(result["projects"]))
+        self.assertEqual(4, result["parsed"])
+
+    def test_incremental_scan(self) -> None:
+        """Test later scans only read changed folders and files."""
+
+        with mock.patch.object(workspace_index, "RACY_WINDOW_NS", -1):
+            first = self.__scan()
+            second = self.__scan()
+            self.assertEqual(first["projects"], second["projects"])
+            self.assertEqual(0, second["read"])
+            self.assertEqual(0, second["parsed"])
+
+            ProjectSerializor.serialize(
+                os.path.join(self.__root, "a"), {"language": "Rust"}
+            )
+            self.__create("group/c", {"language": "Python"})
+            third = self.__scan()
+            # "group" and the new project folder.
+            self.assertEqual(2, third["read"])
+            self.assertEqual(2, third["parsed"])
+            self.assertEqual(5, len(third["projects"]))
+
+        # Changes within the racy window are always read again.
+        self.assertEqual(third["folders"], self.__scan()["read"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Test the production server.
+"""
+
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.serving import _PooledWSGIServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _get(port: int, path: str, connection=None) -> tuple[int, bytes]:
+    connection = connection or http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.request("GET", path)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+class MyTestCase(unittest.TestCase):
+    """A test case."""
+
+    def test_pooled_server(self) -> None:
+        """Test concurrent and keep-alive requests on the thread pool."""
+
+        server = _PooledWSGIServer("127.0.0.1", 0, create_app(), 4, 5)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+            for _ in range(3):
+                status, body = _get(server.port, "/api/project/languages", connection)
+                self.assertEqual(200, status)
+                self.assertIn(b"Python", body)
+            connection.close()
+
+            with ThreadPoolExecutor(8) as pool:
+                results = list(
+                    pool.map(
+                        lambda _: _get(server.port, "/api/project/languages")[0],
+                        range(32),
+                    )
+                )
+            self.assertEqual([200] * 32, results)
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join(10)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Needs fork.")
+    def test_production_workers(self) -> None:
+        """Test run.py --server production with reload and shutdown."""
+
+        process = subprocess.Popen(
+            [
+                sys.executable, "run.py", "--server", "production",
+                "--port", "0", "--workers", "2", "--threads", "2",
+            ],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        try:
+            line = process.stdout.readline()
+            self.assertIn("with 2 worker(s) x 2 thread(s)", line)
+            port = int(line.split(":")[2].split(" ")[0])
+
+            self.assertEqual(200, _get(port, "/api/project/languages")[0])
+            process.send_signal(signal.SIGHUP)
+            for _ in range(10):
+                self.assertEqual(200, _get(port, "/api/project/languages")[0])
+
+            process.send_signal(signal.SIGTERM)
+            self.assertEqual(0, process.wait(30))
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Needs fork.")
+    def test_production_jobs(self) -> None:
+        """Test jobs can be polled on the default single worker."""
+
+        process = subprocess.Popen(
+            [sys.executable, "run.py", "--server", "production", "--port", "0"],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        try:
+            line = process.stdout.readline()
+            self.assertIn("with 1 worker(s)", line)
+            port = int(line.split(":")[2].split(" ")[0])
+
+            api = "/api/pipeline/compile?input=missing.yaml&output=out.yaml&async=1"
+            status, body = _get(port, api)
+            self.assertEqual(202, status)
+            job_id = json.loads(body)["job"]
+            # Every connection finds the job.
+            for _ in range(10):
+                self.assertEqual(200, _get(port, f"/api/jobs/{job_id}")[0])
+
+            process.send_signal(signal.SIGTERM)
+            self.assertEqual(0, process.wait(30))
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+
+if __name__ == "__main__":
+    unittest.main()